@@ -1,32 +1,31 @@
 """Flask application initialization."""
 
+import atexit
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from urllib.parse import urlencode
 from flask import Flask, jsonify
 from flask_restful import Api
-from flask_sqlalchemy import SQLAlchemy
-from flask_migrate import Migrate
-from flask_jwt_extended import JWTManager
 from flask_talisman import Talisman
-from flask_limiter import Limiter
-from flask_limiter.util import get_remote_address
 from flask_cors import CORS
-from flask_socketio import SocketIO
-import logging
-from logging.handlers import RotatingFileHandler
+from flask_jwt_extended.exceptions import NoAuthorizationError, JWTDecodeError
+from jwt.exceptions import ExpiredSignatureError, InvalidTokenError
+from app.core.log_handlers import FastRotatingFileHandler
+from app.core.serialization import ORJSONProvider, dumps, output_json
 
-# Fix eventlet DNS resolution - patch after eventlet imports
-# We'll patch the DNS resolver in run.py after socketio is initialized
-
-# Initialize extensions
-db = SQLAlchemy()
-migrate = Migrate()
-jwt = JWTManager()
-limiter = Limiter(key_func=get_remote_address)
-socketio = SocketIO(cors_allowed_origins="*", async_mode="eventlet")
+# Extensions are bound first so modules imported below can use `from app import db`
+from app.extensions import db, migrate, jwt, limiter, socketio, cache
+from app.api import register_routes
+from app.api.websocket import register_websocket_handlers
+from app.core.security import clear_user_auth_cache
 
 
 def create_app(config_name="production"):
     """Application factory pattern."""
     app = Flask(__name__)
+    app.json = ORJSONProvider(app)
 
     # Load configuration
     if config_name == "development":
@@ -36,8 +35,18 @@ def create_app(config_name="production"):
     else:
         app.config.from_object("app.core.config.ProductionConfig")
 
+    # The OAuth authorize URL only depends on config, so build it once
+    app.config["GITHUB_AUTHORIZE_URL"] = "https://github.com/login/oauth/authorize?" + urlencode(
+        {
+            "client_id": app.config["GITHUB_CLIENT_ID"],
+            "redirect_uri": app.config["GITHUB_CALLBACK_URL"],
+            "scope": "user:email",
+        }
+    )
+
     # Initialize extensions
     db.init_app(app)
+    clear_user_auth_cache()
     migrate.init_app(app, db)
     jwt.init_app(app)
     socketio.init_app(app)
@@ -76,33 +85,39 @@ def create_app(config_name="production"):
     # Rate limiting
     limiter.init_app(app)
 
+    # Response cache for aggregate dashboards
+    cache.init_app(app)
+
     # Configure logging
     if not app.debug and not app.config.get("TESTING", False):
         # Create logs directory if it doesn't exist
-        import os
-
         logs_dir = "logs"
         if not os.path.exists(logs_dir):
             os.makedirs(logs_dir, exist_ok=True)
 
-        file_handler = RotatingFileHandler("logs/sentinal.log", maxBytes=10240000, backupCount=10)
+        file_handler = FastRotatingFileHandler("logs/sentinal.log", maxBytes=10240000, backupCount=10)
         file_handler.setFormatter(
             logging.Formatter("%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]")
         )
         file_handler.setLevel(logging.INFO)
-        app.logger.addHandler(file_handler)
+
+        # Request handlers only enqueue records; a listener thread owns the file I/O.
+        # queue.Queue (not SimpleQueue) so the listener cooperates with eventlet's hub.
+        log_queue = queue.Queue(-1)
+        listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+        app.extensions["log_listener"] = listener
+
+        app.logger.addHandler(QueueHandler(log_queue))
         app.logger.setLevel(logging.INFO)
         app.logger.info("Sentinal startup")
 
-    # Health check route
-    @app.route("/api/health")
-    def health():
-        return {"status": "healthy", "service": "sentinal-api"}, 200
-
-    # Root API route
-    @app.route("/api")
-    def api_root():
-        return {
+    # Health and discovery bodies never change, so encode them once. A fresh Response is
+    # still built per request because after_request hooks (Talisman, CORS) mutate headers.
+    health_body = dumps({"status": "healthy", "service": "sentinal-api"})
+    api_root_body = dumps(
+        {
             "message": "Project Sentinel API",
             "version": "1.0.0",
             "endpoints": {
@@ -111,13 +126,18 @@ def create_app(config_name="production"):
                 "requirements": "/api/requirements",
                 "cicd": "/api/cicd",
             },
-        }, 200
+        }
+    )
+
+    # Health check route
+    @app.route("/api/health")
+    def health():
+        return app.response_class(health_body, status=200, mimetype="application/json")
 
-    # Register blueprints/API routes
-    from app.api import auth, threat_model, requirements, cicd, api_tokens
-    from app.api.websocket import register_websocket_handlers
-    from flask_jwt_extended.exceptions import NoAuthorizationError, JWTDecodeError
-    from jwt.exceptions import ExpiredSignatureError, InvalidTokenError
+    # Root API route
+    @app.route("/api")
+    def api_root():
+        return app.response_class(api_root_body, status=200, mimetype="application/json")
 
     @app.errorhandler(NoAuthorizationError)
     @app.errorhandler(JWTDecodeError)
@@ -135,77 +155,10 @@ def create_app(config_name="production"):
         else:
             return jsonify({"error": "Authentication required"}), 401
 
+    # Register API routes
     api = Api(app, prefix="/api")
-
-    # Authentication routes
-    api.add_resource(auth.Register, "/auth/register")
-    api.add_resource(auth.Login, "/auth/login")
-    api.add_resource(auth.GitHubAuth, "/auth/github")
-    api.add_resource(auth.GitHubCallback, "/auth/github/callback")
-    api.add_resource(auth.RefreshToken, "/auth/refresh")
-    api.add_resource(auth.Logout, "/auth/logout")
-    api.add_resource(auth.UserProfile, "/auth/profile")
-
-    # API Token management routes
-    api.add_resource(api_tokens.CreateAPIToken, "/auth/api-tokens")
-    api.add_resource(api_tokens.ListAPITokens, "/auth/api-tokens")
-    api.add_resource(api_tokens.RevokeAPIToken, "/auth/api-tokens/<int:token_id>/revoke")
-
-    # Threat modeling routes
-    api.add_resource(threat_model.ThreatAnalyze, "/threats/analyze")
-    api.add_resource(threat_model.ThreatList, "/threats")
-    api.add_resource(threat_model.ThreatDetail, "/threats/<int:threat_id>")
-    api.add_resource(threat_model.ThreatVulnerabilities, "/threats/<int:threat_id>/vulnerabilities")
-    api.add_resource(threat_model.LinkVulnerability, "/threats/<int:threat_id>/link-vulnerability")
-    api.add_resource(threat_model.ThreatsWithVulnerabilities, "/threats/with-vulnerabilities")
-    api.add_resource(threat_model.UpdateVulnerabilityStatus, "/threats/vulnerabilities/<int:vulnerability_id>/status")
-    api.add_resource(threat_model.ThreatSimilar, "/threats/<int:threat_id>/similar")
-
-    # Threat analytics routes
-    from app.api import threat_analytics
-
-    api.add_resource(threat_analytics.ThreatAnalytics, "/threats/analytics")
-
-    # Threat template routes
-    from app.api import threat_templates
-
-    api.add_resource(threat_templates.ThreatTemplateList, "/threats/templates")
-    api.add_resource(threat_templates.ThreatTemplateDetail, "/threats/templates/<int:template_id>")
-    api.add_resource(threat_templates.CreateThreatFromTemplate, "/threats/templates/<int:template_id>/create-threat")
-
-    # Requirements routes
-    api.add_resource(requirements.RequirementList, "/requirements")
-    api.add_resource(requirements.RequirementDetail, "/requirements/<int:req_id>")
-    api.add_resource(requirements.SecurityControlList, "/requirements/<int:req_id>/controls")
-    api.add_resource(requirements.RequirementExport, "/requirements/export")
-    api.add_resource(requirements.ComplianceDashboard, "/requirements/compliance")
-
-    # CI/CD routes
-    api.add_resource(cicd.CICDRunList, "/cicd/runs")
-    api.add_resource(cicd.CICDRunDetail, "/cicd/runs/<int:run_id>")
-    api.add_resource(cicd.CICDTrigger, "/cicd/trigger")
-    api.add_resource(cicd.CICDDashboard, "/cicd/dashboard")
-
-    # Detailed scan results endpoints
-    api.add_resource(cicd.CICDRunSAST, "/cicd/runs/<int:run_id>/sast")
-    api.add_resource(cicd.CICDRunDAST, "/cicd/runs/<int:run_id>/dast")
-    api.add_resource(cicd.CICDRunTrivy, "/cicd/runs/<int:run_id>/trivy")
-
-    # Latest scan endpoints
-    api.add_resource(cicd.LatestSonarQubeScan, "/cicd/scans/sonarqube/latest")
-    api.add_resource(cicd.LatestZAPScan, "/cicd/scans/zap/latest")
-    api.add_resource(cicd.LatestTrivyScan, "/cicd/scans/trivy/latest")
-
-    # Trigger scan endpoints
-    api.add_resource(cicd.TriggerSonarQubeScan, "/cicd/scans/sonarqube/trigger")
-    api.add_resource(cicd.TriggerZAPScan, "/cicd/scans/zap/trigger")
-    api.add_resource(cicd.TriggerTrivyScan, "/cicd/scans/trivy/trigger")
-
-    # Scan status endpoint
-    api.add_resource(cicd.ScanStatus, "/cicd/scans/<scan_type>/status/<scan_id>")
-
-    # Webhook routes (no JWT, uses API token)
-    api.add_resource(cicd.CICDWebhook, "/cicd/webhook/<scan_type>")
+    api.representation("application/json")(output_json)
+    register_routes(api)
 
     # Register WebSocket handlers
     register_websocket_handlers(socketio)
@@ -1 +1,68 @@
 """API package initialization."""
+
+from werkzeug.utils import import_string
+
+# (resource, url) pairs registered on the Flask-RESTful Api; resources are
+# dotted paths relative to this package so the table has no import cost.
+ROUTES = (
+    # Authentication routes
+    ("auth.Register", "/auth/register"),
+    ("auth.Login", "/auth/login"),
+    ("auth.GitHubAuth", "/auth/github"),
+    ("auth.GitHubCallback", "/auth/github/callback"),
+    ("auth.RefreshToken", "/auth/refresh"),
+    ("auth.Logout", "/auth/logout"),
+    ("auth.UserProfile", "/auth/profile"),
+    # API Token management routes
+    ("api_tokens.CreateAPIToken", "/auth/api-tokens"),
+    ("api_tokens.ListAPITokens", "/auth/api-tokens"),
+    ("api_tokens.RevokeAPIToken", "/auth/api-tokens/<int:token_id>/revoke"),
+    # Threat modeling routes
+    ("threat_model.ThreatAnalyze", "/threats/analyze"),
+    ("threat_model.ThreatList", "/threats"),
+    ("threat_model.ThreatDetail", "/threats/<int:threat_id>"),
+    ("threat_model.ThreatVulnerabilities", "/threats/<int:threat_id>/vulnerabilities"),
+    ("threat_model.LinkVulnerability", "/threats/<int:threat_id>/link-vulnerability"),
+    ("threat_model.ThreatsWithVulnerabilities", "/threats/with-vulnerabilities"),
+    ("threat_model.UpdateVulnerabilityStatus", "/threats/vulnerabilities/<int:vulnerability_id>/status"),
+    ("threat_model.ThreatSimilar", "/threats/<int:threat_id>/similar"),
+    # Threat analytics routes
+    ("threat_analytics.ThreatAnalytics", "/threats/analytics"),
+    # Threat template routes
+    ("threat_templates.ThreatTemplateList", "/threats/templates"),
+    ("threat_templates.ThreatTemplateDetail", "/threats/templates/<int:template_id>"),
+    ("threat_templates.CreateThreatFromTemplate", "/threats/templates/<int:template_id>/create-threat"),
+    # Requirements routes
+    ("requirements.RequirementList", "/requirements"),
+    ("requirements.RequirementDetail", "/requirements/<int:req_id>"),
+    ("requirements.SecurityControlList", "/requirements/<int:req_id>/controls"),
+    ("requirements.RequirementExport", "/requirements/export"),
+    ("requirements.ComplianceDashboard", "/requirements/compliance"),
+    # CI/CD routes
+    ("cicd.CICDRunList", "/cicd/runs"),
+    ("cicd.CICDRunDetail", "/cicd/runs/<int:run_id>"),
+    ("cicd.CICDTrigger", "/cicd/trigger"),
+    ("cicd.CICDDashboard", "/cicd/dashboard"),
+    # Detailed scan results endpoints
+    ("cicd.CICDRunSAST", "/cicd/runs/<int:run_id>/sast"),
+    ("cicd.CICDRunDAST", "/cicd/runs/<int:run_id>/dast"),
+    ("cicd.CICDRunTrivy", "/cicd/runs/<int:run_id>/trivy"),
+    # Latest scan endpoints
+    ("cicd.LatestSonarQubeScan", "/cicd/scans/sonarqube/latest"),
+    ("cicd.LatestZAPScan", "/cicd/scans/zap/latest"),
+    ("cicd.LatestTrivyScan", "/cicd/scans/trivy/latest"),
+    # Trigger scan endpoints
+    ("cicd.TriggerSonarQubeScan", "/cicd/scans/sonarqube/trigger"),
+    ("cicd.TriggerZAPScan", "/cicd/scans/zap/trigger"),
+    ("cicd.TriggerTrivyScan", "/cicd/scans/trivy/trigger"),
+    # Scan status endpoint
+    ("cicd.ScanStatus", "/cicd/scans/<scan_type>/status/<scan_id>"),
+    # Webhook routes (no JWT, uses API token)
+    ("cicd.CICDWebhook", "/cicd/webhook/<scan_type>"),
+)
+
+
+def register_routes(api):
+    """Register every resource in ROUTES on the given Flask-RESTful Api."""
+    for resource, url in ROUTES:
+        api.add_resource(import_string(f"{__name__}.{resource}"), url)
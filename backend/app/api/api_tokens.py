@@ -3,11 +3,15 @@
 from flask import request
 from flask_restful import Resource
 from flask_jwt_extended import get_jwt_identity
-from app.core.security import jwt_required
+from app.core.serialization import load_json_body
+from app.core.security import jwt_required, is_admin
+from app.core.token_cache import clear_token_cache
+from app.core.token_usage import flush_token_usage
+from app.core.pagination import decode_cursor, encode_cursor
 from marshmallow import Schema, fields, ValidationError, validate
+from sqlalchemy import tuple_
 from app import db
-from app.models.api_token import APIToken
-from app.models.user import User
+from app.models.api_token import APIToken, API_TOKEN_COLUMNS, SCOPE_FLAGS, token_to_dict
 from datetime import datetime, timedelta
 
 
@@ -16,7 +20,12 @@ class CreateTokenSchema(Schema):
 
     name = fields.Str(required=True, validate=validate.Length(min=1, max=100))
     expires_in_days = fields.Int(missing=None, allow_none=True)  # None = never expires
-    scopes = fields.List(fields.Str(), missing=["webhook:write"])
+    scopes = fields.List(fields.Str(validate=validate.OneOf(list(SCOPE_FLAGS))), missing=["webhook:write"])
+
+
+_CREATE_TOKEN_SCHEMA = CreateTokenSchema()
+
+MAX_TOKENS_PAGE_SIZE = 200
 
 
 class CreateAPIToken(Resource):
@@ -26,14 +35,12 @@ class CreateAPIToken(Resource):
     def post(self):
         """Create a new API token."""
         user_id = get_jwt_identity()
-        user = User.query.get(user_id)
 
-        if not user or user.role != "Admin":
+        if not is_admin(user_id):
             return {"error": "Admin access required"}, 403
 
-        schema = CreateTokenSchema()
         try:
-            data = schema.load(request.json)
+            data = _CREATE_TOKEN_SCHEMA.load(load_json_body())
         except ValidationError as err:
             return {"errors": err.messages}, 400
 
@@ -68,13 +75,27 @@ class ListAPITokens(Resource):
     def get(self):
         """List all API tokens."""
         user_id = get_jwt_identity()
-        user = User.query.get(user_id)
 
-        if not user or user.role != "Admin":
+        if not is_admin(user_id):
             return {"error": "Admin access required"}, 403
 
-        tokens = APIToken.query.order_by(APIToken.created_at.desc()).all()
-        return {"tokens": [token.to_dict() for token in tokens]}, 200
+        # Show up-to-date last_used_at stamps
+        flush_token_usage()
+
+        limit = min(max(request.args.get("limit", 50, type=int), 1), MAX_TOKENS_PAGE_SIZE)
+        stmt = db.select(*API_TOKEN_COLUMNS).order_by(APIToken.created_at.desc(), APIToken.id.desc())
+
+        cursor = request.args.get("cursor")
+        if cursor:
+            try:
+                stmt = stmt.where(tuple_(APIToken.created_at, APIToken.id) < decode_cursor(cursor))
+            except ValueError:
+                return {"error": "Invalid cursor"}, 400
+
+        # Plain rows skip ORM hydration; one extra row tells whether another page follows
+        tokens = [token_to_dict(row) for row in db.session.execute(stmt.limit(limit + 1))]
+        next_cursor = encode_cursor(tokens[limit - 1]) if len(tokens) > limit else None
+        return {"tokens": tokens[:limit], "next_cursor": next_cursor}, 200
 
 
 class RevokeAPIToken(Resource):
@@ -84,13 +105,13 @@ class RevokeAPIToken(Resource):
     def post(self, token_id):
         """Revoke an API token."""
         user_id = get_jwt_identity()
-        user = User.query.get(user_id)
 
-        if not user or user.role != "Admin":
+        if not is_admin(user_id):
             return {"error": "Admin access required"}, 403
 
         api_token = APIToken.query.get_or_404(token_id)
         api_token.is_active = False
         db.session.commit()
+        clear_token_cache()
 
         return {"message": "Token revoked successfully"}, 200
@@ -4,12 +4,32 @@ from flask import request
 from flask_restful import Resource
 from flask_jwt_extended import create_access_token, create_refresh_token, jwt_required, get_jwt_identity, get_jwt
 from marshmallow import Schema, fields, ValidationError, validate
+from sqlalchemy import exists
+from sqlalchemy.exc import IntegrityError
 from app import db, limiter
 from app.models.user import User
-from app.core.security import hash_password, verify_password, log_security_event
-import subprocess
-import json as json_lib
-from datetime import datetime
+from app.core.serialization import load_json_body
+from app.core.security import (
+    DUMMY_PASSWORD_HASH,
+    hash_password,
+    verify_password,
+    log_security_event,
+    get_user_auth,
+    invalidate_user_auth,
+    password_needs_rehash,
+    record_login,
+)
+import eventlet
+from eventlet import tpool
+import orjson
+import requests
+
+GITHUB_TOKEN_URL = "https://github.com/login/oauth/access_token"
+GITHUB_API_URL = "https://api.github.com"
+GITHUB_TIMEOUT = 30
+
+# Shared session so GitHub calls reuse pooled keep-alive TLS connections
+_github_session = requests.Session()
 
 
 class RegisterSchema(Schema):
@@ -28,35 +48,49 @@ class LoginSchema(Schema):
     password = fields.Str(required=True)
 
 
+# Schemas are stateless for load(), so a single instance is shared across requests
+_REGISTER_SCHEMA = RegisterSchema()
+_LOGIN_SCHEMA = LoginSchema()
+
+
 class Register(Resource):
     """User registration endpoint."""
 
     @limiter.limit("5 per minute")
     def post(self):
         """Register a new user."""
-        schema = RegisterSchema()
         try:
-            data = schema.load(request.json)
+            data = _REGISTER_SCHEMA.load(load_json_body())
         except ValidationError as err:
             return {"errors": err.messages}, 400
 
-        # Check if user exists
-        if User.query.filter_by(username=data["username"]).first():
+        # Check if user exists: two EXISTS probes answered from the unique indexes in one round-trip
+        username_taken, email_taken = db.session.execute(
+            db.select(
+                exists().where(User.username == data["username"]),
+                exists().where(User.email == data["email"]),
+            )
+        ).one()
+        if username_taken:
             return {"error": "Username already exists"}, 400
-
-        if User.query.filter_by(email=data["email"]).first():
+        if email_taken:
             return {"error": "Email already exists"}, 400
 
         # Create user
         user = User(
             username=data["username"],
             email=data["email"],
-            password_hash=hash_password(data["password"]),
+            password_hash=tpool.execute(hash_password, data["password"]),
             role=data.get("role", "Developer"),
         )
 
         db.session.add(user)
-        db.session.commit()
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # A concurrent registration claimed the username or email after the check above
+            db.session.rollback()
+            return {"error": "Username or email already exists"}, 400
 
         log_security_event("user_registered", user.id)
 
@@ -69,24 +103,31 @@ class Login(Resource):
     @limiter.limit("10 per minute")
     def post(self):
         """Login user."""
-        schema = LoginSchema()
         try:
-            data = schema.load(request.json)
+            data = _LOGIN_SCHEMA.load(load_json_body())
         except ValidationError as err:
             return {"errors": err.messages}, 400
 
         user = User.query.filter_by(username=data["username"]).first()
 
-        if not user or not user.password_hash or not verify_password(data["password"], user.password_hash):
+        # Password hashing runs on a native thread so the eventlet hub keeps serving other requests.
+        # Unknown users are checked against a dummy hash so they cost the same as a wrong password.
+        password_hash = user.password_hash if user else DUMMY_PASSWORD_HASH
+        if not tpool.execute(verify_password, data["password"], password_hash) or not user:
             log_security_event("login_failed", None, {"username": data["username"]})
             return {"error": "Invalid credentials"}, 401
 
         if not user.is_active:
             return {"error": "Account is disabled"}, 403
 
+        # Upgrade legacy bcrypt (or outdated argon2) hashes now that we have the plaintext;
+        # committed durably on its own, never under record_login()'s asynchronous commit
+        if password_needs_rehash(user.password_hash):
+            user.password_hash = tpool.execute(hash_password, data["password"])
+            db.session.commit()
+
         # Update last login
-        user.last_login = datetime.utcnow()
-        db.session.commit()
+        record_login(user.id)
 
         # Create tokens
         access_token = create_access_token(identity=user.id)
@@ -104,17 +145,7 @@ class GitHubAuth(Resource):
         """Redirect to GitHub OAuth."""
         from flask import current_app
 
-        github_client_id = current_app.config["GITHUB_CLIENT_ID"]
-        redirect_uri = current_app.config["GITHUB_CALLBACK_URL"]
-
-        github_auth_url = (
-            f"https://github.com/login/oauth/authorize"
-            f"?client_id={github_client_id}"
-            f"&redirect_uri={redirect_uri}"
-            f"&scope=user:email"
-        )
-
-        return {"auth_url": github_auth_url}, 200
+        return {"auth_url": current_app.config["GITHUB_AUTHORIZE_URL"]}, 200
 
 
 class GitHubCallback(Resource):
@@ -129,48 +160,31 @@ class GitHubCallback(Resource):
         if not code:
             return {"error": "Authorization code not provided"}, 400
 
-        # Exchange code for access token using curl to bypass eventlet DNS issues
+        # Exchange code for access token
         github_client_id = current_app.config["GITHUB_CLIENT_ID"]
         github_client_secret = current_app.config["GITHUB_CLIENT_SECRET"]
 
         try:
-            # Use curl via subprocess to bypass Python's socket module entirely
-            curl_cmd = [
-                "curl",
-                "-s",
-                "-X",
-                "POST",
-                "https://github.com/login/oauth/access_token",
-                "-H",
-                "Accept: application/json",
-                "-d",
-                f"client_id={github_client_id}",
-                "-d",
-                f"client_secret={github_client_secret}",
-                "-d",
-                f"code={code}",
-                "--connect-timeout",
-                "30",
-                "--max-time",
-                "30",
-            ]
-
-            result = subprocess.run(curl_cmd, capture_output=True, text=True, timeout=35)
-
-            if result.returncode != 0:
-                current_app.logger.error(f"Curl failed: {result.stderr}")
-                error_msg = "Failed to connect to GitHub. " "Please check your internet connection and DNS settings."
-                return {"error": error_msg}, 503
+            response = _github_session.post(
+                GITHUB_TOKEN_URL,
+                data={"client_id": github_client_id, "client_secret": github_client_secret, "code": code},
+                headers={"Accept": "application/json"},
+                timeout=GITHUB_TIMEOUT,
+            )
 
             try:
-                token_data = json_lib.loads(result.stdout)
-            except json_lib.JSONDecodeError:
-                current_app.logger.error(f"Invalid JSON response: {result.stdout}")
+                token_data = orjson.loads(response.content)
+            except orjson.JSONDecodeError:
+                current_app.logger.error(f"Invalid JSON response: {response.text}")
                 return {"error": "Invalid response from GitHub"}, 500
 
-        except subprocess.TimeoutExpired:
+        except requests.exceptions.Timeout:
             current_app.logger.error("GitHub OAuth request timed out")
             return {"error": "Request to GitHub timed out. Please try again."}, 504
+        except requests.exceptions.ConnectionError as e:
+            current_app.logger.error(f"GitHub connection failed: {e}")
+            error_msg = "Failed to connect to GitHub. " "Please check your internet connection and DNS settings."
+            return {"error": error_msg}, 503
         except Exception as e:
             current_app.logger.error(f"GitHub OAuth error: {e}")
             return {"error": f"An error occurred during GitHub authentication: {str(e)}"}, 500
@@ -186,38 +200,34 @@ class GitHubCallback(Resource):
         if not access_token:
             return {"error": "Failed to get access token"}, 400
 
-        # Get user info from GitHub using curl
+        github_headers = {"Authorization": f"token {access_token}"}
+
+        # Fetch the profile and email list concurrently; emails are only used when the profile hides them
+        pool = eventlet.GreenPool(2)
+        user_request = pool.spawn(
+            _github_session.get, f"{GITHUB_API_URL}/user", headers=github_headers, timeout=GITHUB_TIMEOUT
+        )
+        emails_request = pool.spawn(
+            _github_session.get, f"{GITHUB_API_URL}/user/emails", headers=github_headers, timeout=GITHUB_TIMEOUT
+        )
+
+        # Get user info from GitHub
         try:
-            curl_cmd = [
-                "curl",
-                "-s",
-                "https://api.github.com/user",
-                "-H",
-                f"Authorization: token {access_token}",
-                "--connect-timeout",
-                "30",
-                "--max-time",
-                "30",
-            ]
-
-            result = subprocess.run(curl_cmd, capture_output=True, text=True, timeout=35)
-
-            if result.returncode != 0:
-                current_app.logger.error(f"Curl failed: {result.stderr}")
-                error_msg = (
-                    "Failed to connect to GitHub API. " "Please check your internet connection and DNS settings."
-                )
-                return {"error": error_msg}, 503
+            response = user_request.wait()
 
             try:
-                github_user = json_lib.loads(result.stdout)
-            except json_lib.JSONDecodeError:
-                current_app.logger.error(f"Invalid JSON response: {result.stdout}")
+                github_user = orjson.loads(response.content)
+            except orjson.JSONDecodeError:
+                current_app.logger.error(f"Invalid JSON response: {response.text}")
                 return {"error": "Invalid response from GitHub API"}, 500
 
-        except subprocess.TimeoutExpired:
+        except requests.exceptions.Timeout:
             current_app.logger.error("GitHub API request timed out")
             return {"error": "Request to GitHub API timed out. Please try again."}, 504
+        except requests.exceptions.ConnectionError as e:
+            current_app.logger.error(f"GitHub API connection failed: {e}")
+            error_msg = "Failed to connect to GitHub API. " "Please check your internet connection and DNS settings."
+            return {"error": error_msg}, 503
         except Exception as e:
             current_app.logger.error(f"GitHub API error: {e}")
             error_msg = "An error occurred while fetching user info from GitHub"
@@ -232,28 +242,16 @@ class GitHubCallback(Resource):
         username = github_user["login"]
         email = github_user.get("email")
 
-        # Get email if not in user info using curl
+        # Get email if not in user info
         if not email:
             try:
-                curl_cmd = [
-                    "curl",
-                    "-s",
-                    "https://api.github.com/user/emails",
-                    "-H",
-                    f"Authorization: token {access_token}",
-                    "--connect-timeout",
-                    "30",
-                    "--max-time",
-                    "30",
-                ]
-
-                result = subprocess.run(curl_cmd, capture_output=True, text=True, timeout=35)
-
-                if result.returncode == 0:
+                response = emails_request.wait()
+
+                if response.ok:
                     try:
-                        emails = json_lib.loads(result.stdout)
+                        emails = orjson.loads(response.content)
                         email = next((e["email"] for e in emails if e["primary"]), None)
-                    except json_lib.JSONDecodeError:
+                    except orjson.JSONDecodeError:
                         current_app.logger.warning("Failed to parse email response from GitHub")
             except Exception as e:
                 current_app.logger.warning(f"Failed to fetch email from GitHub: {e}")
@@ -276,8 +274,7 @@ class GitHubCallback(Resource):
             db.session.commit()
             log_security_event("user_registered_github", user.id)
         else:
-            user.last_login = datetime.utcnow()
-            db.session.commit()
+            record_login(user.id)
 
         # Create tokens
         access_token_jwt = create_access_token(identity=user.id)
@@ -295,7 +292,7 @@ class RefreshToken(Resource):
     def post(self):
         """Refresh access token."""
         user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = get_user_auth(user_id)
 
         if not user or not user.is_active:
             return {"error": "User not found or inactive"}, 404
@@ -312,7 +309,9 @@ class Logout(Resource):
         """Logout user."""
         get_jwt()["jti"]  # Get JTI for potential blacklist
         # In production, add jti to blacklist
-        log_security_event("logout", get_jwt_identity())
+        user_id = get_jwt_identity()
+        invalidate_user_auth(user_id)
+        log_security_event("logout", user_id)
         return {"message": "Logged out successfully"}, 200
 
 
@@ -1,25 +1,69 @@
 """CI/CD API endpoints."""
 
-from flask import request
+import re
+import orjson
+from flask import abort, request
 from flask_restful import Resource
+from sqlalchemy import Text, cast, column as sa_column, func, or_, true
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import load_only
 from app.core.security import jwt_required
-from app import db
-from app.models.cicd import CICDRun
+from app import db, cache
+from app.models.cicd import CICDRun, CICD_RUN_RESULT_COLUMNS, CICD_RUN_SUMMARY_COLUMNS
 from app.services.security_scanner import SecurityScanner
 from app.core.webhook_auth import webhook_auth_required
+from app.core.dashboard_cache import (
+    CICD_DASHBOARD_CACHE_KEY,
+    CICD_DASHBOARD_CACHE_TIMEOUT,
+    invalidate_cicd_dashboard,
+)
 from app.api.websocket import emit_scan_update, emit_dashboard_update
+from app.tasks.scans import start_scan_pipeline
 from datetime import datetime
 
+# Joins searchable fields; a control character so a search term cannot span two fields
+SEARCH_FIELD_SEPARATOR = "\x1f"
+
+
+def _latest_run_with_raw_results(*criteria):
+    """Return the newest run matching criteria in the CICDRun.to_dict() shape, or None.
+
+    Scan documents can run to megabytes, so they are read as JSON text and handed to
+    orjson as fragments: they reach the response without ever being parsed in Python.
+    """
+    row = (
+        db.session.execute(
+            db.select(*CICD_RUN_SUMMARY_COLUMNS, *[cast(col, Text).label(col.key) for col in CICD_RUN_RESULT_COLUMNS])
+            .where(*criteria)
+            .order_by(CICDRun.created_at.desc())
+            .limit(1)
+        )
+        .mappings()
+        .first()
+    )
+    if row is None:
+        return None
+    run = dict(row)
+    for col in CICD_RUN_RESULT_COLUMNS:
+        if run[col.key] is not None:
+            run[col.key] = orjson.Fragment(run[col.key])
+    return run
+
 
 class CICDRunList(Resource):
     """CI/CD runs list endpoint."""
 
     @jwt_required()
     def get(self):
-        """Get all CI/CD runs."""
+        """Get all CI/CD runs, optionally filtered by branch and status."""
         limit = request.args.get("limit", 50, type=int)
-        runs = CICDRun.query.order_by(CICDRun.created_at.desc()).limit(limit).all()
-        return {"runs": [run.to_dict() for run in runs]}, 200
+        query = CICDRun.query.options(load_only(*CICD_RUN_SUMMARY_COLUMNS))
+        if request.args.get("branch"):
+            query = query.filter(CICDRun.branch == request.args["branch"])
+        if request.args.get("status"):
+            query = query.filter(CICDRun.status == request.args["status"])
+        runs = query.order_by(CICDRun.created_at.desc()).limit(limit).all()
+        return {"runs": [run.to_summary_dict() for run in runs]}, 200
 
 
 class CICDRunDetail(Resource):
@@ -28,8 +72,10 @@ class CICDRunDetail(Resource):
     @jwt_required()
     def get(self, run_id):
         """Get CI/CD run details."""
-        run = CICDRun.query.get_or_404(run_id)
-        return {"run": run.to_dict()}, 200
+        run = _latest_run_with_raw_results(CICDRun.id == run_id)
+        if run is None:
+            abort(404)
+        return {"run": run}, 200
 
 
 class CICDTrigger(Resource):
@@ -46,80 +92,43 @@ class CICDTrigger(Resource):
         run = CICDRun(commit_hash=commit_hash, branch=branch, status="Running")
         db.session.add(run)
         db.session.commit()
+        invalidate_cicd_dashboard()
 
-        # Start security scans asynchronously (in production, use Celery)
-        scanner = SecurityScanner()
-
-        try:
-            # Run SAST (SonarQube)
-            sast_results = scanner.run_sast_scan(commit_hash)
-            run.sast_results = sast_results
-
-            # Run Trivy scan
-            trivy_results = scanner.run_trivy_scan()
-            run.trivy_results = trivy_results
-
-            # Run DAST (OWASP ZAP)
-            dast_results = scanner.run_dast_scan()
-            run.dast_results = dast_results
-
-            # Calculate vulnerabilities
-            critical_vulns = 0
-            total_vulns = 0
+        emit_dashboard_update("new_run", run.to_summary_dict())
 
-            if trivy_results:
-                critical_vulns += trivy_results.get("critical", 0)
-                total_vulns += trivy_results.get("total", 0)
+        # Scans take minutes; run them in the background and report progress over WebSocket
+        start_scan_pipeline(run.id, commit_hash)
 
-            if sast_results:
-                critical_vulns += sast_results.get("critical", 0)
-                total_vulns += sast_results.get("total", 0)
-
-            if dast_results:
-                critical_vulns += dast_results.get("critical", 0)
-                total_vulns += dast_results.get("total", 0)
-
-            run.critical_vulnerabilities = critical_vulns
-            run.total_vulnerabilities = total_vulns
-
-            # Determine status
-            if critical_vulns > 0:
-                run.status = "Blocked"
-            else:
-                run.status = "Success"
-
-            run.completed_at = datetime.utcnow()
-
-        except Exception:
-            run.status = "Failed"
-            run.completed_at = datetime.utcnow()
-
-        db.session.commit()
-
-        return {"run": run.to_dict()}, 201
+        return {"run_id": run.id, "status": run.status, "run": run.to_dict()}, 202
 
 
 class CICDDashboard(Resource):
     """CI/CD dashboard endpoint."""
 
     @jwt_required()
+    @cache.cached(timeout=CICD_DASHBOARD_CACHE_TIMEOUT, key_prefix=CICD_DASHBOARD_CACHE_KEY)
     def get(self):
         """Get dashboard statistics."""
-        total_runs = CICDRun.query.count()
-        successful_runs = CICDRun.query.filter_by(status="Success").count()
-        failed_runs = CICDRun.query.filter_by(status="Failed").count()
-        blocked_runs = CICDRun.query.filter_by(status="Blocked").count()
+        # One grouped count instead of a COUNT(*) per status
+        status_counts = dict(db.session.execute(db.select(CICDRun.status, func.count()).group_by(CICDRun.status)).all())
+        total_runs = sum(status_counts.values())
+        successful_runs = status_counts.get("Success", 0)
+        failed_runs = status_counts.get("Failed", 0)
+        blocked_runs = status_counts.get("Blocked", 0)
 
         success_rate = (successful_runs / total_runs * 100) if total_runs > 0 else 0
 
-        # Recent runs
-        recent_runs = CICDRun.query.order_by(CICDRun.created_at.desc()).limit(10).all()
-
-        # Vulnerability trends (last 30 runs)
-        recent_vulns = CICDRun.query.order_by(CICDRun.created_at.desc()).limit(30).all()
+        # Vulnerability trends (last 30 runs); the 10 most recent double as the recent runs list
+        recent_vulns = (
+            CICDRun.query.options(load_only(*CICD_RUN_SUMMARY_COLUMNS))
+            .order_by(CICDRun.created_at.desc())
+            .limit(30)
+            .all()
+        )
+        recent_runs = recent_vulns[:10]
         vuln_trend = [
             {
-                "date": run.created_at.isoformat() if run.created_at else None,
+                "date": run.created_at,
                 "critical": run.critical_vulnerabilities,
                 "total": run.total_vulnerabilities,
             }
@@ -132,7 +141,7 @@ class CICDDashboard(Resource):
             "failed_runs": failed_runs,
             "blocked_runs": blocked_runs,
             "success_rate": round(success_rate, 2),
-            "recent_runs": [run.to_dict() for run in recent_runs],
+            "recent_runs": [run.to_summary_dict() for run in recent_runs],
             "vulnerability_trend": vuln_trend,
         }, 200
 
@@ -161,12 +170,14 @@ class CICDWebhook(Resource):
             # Try to find by commit hash
             run = CICDRun.query.filter_by(commit_hash=commit_hash).order_by(CICDRun.created_at.desc()).first()
 
+        new_run = None
         if not run:
-            # Create new run
+            # Create new run; flushed for its id and committed together with the results below,
+            # and only announced once that commit succeeds
             run = CICDRun(commit_hash=commit_hash, branch=branch, status="Running")
             db.session.add(run)
-            db.session.commit()
-            emit_dashboard_update("new_run", run.to_dict())
+            db.session.flush()
+            new_run = run.to_summary_dict()
 
         # Process scan results based on type
         scan_results = data.get("results", {})
@@ -174,15 +185,15 @@ class CICDWebhook(Resource):
 
         try:
             if scan_type == "sonarqube":
-                run.sast_results = scan_results
+                run.set_scan_results("sast", scan_results)
                 emit_scan_update(run.id, "sast_progress", {"status": status, "results": scan_results})
 
             elif scan_type == "zap":
-                run.dast_results = scan_results
+                run.set_scan_results("dast", scan_results)
                 emit_scan_update(run.id, "dast_progress", {"status": status, "results": scan_results})
 
             elif scan_type == "trivy":
-                run.trivy_results = scan_results
+                run.set_scan_results("trivy", scan_results)
                 emit_scan_update(run.id, "trivy_progress", {"status": status, "results": scan_results})
 
             elif scan_type == "lint":
@@ -193,25 +204,6 @@ class CICDWebhook(Resource):
                 run.test_results = scan_results
                 emit_scan_update(run.id, "test_progress", {"status": status, "results": scan_results})
 
-            # Recalculate vulnerabilities
-            critical_vulns = 0
-            total_vulns = 0
-
-            if run.trivy_results:
-                critical_vulns += run.trivy_results.get("critical", 0)
-                total_vulns += run.trivy_results.get("total", 0)
-
-            if run.sast_results:
-                critical_vulns += run.sast_results.get("critical", 0)
-                total_vulns += run.sast_results.get("total", 0)
-
-            if run.dast_results:
-                critical_vulns += run.dast_results.get("critical", 0)
-                total_vulns += run.dast_results.get("total", 0)
-
-            run.critical_vulnerabilities = critical_vulns
-            run.total_vulnerabilities = total_vulns
-
             # Update status if all scans are complete
             if status == "completed":
                 # Check if all scans are done
@@ -222,16 +214,20 @@ class CICDWebhook(Resource):
                 )
 
                 if all_done:
-                    if critical_vulns > 0:
+                    if run.critical_vulnerabilities > 0:
                         run.status = "Blocked"
                     else:
                         run.status = "Success"
                     run.completed_at = datetime.utcnow()
 
-                    emit_scan_update(run.id, "completed", run.to_dict())
-                    emit_dashboard_update("scan_completed", run.to_dict())
+                    summary = run.to_summary_dict()
+                    emit_scan_update(run.id, "completed", summary)
+                    emit_dashboard_update("scan_completed", summary)
 
             db.session.commit()
+            invalidate_cicd_dashboard()
+            if new_run:
+                emit_dashboard_update("new_run", new_run)
 
             return {"message": f"{scan_type} results received", "run_id": run.id, "status": run.status}, 200
 
@@ -239,25 +235,109 @@ class CICDWebhook(Resource):
             run.status = "Failed"
             run.completed_at = datetime.utcnow()
             db.session.commit()
+            invalidate_cicd_dashboard()
+            if new_run:
+                emit_dashboard_update("new_run", new_run)
 
             emit_scan_update(run.id, "failed", {"error": str(e)})
 
             return {"error": "Failed to process scan results", "message": str(e)}, 500
 
 
+def _scan_items(results_column, list_key):
+    """Expand a scan result list into one JSONB row per item, numbered by position."""
+    return (
+        func.jsonb_array_elements(results_column[list_key])
+        .table_valued(sa_column("value", JSONB), with_ordinality="position")
+        .render_derived("item")
+    )
+
+
+def _json_in(element, values):
+    """Match a JSONB element against a list of values with a single containment test.
+
+    ``'["HIGH", "LOW"]' @> item->'severity'`` compares JSONB directly rather than
+    extracting each element to text first.
+    """
+    return cast(values, JSONB).contains(element)
+
+
+def _search_terms():
+    """Return the lowercased, non-empty ``search`` query values."""
+    return [term.lower() for term in request.args.getlist("search") if term]
+
+
+def _search_fields(element, terms, *keys):
+    """Case-insensitive search for any of several terms over text fields of a JSONB element.
+
+    The fields are joined and lowercased once, so each item costs one lower() and one
+    match rather than one of each per field. A single term is a LIKE; several terms are
+    compiled into one regex alternation so each item is still scanned once. concat_ws
+    skips missing fields.
+    """
+    text = func.lower(func.concat_ws(SEARCH_FIELD_SEPARATOR, *(element[key].astext for key in keys)))
+    if len(terms) == 1:
+        return text.contains(terms[0], autoescape=True)
+    return text.regexp_match("|".join(re.escape(term) for term in terms))
+
+
+def _paginate_scan_items(run_id, results_column, list_key, items, conditions, missing_error):
+    """Filter and paginate a run's scan result list inside Postgres.
+
+    Only the requested page of items leaves the database; the rest of the results
+    document is returned alongside it as before.
+    """
+    page = max(request.args.get("page", 1, type=int), 1)
+    per_page = max(request.args.get("per_page", 50, type=int), 1)
+
+    summary = db.session.execute(
+        db.select(
+            results_column.op("-", return_type=JSONB)(list_key),
+            results_column.is_(None) | (results_column == cast({}, JSONB)),
+        ).where(CICDRun.id == run_id)
+    ).first()
+    if summary is None:
+        abort(404)
+
+    results, missing = summary
+    if missing:
+        return {"error": missing_error}, 404
+
+    filtered = db.select(CICDRun.id).select_from(CICDRun).join(items, true()).where(CICDRun.id == run_id, *conditions)
+    rows = db.session.execute(
+        filtered.with_only_columns(items.c.value, func.count().over())
+        .order_by(items.c.position)
+        .offset((page - 1) * per_page)
+        .limit(per_page)
+    ).all()
+
+    # The window count rides along with the page; only an empty page past the end needs a recount
+    if rows:
+        total = rows[0][1]
+    elif page == 1:
+        total = 0
+    else:
+        total = db.session.execute(filtered.with_only_columns(func.count())).scalar()
+
+    results[list_key] = [row[0] for row in rows]
+    results["pagination"] = {
+        "page": page,
+        "per_page": per_page,
+        "total": total,
+        "pages": (total + per_page - 1) // per_page,
+    }
+
+    return {"results": results}, 200
+
+
 class CICDRunSAST(Resource):
     """Get detailed SonarQube results for a run."""
 
     @jwt_required()
     def get(self, run_id):
         """Get SonarQube results with filtering and pagination."""
-        run = CICDRun.query.get_or_404(run_id)
-
-        if not run.sast_results:
-            return {"error": "No SonarQube results available"}, 404
-
-        results = run.sast_results.copy()
-        issues = results.get("issues", [])
+        items = _scan_items(CICDRun.sast_results, "issues")
+        issue = items.c.value
 
         # Apply filters
         severity_filter = request.args.getlist("severity")
@@ -265,48 +345,26 @@ class CICDRunSAST(Resource):
         status_filter = request.args.getlist("status")
         component_filter = request.args.get("component")
         rule_filter = request.args.get("rule")
-        search = request.args.get("search", "").lower()
+        search = _search_terms()
 
-        filtered_issues = issues
+        conditions = []
 
         if severity_filter:
-            filtered_issues = [i for i in filtered_issues if i.get("severity") in severity_filter]
+            conditions.append(_json_in(issue["severity"], severity_filter))
         if type_filter:
-            filtered_issues = [i for i in filtered_issues if i.get("type") in type_filter]
+            conditions.append(_json_in(issue["type"], type_filter))
         if status_filter:
-            filtered_issues = [i for i in filtered_issues if i.get("status") in status_filter]
+            conditions.append(_json_in(issue["status"], status_filter))
         if component_filter:
-            filtered_issues = [i for i in filtered_issues if component_filter in i.get("component", "")]
+            conditions.append(issue["component"].astext.contains(component_filter, autoescape=True))
         if rule_filter:
-            filtered_issues = [i for i in filtered_issues if rule_filter in i.get("rule", "")]
+            conditions.append(issue["rule"].astext.contains(rule_filter, autoescape=True))
         if search:
-            filtered_issues = [
-                i
-                for i in filtered_issues
-                if (
-                    search in i.get("message", "").lower()
-                    or search in i.get("component", "").lower()
-                    or search in i.get("rule", "").lower()
-                )
-            ]
-
-        # Pagination
-        page = request.args.get("page", 1, type=int)
-        per_page = request.args.get("per_page", 50, type=int)
-        start = (page - 1) * per_page
-        end = start + per_page
-
-        paginated_issues = filtered_issues[start:end]
-
-        results["issues"] = paginated_issues
-        results["pagination"] = {
-            "page": page,
-            "per_page": per_page,
-            "total": len(filtered_issues),
-            "pages": (len(filtered_issues) + per_page - 1) // per_page,
-        }
+            conditions.append(_search_fields(issue, search, "message", "component", "rule"))
 
-        return {"results": results}, 200
+        return _paginate_scan_items(
+            run_id, CICDRun.sast_results, "issues", items, conditions, "No SonarQube results available"
+        )
 
 
 class CICDRunDAST(Resource):
@@ -315,13 +373,8 @@ class CICDRunDAST(Resource):
     @jwt_required()
     def get(self, run_id):
         """Get ZAP results with filtering and pagination."""
-        run = CICDRun.query.get_or_404(run_id)
-
-        if not run.dast_results:
-            return {"error": "No ZAP results available"}, 404
-
-        results = run.dast_results.copy()
-        alerts = results.get("alerts", [])
+        items = _scan_items(CICDRun.dast_results, "alerts")
+        alert = items.c.value
 
         # Apply filters
         risk_filter = request.args.getlist("risk")
@@ -329,48 +382,26 @@ class CICDRunDAST(Resource):
         alert_name_filter = request.args.get("alert_name")
         url_filter = request.args.get("url")
         cwe_filter = request.args.get("cwe")
-        search = request.args.get("search", "").lower()
+        search = _search_terms()
 
-        filtered_alerts = alerts
+        conditions = []
 
         if risk_filter:
-            filtered_alerts = [a for a in filtered_alerts if a.get("risk") in risk_filter]
+            conditions.append(_json_in(alert["risk"], risk_filter))
         if confidence_filter:
-            filtered_alerts = [a for a in filtered_alerts if a.get("confidence") in confidence_filter]
+            conditions.append(_json_in(alert["confidence"], confidence_filter))
         if alert_name_filter:
-            filtered_alerts = [a for a in filtered_alerts if alert_name_filter in a.get("name", "")]
+            conditions.append(alert["name"].astext.contains(alert_name_filter, autoescape=True))
         if url_filter:
-            filtered_alerts = [a for a in filtered_alerts if url_filter in a.get("url", "")]
+            conditions.append(alert["url"].astext.contains(url_filter, autoescape=True))
         if cwe_filter:
-            filtered_alerts = [a for a in filtered_alerts if cwe_filter == str(a.get("cweid", ""))]
+            conditions.append(alert["cweid"].astext == cwe_filter)
         if search:
-            filtered_alerts = [
-                a
-                for a in filtered_alerts
-                if (
-                    search in a.get("name", "").lower()
-                    or search in a.get("url", "").lower()
-                    or search in a.get("description", "").lower()
-                )
-            ]
-
-        # Pagination
-        page = request.args.get("page", 1, type=int)
-        per_page = request.args.get("per_page", 50, type=int)
-        start = (page - 1) * per_page
-        end = start + per_page
-
-        paginated_alerts = filtered_alerts[start:end]
-
-        results["alerts"] = paginated_alerts
-        results["pagination"] = {
-            "page": page,
-            "per_page": per_page,
-            "total": len(filtered_alerts),
-            "pages": (len(filtered_alerts) + per_page - 1) // per_page,
-        }
+            conditions.append(_search_fields(alert, search, "name", "url", "description"))
 
-        return {"results": results}, 200
+        return _paginate_scan_items(
+            run_id, CICDRun.dast_results, "alerts", items, conditions, "No ZAP results available"
+        )
 
 
 class CICDRunTrivy(Resource):
@@ -379,13 +410,8 @@ class CICDRunTrivy(Resource):
     @jwt_required()
     def get(self, run_id):
         """Get Trivy results with filtering and pagination."""
-        run = CICDRun.query.get_or_404(run_id)
-
-        if not run.trivy_results:
-            return {"error": "No Trivy results available"}, 404
-
-        results = run.trivy_results.copy()
-        vulnerabilities = results.get("vulnerabilities", [])
+        items = _scan_items(CICDRun.trivy_results, "vulnerabilities")
+        vuln = items.c.value
 
         # Apply filters
         severity_filter = request.args.getlist("severity")
@@ -393,55 +419,31 @@ class CICDRunTrivy(Resource):
         cve_filter = request.args.get("cve")
         package_type_filter = request.args.get("package_type")
         cvss_min = request.args.get("cvss_min", type=float)
-        search = request.args.get("search", "").lower()
+        search = _search_terms()
 
-        filtered_vulns = vulnerabilities
+        conditions = []
 
         if severity_filter:
-            filtered_vulns = [v for v in filtered_vulns if v.get("severity") in severity_filter]
+            conditions.append(_json_in(vuln["severity"], severity_filter))
         if package_filter:
-            filtered_vulns = [v for v in filtered_vulns if package_filter in v.get("pkg_name", "")]
+            conditions.append(vuln["pkg_name"].astext.contains(package_filter, autoescape=True))
         if cve_filter:
-            filtered_vulns = [v for v in filtered_vulns if cve_filter in v.get("vulnerability_id", "")]
+            conditions.append(vuln["vulnerability_id"].astext.contains(cve_filter, autoescape=True))
         if package_type_filter:
-            filtered_vulns = [v for v in filtered_vulns if v.get("package_type") == package_type_filter]
+            conditions.append(vuln["package_type"].astext == package_type_filter)
         if cvss_min is not None:
-            filtered_vulns = [
-                v
-                for v in filtered_vulns
-                if (
-                    v.get("cvss", {}).get("v3", {}).get("score", 0) >= cvss_min
-                    or v.get("cvss", {}).get("v2", {}).get("score", 0) >= cvss_min
+            conditions.append(
+                or_(
+                    func.coalesce(vuln[("cvss", "v3", "score")].as_float(), 0) >= cvss_min,
+                    func.coalesce(vuln[("cvss", "v2", "score")].as_float(), 0) >= cvss_min,
                 )
-            ]
+            )
         if search:
-            filtered_vulns = [
-                v
-                for v in filtered_vulns
-                if (
-                    search in v.get("vulnerability_id", "").lower()
-                    or search in v.get("pkg_name", "").lower()
-                    or search in v.get("description", "").lower()
-                )
-            ]
-
-        # Pagination
-        page = request.args.get("page", 1, type=int)
-        per_page = request.args.get("per_page", 50, type=int)
-        start = (page - 1) * per_page
-        end = start + per_page
+            conditions.append(_search_fields(vuln, search, "vulnerability_id", "pkg_name", "description"))
 
-        paginated_vulns = filtered_vulns[start:end]
-
-        results["vulnerabilities"] = paginated_vulns
-        results["pagination"] = {
-            "page": page,
-            "per_page": per_page,
-            "total": len(filtered_vulns),
-            "pages": (len(filtered_vulns) + per_page - 1) // per_page,
-        }
-
-        return {"results": results}, 200
+        return _paginate_scan_items(
+            run_id, CICDRun.trivy_results, "vulnerabilities", items, conditions, "No Trivy results available"
+        )
 
 
 class LatestSonarQubeScan(Resource):
@@ -450,12 +452,12 @@ class LatestSonarQubeScan(Resource):
     @jwt_required()
     def get(self):
         """Get latest SonarQube scan with all issues."""
-        run = CICDRun.query.filter(CICDRun.sast_results.isnot(None)).order_by(CICDRun.created_at.desc()).first()
+        run = _latest_run_with_raw_results(CICDRun.sast_results.isnot(None))
 
         if not run:
             return {"run": None, "sast_results": None, "message": "No SonarQube scans found"}, 200
 
-        return {"run": run.to_dict(), "sast_results": run.sast_results}, 200
+        return {"run": run, "sast_results": run["sast_results"]}, 200
 
 
 class LatestZAPScan(Resource):
@@ -464,12 +466,12 @@ class LatestZAPScan(Resource):
     @jwt_required()
     def get(self):
         """Get latest ZAP scan with all alerts."""
-        run = CICDRun.query.filter(CICDRun.dast_results.isnot(None)).order_by(CICDRun.created_at.desc()).first()
+        run = _latest_run_with_raw_results(CICDRun.dast_results.isnot(None))
 
         if not run:
             return {"run": None, "dast_results": None, "message": "No ZAP scans found"}, 200
 
-        return {"run": run.to_dict(), "dast_results": run.dast_results}, 200
+        return {"run": run, "dast_results": run["dast_results"]}, 200
 
 
 class LatestTrivyScan(Resource):
@@ -478,12 +480,12 @@ class LatestTrivyScan(Resource):
     @jwt_required()
     def get(self):
         """Get latest Trivy scan with all vulnerabilities."""
-        run = CICDRun.query.filter(CICDRun.trivy_results.isnot(None)).order_by(CICDRun.created_at.desc()).first()
+        run = _latest_run_with_raw_results(CICDRun.trivy_results.isnot(None))
 
         if not run:
             return {"run": None, "trivy_results": None, "message": "No Trivy scans found"}, 200
 
-        return {"run": run.to_dict(), "trivy_results": run.trivy_results}, 200
+        return {"run": run, "trivy_results": run["trivy_results"]}, 200
 
 
 class TriggerSonarQubeScan(Resource):
@@ -505,15 +507,16 @@ class TriggerSonarQubeScan(Resource):
             run = CICDRun(commit_hash=commit_hash, branch=data.get("branch", "main"), status="Running")
             db.session.add(run)
 
-        run.sast_results = results
+        run.set_scan_results("sast", results)
         if results.get("status") == "completed":
             run.status = "Success" if results.get("critical", 0) == 0 else "Blocked"
             run.completed_at = datetime.utcnow()
 
         db.session.commit()
+        invalidate_cicd_dashboard()
 
         emit_scan_update(run.id, "sast_progress", results)
-        emit_dashboard_update("scan_completed", run.to_dict())
+        emit_dashboard_update("scan_completed", run.to_summary_dict())
 
         return {"run_id": run.id, "results": results}, 201
 
@@ -538,8 +541,9 @@ class TriggerZAPScan(Resource):
         db.session.commit()
 
         # Store initial scan state
-        run.dast_results = results
+        run.set_scan_results("dast", results)
         db.session.commit()
+        invalidate_cicd_dashboard()
 
         emit_scan_update(run.id, "dast_progress", results)
 
@@ -572,15 +576,16 @@ class TriggerTrivyScan(Resource):
             )
             db.session.add(run)
 
-        run.trivy_results = results
+        run.set_scan_results("trivy", results)
         if results.get("status") == "completed":
             run.status = "Success" if results.get("critical", 0) == 0 else "Blocked"
             run.completed_at = datetime.utcnow()
 
         db.session.commit()
+        invalidate_cicd_dashboard()
 
         emit_scan_update(run.id, "trivy_progress", results)
-        emit_dashboard_update("scan_completed", run.to_dict())
+        emit_dashboard_update("scan_completed", run.to_summary_dict())
 
         return {"run_id": run.id, "results": results}, 201
 
@@ -1,16 +1,26 @@
 """Requirements management API endpoints."""
 
-from flask import request, jsonify
+from flask import Response, request, stream_with_context
 from flask_restful import Resource
 from flask_jwt_extended import get_jwt_identity
 from app.core.security import jwt_required
 from marshmallow import Schema, fields, ValidationError, validate
-from app import db
+from sqlalchemy import func
+from sqlalchemy.orm import selectinload
+from app import db, cache
 from app.models.requirement import Requirement, SecurityControl
-from app.core.security import admin_required
+from app.core.security import admin_required, is_admin
+from app.core.dashboard_cache import (
+    COMPLIANCE_DASHBOARD_CACHE_KEY,
+    COMPLIANCE_DASHBOARD_CACHE_TIMEOUT,
+    invalidate_compliance_dashboard,
+)
 import csv
 import io
 
+# Requirements loaded per round trip while streaming the CSV export
+EXPORT_BATCH_SIZE = 500
+
 
 class RequirementSchema(Schema):
     """Schema for requirement."""
@@ -22,21 +32,25 @@ class RequirementSchema(Schema):
     owasp_asvs_level = fields.Str(validate=validate.OneOf(["Level 1", "Level 2", "Level 3"]))
 
 
+_REQUIREMENT_SCHEMA = RequirementSchema()
+
+
 class RequirementList(Resource):
     """Requirements list endpoint."""
 
     @jwt_required()
     def get(self):
         """Get all requirements."""
-        requirements = Requirement.query.order_by(Requirement.created_at.desc()).all()
+        requirements = (
+            Requirement.query.options(selectinload(Requirement.controls)).order_by(Requirement.created_at.desc()).all()
+        )
         return {"requirements": [req.to_dict() for req in requirements]}, 200
 
     @jwt_required()
     def post(self):
         """Create a new requirement."""
-        schema = RequirementSchema()
         try:
-            data = schema.load(request.json)
+            data = _REQUIREMENT_SCHEMA.load(request.json)
         except ValidationError as err:
             return {"errors": err.messages}, 400
 
@@ -56,22 +70,42 @@ class RequirementList(Resource):
             owasp_asvs_level=data.get("owasp_asvs_level"),
         )
 
-        db.session.add(requirement)
-        db.session.flush()
-
-        # Create security controls
-        for ctrl_data in data["security_controls"]:
-            control = SecurityControl(
+        requirement.controls = [
+            SecurityControl(
                 name=ctrl_data.get("name", ""),
                 description=ctrl_data.get("description"),
                 owasp_asvs_level=ctrl_data.get("owasp_asvs_level"),
-                requirement_id=requirement.id,
             )
-            db.session.add(control)
+            for ctrl_data in data["security_controls"]
+        ]
+        db.session.add(requirement)
+
+        # One INSERT for the requirement and one multi-row INSERT for its controls. Serialize
+        # before committing so the response does not reload the expired rows.
+        db.session.flush()
+        result = requirement.to_dict()
 
         db.session.commit()
+        invalidate_compliance_dashboard()
+
+        return {"requirement": result}, 201
+
 
-        return {"requirement": requirement.to_dict()}, 201
+def _get_requirement_for_edit(req_id, user_id):
+    """Return a requirement the user may modify, None if they may not, or abort with 404.
+
+    The owner check needs only the requirement row; the admin check is served from the
+    cached user auth. Controls arrive with it, since both update and delete need them.
+    """
+    requirement = db.get_or_404(Requirement, req_id)
+    if requirement.created_by == user_id or is_admin(user_id):
+        return requirement
+    return None
+
+
+def _require_requirement(req_id):
+    """Abort with 404 unless the requirement exists, without loading it or its controls."""
+    db.first_or_404(db.select(Requirement.id).where(Requirement.id == req_id))
 
 
 class RequirementDetail(Resource):
@@ -86,16 +120,9 @@ class RequirementDetail(Resource):
     @jwt_required()
     def put(self, req_id):
         """Update requirement."""
-        requirement = Requirement.query.get_or_404(req_id)
-        user_id = get_jwt_identity()
-
-        # Check permissions
-        if requirement.created_by != user_id:
-            from app.models.user import User
-
-            user = User.query.get(user_id)
-            if user.role != "Admin":
-                return {"error": "Insufficient permissions"}, 403
+        requirement = _get_requirement_for_edit(req_id, get_jwt_identity())
+        if requirement is None:
+            return {"error": "Insufficient permissions"}, 403
 
         data = request.json
         if "title" in data:
@@ -108,24 +135,19 @@ class RequirementDetail(Resource):
             requirement.owasp_asvs_level = data["owasp_asvs_level"]
 
         db.session.commit()
+        invalidate_compliance_dashboard()
         return {"requirement": requirement.to_dict()}, 200
 
     @jwt_required()
     def delete(self, req_id):
         """Delete requirement."""
-        requirement = Requirement.query.get_or_404(req_id)
-        user_id = get_jwt_identity()
-
-        # Check permissions
-        if requirement.created_by != user_id:
-            from app.models.user import User
-
-            user = User.query.get(user_id)
-            if user.role != "Admin":
-                return {"error": "Insufficient permissions"}, 403
+        requirement = _get_requirement_for_edit(req_id, get_jwt_identity())
+        if requirement is None:
+            return {"error": "Insufficient permissions"}, 403
 
         db.session.delete(requirement)
         db.session.commit()
+        invalidate_compliance_dashboard()
         return {"message": "Requirement deleted successfully"}, 200
 
 
@@ -135,14 +157,15 @@ class SecurityControlList(Resource):
     @jwt_required()
     def get(self, req_id):
         """Get security controls for a requirement."""
-        Requirement.query.get_or_404(req_id)  # Verify requirement exists
         controls = SecurityControl.query.filter_by(requirement_id=req_id).all()
+        if not controls:
+            _require_requirement(req_id)  # Only an empty result needs the existence check
         return {"controls": [ctrl.to_dict() for ctrl in controls]}, 200
 
     @jwt_required()
     def post(self, req_id):
         """Add security control to requirement."""
-        Requirement.query.get_or_404(req_id)  # Verify requirement exists
+        _require_requirement(req_id)
 
         data = request.json
         control = SecurityControl(
@@ -154,6 +177,7 @@ class SecurityControlList(Resource):
 
         db.session.add(control)
         db.session.commit()
+        invalidate_compliance_dashboard()
 
         return {"control": control.to_dict()}, 201
 
@@ -165,57 +189,82 @@ class RequirementExport(Resource):
     def get(self):
         """Export requirements as CSV or JSON."""
         format_type = request.args.get("format", "json")
-        requirements = Requirement.query.all()
+        query = Requirement.query.options(selectinload(Requirement.controls)).order_by(Requirement.id)
 
         if format_type == "csv":
-            output = io.StringIO()
-            writer = csv.writer(output)
-            headers = ["ID", "Title", "Description", "Status", "OWASP ASVS Level", "Security Controls", "Created At"]
-            writer.writerow(headers)
-
-            for req in requirements:
-                controls = ", ".join([ctrl.name for ctrl in req.controls])
-                writer.writerow(
-                    [
-                        req.id,
-                        req.title,
-                        req.description or "",
-                        req.status,
-                        req.owasp_asvs_level or "",
-                        controls,
-                        req.created_at.isoformat() if req.created_at else "",
-                    ]
-                )
-
-            return jsonify({"data": output.getvalue(), "format": "csv"})
+            return Response(
+                stream_with_context(_generate_requirements_csv(query)),
+                mimetype="text/csv",
+                headers={"Content-Disposition": "attachment; filename=requirements.csv"},
+            )
         else:
-            return {"requirements": [req.to_dict() for req in requirements]}, 200
+            return {"requirements": [req.to_dict() for req in query.all()]}, 200
+
+
+def _generate_requirements_csv(query):
+    """Yield the requirements export as CSV, one row at a time."""
+    output = io.StringIO()
+    writer = csv.writer(output)
+
+    def row(values):
+        writer.writerow(values)
+        line = output.getvalue()
+        output.seek(0)
+        output.truncate(0)
+        return line
+
+    yield row(["ID", "Title", "Description", "Status", "OWASP ASVS Level", "Security Controls", "Created At"])
+
+    # Stream in batches; each batch's controls come from one selectin query
+    for req in query.yield_per(EXPORT_BATCH_SIZE):
+        controls = ", ".join([ctrl.name for ctrl in req.controls])
+        yield row(
+            [
+                req.id,
+                req.title,
+                req.description or "",
+                req.status,
+                req.owasp_asvs_level or "",
+                controls,
+                req.created_at.isoformat() if req.created_at else "",
+            ]
+        )
 
 
 class ComplianceDashboard(Resource):
     """Compliance dashboard endpoint."""
 
     @admin_required
+    @cache.cached(timeout=COMPLIANCE_DASHBOARD_CACHE_TIMEOUT, key_prefix=COMPLIANCE_DASHBOARD_CACHE_KEY)
     def get(self):
         """Get compliance dashboard data."""
-        requirements = Requirement.query.all()
-
-        total_requirements = len(requirements)
-        requirements_with_controls = sum(1 for req in requirements if req.controls.count() > 0)
-        compliance_rate = (requirements_with_controls / total_requirements * 100) if total_requirements > 0 else 0
+        # One grouped pass over requirements; the loop below only walks the (status, level) groups
+        groups = db.session.execute(
+            db.select(Requirement.status, Requirement.owasp_asvs_level, func.count()).group_by(
+                Requirement.status, Requirement.owasp_asvs_level
+            )
+        ).all()
+        # EXISTS stops at the first control per requirement instead of de-duplicating them all
+        requirements_with_controls = db.session.execute(
+            db.select(func.count(Requirement.id)).where(Requirement.controls.any())
+        ).scalar()
 
         # OWASP ASVS level distribution
-        level_distribution = {
-            "Level 1": sum(1 for req in requirements if req.owasp_asvs_level == "Level 1"),
-            "Level 2": sum(1 for req in requirements if req.owasp_asvs_level == "Level 2"),
-            "Level 3": sum(1 for req in requirements if req.owasp_asvs_level == "Level 3"),
-            "Not Specified": sum(1 for req in requirements if not req.owasp_asvs_level),
-        }
+        level_distribution = {"Level 1": 0, "Level 2": 0, "Level 3": 0, "Not Specified": 0}
 
         # Status distribution
         status_distribution = {}
-        for req in requirements:
-            status_distribution[req.status] = status_distribution.get(req.status, 0) + 1
+
+        total_requirements = 0
+        for status, level, count in groups:
+            total_requirements += count
+            status_distribution[status] = status_distribution.get(status, 0) + count
+            if not level:
+                level_distribution["Not Specified"] += count
+            elif level in level_distribution:
+                level_distribution[level] += count
+
+        compliance_rate = (requirements_with_controls / total_requirements * 100) if total_requirements > 0 else 0
 
         return {
             "total_requirements": total_requirements,
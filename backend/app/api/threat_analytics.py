@@ -2,92 +2,99 @@
 
 from flask_restful import Resource
 from app.core.security import jwt_required
-from app import db
-from app.models.threat import Threat
+from app import db, cache
+from app.models.threat import Threat, DREAD_FACTORS
 from app.models.threat_vulnerability import ThreatVulnerability
-from sqlalchemy import func
+from app.core.dashboard_cache import THREAT_ANALYTICS_CACHE_KEY, THREAT_ANALYTICS_CACHE_TIMEOUT
+from sqlalchemy import cast, func, true
+from sqlalchemy.dialects.postgresql import JSONB, aggregate_order_by
 from datetime import datetime, timedelta
 
 
+def _counts_object(grouped):
+    """Fold a grouped (key, count) SELECT into a scalar subquery returning one JSONB object."""
+    key, count = grouped.subquery().c
+    return db.select(func.coalesce(func.jsonb_object_agg(key, count), cast({}, JSONB))).scalar_subquery()
+
+
 class ThreatAnalytics(Resource):
     """Threat analytics endpoint."""
 
     @jwt_required()
+    @cache.cached(timeout=THREAT_ANALYTICS_CACHE_TIMEOUT, key_prefix=THREAT_ANALYTICS_CACHE_KEY)
     def get(self):
         """Get threat analytics and statistics."""
-        # Total threats
-        total_threats = Threat.query.count()
-
-        # Threats by risk level
-        risk_level_stats = (
-            db.session.query(Threat.risk_level, func.count(Threat.id).label("count")).group_by(Threat.risk_level).all()
+        # Every aggregate comes back in one round trip: the threat-level aggregates scan
+        # threats once, and each grouped breakdown is folded into JSONB by a scalar subquery
+        risk_levels = _counts_object(db.select(Threat.risk_level, func.count()).group_by(Threat.risk_level))
+
+        category = func.jsonb_array_elements_text(Threat.stride_categories).table_valued("value").render_derived()
+        stride_distribution = _counts_object(
+            db.select(category.c.value, func.count())
+            .select_from(Threat)
+            .join(category, true())
+            .where(func.jsonb_typeof(Threat.stride_categories) == "array", category.c.value.isnot(None))
+            .group_by(category.c.value)
         )
 
-        risk_levels = {level: count for level, count in risk_level_stats}
-
-        # STRIDE category distribution
-        stride_stats = {}
-        threats = Threat.query.all()
-        for threat in threats:
-            categories = threat.stride_categories or []
-            for category in categories:
-                stride_stats[category] = stride_stats.get(category, 0) + 1
-
-        # Most common assets
-        asset_stats = (
-            db.session.query(Threat.asset, func.count(Threat.id).label("count"))
+        top_assets = (
+            db.select(Threat.asset, func.count().label("count"))
             .group_by(Threat.asset)
-            .order_by(func.count(Threat.id).desc())
+            .order_by(func.count().desc())
             .limit(10)
-            .all()
+            .subquery()
         )
+        asset_entry = func.jsonb_build_object("asset", top_assets.c.asset, "count", top_assets.c.count)
+        most_vulnerable_assets = db.select(
+            func.coalesce(func.jsonb_agg(aggregate_order_by(asset_entry, top_assets.c.count.desc())), cast([], JSONB))
+        ).scalar_subquery()
 
-        most_vulnerable_assets = [{"asset": asset, "count": count} for asset, count in asset_stats]
-
-        # Threats with vulnerabilities vs theoretical
-        threats_with_vulns = db.session.query(func.count(func.distinct(ThreatVulnerability.threat_id))).scalar() or 0
-        theoretical_threats = total_threats - threats_with_vulns
-
-        # Average DREAD scores
-        avg_dread = db.session.query(
-            func.avg(func.cast(Threat.dread_score["damage"], db.Integer)).label("avg_damage"),
-            func.avg(func.cast(Threat.dread_score["reproducibility"], db.Integer)).label("avg_reproducibility"),
-            func.avg(func.cast(Threat.dread_score["exploitability"], db.Integer)).label("avg_exploitability"),
-            func.avg(func.cast(Threat.dread_score["affected_users"], db.Integer)).label("avg_affected_users"),
-            func.avg(func.cast(Threat.dread_score["discoverability"], db.Integer)).label("avg_discoverability"),
-        ).first()
-
-        avg_scores = {
-            "damage": round(float(avg_dread.avg_damage or 0), 2),
-            "reproducibility": round(float(avg_dread.avg_reproducibility or 0), 2),
-            "exploitability": round(float(avg_dread.avg_exploitability or 0), 2),
-            "affected_users": round(float(avg_dread.avg_affected_users or 0), 2),
-            "discoverability": round(float(avg_dread.avg_discoverability or 0), 2),
-        }
-
-        # Threat trends (last 30 days)
+        # Threat trends (last 30 days), bucketed by day
         thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-        recent_threats = Threat.query.filter(Threat.created_at >= thirty_days_ago).all()
-
-        # Group by date
-        threat_trends = {}
-        for threat in recent_threats:
-            date_key = threat.created_at.date().isoformat()
-            threat_trends[date_key] = threat_trends.get(date_key, 0) + 1
+        day = func.to_char(Threat.created_at, "YYYY-MM-DD")
+        threat_trends = _counts_object(
+            db.select(day, func.count()).where(Threat.created_at >= thirty_days_ago).group_by(day)
+        )
 
-        # Vulnerability statistics
-        vuln_stats = (
-            db.session.query(ThreatVulnerability.vulnerability_type, func.count(ThreatVulnerability.id).label("count"))
-            .group_by(ThreatVulnerability.vulnerability_type)
-            .all()
+        # One pass over the links for all three vulnerability counts
+        vulnerability_counts = db.select(
+            func.jsonb_build_object(
+                "total",
+                func.count(),
+                "resolved",
+                func.count().filter(ThreatVulnerability.status == "resolved"),
+                "threats",
+                func.count(func.distinct(ThreatVulnerability.threat_id)),
+            )
+        ).scalar_subquery()
+        vulnerability_types = _counts_object(
+            db.select(ThreatVulnerability.vulnerability_type, func.count()).group_by(
+                ThreatVulnerability.vulnerability_type
+            )
         )
 
-        vulnerability_types = {vtype: count for vtype, count in vuln_stats}
+        stats = db.session.execute(
+            db.select(
+                func.count().label("total_threats"),
+                *[func.avg(getattr(Threat, f)).label(f) for f in DREAD_FACTORS],
+                risk_levels.label("risk_levels"),
+                stride_distribution.label("stride_distribution"),
+                most_vulnerable_assets.label("most_vulnerable_assets"),
+                threat_trends.label("threat_trends"),
+                vulnerability_counts.label("vulnerability_counts"),
+                vulnerability_types.label("vulnerability_types"),
+            ).select_from(Threat)
+        ).one()
+
+        total_threats = stats.total_threats
+        vuln_counts = stats.vulnerability_counts
+        threats_with_vulns = vuln_counts["threats"]
+        theoretical_threats = total_threats - threats_with_vulns
+
+        avg_scores = {factor: round(float(getattr(stats, factor) or 0), 2) for factor in DREAD_FACTORS}
 
-        # Resolution rate
-        resolved_vulns = ThreatVulnerability.query.filter_by(status="resolved").count()
-        total_vulns = ThreatVulnerability.query.count()
-        resolution_rate = (resolved_vulns / total_vulns * 100) if total_vulns > 0 else 0
+        total_vulns = vuln_counts["total"]
+        resolution_rate = (vuln_counts["resolved"] / total_vulns * 100) if total_vulns > 0 else 0
 
         return {
             "summary": {
@@ -96,10 +103,10 @@ class ThreatAnalytics(Resource):
                 "theoretical_threats": theoretical_threats,
                 "resolution_rate": round(resolution_rate, 2),
             },
-            "risk_levels": risk_levels,
-            "stride_distribution": stride_stats,
-            "most_vulnerable_assets": most_vulnerable_assets,
+            "risk_levels": stats.risk_levels,
+            "stride_distribution": stats.stride_distribution,
+            "most_vulnerable_assets": stats.most_vulnerable_assets,
             "average_dread_scores": avg_scores,
-            "threat_trends": threat_trends,
-            "vulnerability_types": vulnerability_types,
+            "threat_trends": stats.threat_trends,
+            "vulnerability_types": stats.vulnerability_types,
         }, 200
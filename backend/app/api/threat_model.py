@@ -1,16 +1,47 @@
 """Threat modeling API endpoints."""
 
-from flask import request
+from itertools import chain
+from flask import Response, request
 from flask_restful import Resource
 from app.core.security import jwt_required
 from marshmallow import Schema, fields, ValidationError, validate
+from sqlalchemy import Text, cast, func, tuple_
+from sqlalchemy.dialects.postgresql import JSONB, aggregate_order_by, insert as pg_insert
 from app import db
-from app.models.threat import Threat
-from app.models.threat_vulnerability import ThreatVulnerability
+from app.models.threat import Threat, DREAD_FACTORS, THREAT_COLUMNS
+from app.models.threat_vulnerability import ThreatVulnerability, THREAT_VULNERABILITY_COLUMNS
+from app.core.dashboard_cache import invalidate_threat_analytics
+from app.core.pagination import decode_cursor, encode_cursor
 from app.services.stride_dread_engine import STRIDEEngine
-from app.services.dread_scorer import DREADScorer
+from app.services.dread_scorer import DREADScorer, risk_level_from_score
 from app.services.threat_similarity import ThreatSimilarityService
 
+try:
+    from app.services.enhanced_mitigations import EnhancedMitigationEngine
+except ImportError:
+    EnhancedMitigationEngine = None
+
+# The analysis services keep no per-request state, so one instance of each serves every request
+_stride_engine = STRIDEEngine()
+_dread_scorer = DREADScorer()
+_enhanced_engine = EnhancedMitigationEngine() if EnhancedMitigationEngine else None
+_similarity_service = ThreatSimilarityService()
+
+# Threats per ThreatList page, by default and at most
+THREAT_PAGE_SIZE = 50
+MAX_THREAT_PAGE_SIZE = 200
+
+
+def _rows(stmt):
+    """Run a Core SELECT and return its rows as plain dicts, leaving datetimes for the JSON encoder."""
+    return [dict(row) for row in db.session.execute(stmt).mappings()]
+
+
+def _json_object(columns, **extra):
+    """Build a jsonb_build_object() expression keyed by column name, plus any extra values."""
+    pairs = [(column.key, column) for column in columns] + list(extra.items())
+    return func.jsonb_build_object(*chain.from_iterable(pairs))
+
 
 class ThreatAnalyzeSchema(Schema):
     """Schema for threat analysis."""
@@ -26,84 +57,64 @@ class ThreatAnalyzeSchema(Schema):
     discoverability = fields.Int(validate=validate.Range(min=0, max=10), allow_none=True)
 
 
+_ANALYZE_SCHEMA = ThreatAnalyzeSchema()
+
+
 class ThreatAnalyze(Resource):
     """Threat analysis endpoint."""
 
     @jwt_required()
     def post(self):
         """Analyze a threat using STRIDE/DREAD."""
-        schema = ThreatAnalyzeSchema()
         try:
-            data = schema.load(request.json)
+            data = _ANALYZE_SCHEMA.load(request.json)
         except ValidationError as err:
             return {"errors": err.messages}, 400
 
         auto_score = data.get("auto_score", False)
 
         # Use advanced STRIDE engine to analyze
-        engine = STRIDEEngine()
-        advanced_analysis = engine.analyze_threat_advanced(data["asset"], data["flow"], data.get("trust_boundary"))
+        advanced_analysis = _stride_engine.analyze_threat_advanced(
+            data["asset"], data["flow"], data.get("trust_boundary")
+        )
         stride_categories = advanced_analysis["stride_categories"]
 
         # Handle DREAD scoring
-        dread_scorer = DREADScorer()
         user_scores = None
 
         if not auto_score:
             # Manual scoring - validate all scores are provided
-            required_keys = ["damage", "reproducibility", "exploitability", "affected_users", "discoverability"]
-            if not all(data.get(key) is not None for key in required_keys):
+            if any(data.get(factor) is None for factor in DREAD_FACTORS):
                 return {"errors": {"dread_scores": "All DREAD scores are required when auto_score is false"}}, 400
 
-            dread_scores = {
-                "damage": data["damage"],
-                "reproducibility": data["reproducibility"],
-                "exploitability": data["exploitability"],
-                "affected_users": data["affected_users"],
-                "discoverability": data["discoverability"],
-            }
+            dread_scores = {factor: data[factor] for factor in DREAD_FACTORS}
             dread_suggestions = None
         else:
-            # Auto-scoring - get suggestions
-            user_scores = {}
-            if data.get("damage") is not None:
-                user_scores["damage"] = data["damage"]
-            if data.get("reproducibility") is not None:
-                user_scores["reproducibility"] = data["reproducibility"]
-            if data.get("exploitability") is not None:
-                user_scores["exploitability"] = data["exploitability"]
-            if data.get("affected_users") is not None:
-                user_scores["affected_users"] = data["affected_users"]
-            if data.get("discoverability") is not None:
-                user_scores["discoverability"] = data["discoverability"]
-
-            dread_suggestions = dread_scorer.suggest_dread_scores(
+            # Auto-scoring - get suggestions, keeping any factors the user scored
+            user_scores = {factor: score for factor in DREAD_FACTORS if (score := data.get(factor)) is not None}
+
+            dread_suggestions = _dread_scorer.suggest_dread_scores(
                 data["asset"], data["flow"], data.get("trust_boundary"), user_scores if user_scores else None
             )
             dread_scores = dread_suggestions["suggested_scores"]
 
         # Calculate total score and risk level
         total_score = sum(dread_scores.values()) / 5.0
-        risk_level = "High" if total_score > 7 else "Medium" if total_score > 4 else "Low"
+        risk_level = risk_level_from_score(total_score)
 
         # Get mitigation recommendations
-        mitigation = engine.get_mitigation_recommendations(stride_categories, risk_level)
+        mitigation = _stride_engine.get_mitigation_recommendations(stride_categories, risk_level)
 
         # Try to get enhanced mitigations if available
         enhanced_mitigations = None
-        try:
-            from app.services.enhanced_mitigations import EnhancedMitigationEngine
-
-            enhanced_engine = EnhancedMitigationEngine()
-            enhanced_mitigations = enhanced_engine.get_mitigations(
+        if _enhanced_engine:
+            enhanced_mitigations = _enhanced_engine.get_mitigations(
                 stride_categories,
                 risk_level,
                 advanced_analysis.get("primary_pattern"),
                 None,
                 advanced_analysis.get("component_types", []),
             )
-        except ImportError:
-            pass
 
         # Create threat record
         threat = Threat(
@@ -118,6 +129,7 @@ class ThreatAnalyze(Resource):
 
         db.session.add(threat)
         db.session.commit()
+        invalidate_threat_analytics()
 
         response = {
             "threat": threat.to_dict(),
@@ -154,9 +166,26 @@ class ThreatList(Resource):
 
     @jwt_required()
     def get(self):
-        """Get all threats."""
-        threats = Threat.query.order_by(Threat.created_at.desc()).all()
-        return {"threats": [threat.to_dict() for threat in threats]}, 200
+        """Get a page of threats, newest first.
+
+        Pages are keyed on (created_at, id) rather than an offset, so a deep page costs
+        no more than the first. Pass the returned next_cursor to get the following page;
+        it is null on the last page.
+        """
+        limit = min(max(request.args.get("limit", THREAT_PAGE_SIZE, type=int), 1), MAX_THREAT_PAGE_SIZE)
+        stmt = db.select(*THREAT_COLUMNS).order_by(Threat.created_at.desc(), Threat.id.desc())
+
+        cursor = request.args.get("cursor")
+        if cursor:
+            try:
+                stmt = stmt.where(tuple_(Threat.created_at, Threat.id) < decode_cursor(cursor))
+            except ValueError:
+                return {"error": "Invalid cursor"}, 400
+
+        # One extra row tells whether another page follows
+        threats = _rows(stmt.limit(limit + 1))
+        next_cursor = encode_cursor(threats[limit - 1]) if len(threats) > limit else None
+        return {"threats": threats[:limit], "next_cursor": next_cursor}, 200
 
 
 class ThreatDetail(Resource):
@@ -180,6 +209,7 @@ class ThreatDetail(Resource):
             threat.risk_level = data["risk_level"]
 
         db.session.commit()
+        invalidate_threat_analytics()
         return {"threat": threat.to_dict()}, 200
 
     @jwt_required()
@@ -188,6 +218,7 @@ class ThreatDetail(Resource):
         threat = Threat.query.get_or_404(threat_id)
         db.session.delete(threat)
         db.session.commit()
+        invalidate_threat_analytics()
         return {"message": "Threat deleted successfully"}, 200
 
 
@@ -198,8 +229,10 @@ class ThreatVulnerabilities(Resource):
     def get(self, threat_id):
         """Get all vulnerabilities linked to a threat."""
         Threat.query.get_or_404(threat_id)  # Verify threat exists
-        vulnerabilities = ThreatVulnerability.query.filter_by(threat_id=threat_id).all()
-        return {"threat_id": threat_id, "vulnerabilities": [v.to_dict() for v in vulnerabilities]}, 200
+        vulnerabilities = _rows(
+            db.select(*THREAT_VULNERABILITY_COLUMNS).where(ThreatVulnerability.threat_id == threat_id)
+        )
+        return {"threat_id": threat_id, "vulnerabilities": vulnerabilities}, 200
 
 
 class LinkVulnerability(Resource):
@@ -220,27 +253,28 @@ class LinkVulnerability(Resource):
         if not vulnerability_type or not vulnerability_id:
             return {"error": "vulnerability_type and vulnerability_id are required"}, 400
 
-        # Check if link already exists
-        existing = ThreatVulnerability.query.filter_by(
-            threat_id=threat_id, vulnerability_type=vulnerability_type, vulnerability_id=vulnerability_id
-        ).first()
+        # Create link; the unique constraint rejects duplicates without a separate lookup
+        stmt = (
+            pg_insert(ThreatVulnerability)
+            .values(
+                threat_id=threat_id,
+                vulnerability_type=vulnerability_type,
+                vulnerability_id=vulnerability_id,
+                scan_run_id=scan_run_id,
+                severity=severity,
+                vulnerability_data=vulnerability_data,
+                status="linked",
+            )
+            .on_conflict_do_nothing(constraint="uq_threat_vuln")
+            .returning(ThreatVulnerability)
+        )
+        threat_vuln = db.session.scalars(stmt).first()
 
-        if existing:
+        if threat_vuln is None:
             return {"error": "Vulnerability already linked to this threat"}, 400
 
-        # Create link
-        threat_vuln = ThreatVulnerability(
-            threat_id=threat_id,
-            vulnerability_type=vulnerability_type,
-            vulnerability_id=vulnerability_id,
-            scan_run_id=scan_run_id,
-            severity=severity,
-            vulnerability_data=vulnerability_data,
-            status="linked",
-        )
-
-        db.session.add(threat_vuln)
         db.session.commit()
+        invalidate_threat_analytics()
 
         return {"vulnerability": threat_vuln.to_dict()}, 201
 
@@ -251,18 +285,36 @@ class ThreatsWithVulnerabilities(Resource):
     @jwt_required()
     def get(self):
         """Get all threats with linked vulnerabilities."""
-        # Get threats that have at least one vulnerability
-        threats = Threat.query.join(ThreatVulnerability).distinct().all()
-
-        result = []
-        for threat in threats:
-            threat_dict = threat.to_dict()
-            vulnerabilities = ThreatVulnerability.query.filter_by(threat_id=threat.id).all()
-            threat_dict["vulnerabilities"] = [v.to_dict() for v in vulnerabilities]
-            threat_dict["vulnerability_count"] = len(vulnerabilities)
-            result.append(threat_dict)
-
-        return {"threats": result}, 200
+        # Postgres assembles the whole response body: one JSON object per threat with its
+        # links aggregated in, then one array of those, newest threat first
+        threat = _json_object(
+            THREAT_COLUMNS,
+            vulnerabilities=func.jsonb_agg(
+                aggregate_order_by(_json_object(THREAT_VULNERABILITY_COLUMNS), ThreatVulnerability.id)
+            ),
+            vulnerability_count=func.count(ThreatVulnerability.id),
+        )
+        threats = (
+            db.select(threat.label("threat"), Threat.created_at)
+            .join_from(Threat, ThreatVulnerability)
+            .group_by(Threat.id)
+            .subquery()
+        )
+        body = db.session.scalar(
+            db.select(
+                cast(
+                    func.jsonb_build_object(
+                        "threats",
+                        func.coalesce(
+                            func.jsonb_agg(aggregate_order_by(threats.c.threat, threats.c.created_at.desc())),
+                            cast([], JSONB),
+                        ),
+                    ),
+                    Text,
+                )
+            )
+        )
+        return Response(body, mimetype="application/json")
 
 
 class UpdateVulnerabilityStatus(Resource):
@@ -281,6 +333,7 @@ class UpdateVulnerabilityStatus(Resource):
 
         threat_vuln.status = status
         db.session.commit()
+        invalidate_threat_analytics()
 
         return {"vulnerability": threat_vuln.to_dict()}, 200
 
@@ -291,6 +344,5 @@ class ThreatSimilar(Resource):
     @jwt_required()
     def get(self, threat_id):
         """Get threats similar to the specified threat."""
-        similarity_service = ThreatSimilarityService()
-        similar_threats = similarity_service.find_similar_threats(threat_id, limit=5)
+        similar_threats = _similarity_service.find_similar_threats(threat_id, limit=5)
         return {"similar_threats": similar_threats}, 200
@@ -4,10 +4,15 @@ from flask import request
 from flask_restful import Resource
 from app.core.security import jwt_required
 from app import db
-from app.models.threat_template import ThreatTemplate
+from app.models.threat_template import ThreatTemplate, THREAT_TEMPLATE_COLUMNS
 from app.models.threat import Threat
+from app.core.dashboard_cache import invalidate_threat_analytics
 from app.services.stride_dread_engine import STRIDEEngine
-from app.services.dread_scorer import DREADScorer
+from app.services.dread_scorer import DREADScorer, risk_level_from_score
+
+# Stateless analysis services shared by every request
+_stride_engine = STRIDEEngine()
+_dread_scorer = DREADScorer()
 
 
 class ThreatTemplateList(Resource):
@@ -17,13 +22,14 @@ class ThreatTemplateList(Resource):
     def get(self):
         """Get all threat templates."""
         category = request.args.get("category")
-        query = ThreatTemplate.query
+        query = db.select(*THREAT_TEMPLATE_COLUMNS)
 
         if category:
-            query = query.filter_by(category=category)
+            query = query.where(ThreatTemplate.category == category)
 
-        templates = query.order_by(ThreatTemplate.name).all()
-        return {"templates": [t.to_dict() for t in templates]}, 200
+        # Plain rows skip ORM hydration; dicts match ThreatTemplate.to_dict()
+        rows = db.session.execute(query.order_by(ThreatTemplate.name)).mappings()
+        return {"templates": [dict(row) for row in rows]}, 200
 
 
 class ThreatTemplateDetail(Resource):
@@ -51,24 +57,24 @@ class CreateThreatFromTemplate(Resource):
         trust_boundary = data.get("trust_boundary") or template.trust_boundary_template
 
         # Use advanced STRIDE analysis
-        engine = STRIDEEngine()
-        advanced_analysis = engine.analyze_threat_advanced(asset, flow, trust_boundary)
+        advanced_analysis = _stride_engine.analyze_threat_advanced(asset, flow, trust_boundary)
         stride_categories = advanced_analysis["stride_categories"]
 
         # Use template DREAD scores or auto-score
-        dread_scorer = DREADScorer()
         if template.default_dread_scores:
             dread_scores = template.default_dread_scores
         else:
-            dread_suggestions = dread_scorer.suggest_dread_scores(asset, flow, trust_boundary)
+            dread_suggestions = _dread_scorer.suggest_dread_scores(asset, flow, trust_boundary)
             dread_scores = dread_suggestions["suggested_scores"]
 
         # Calculate risk level
         total_score = sum(dread_scores.values()) / 5.0
-        risk_level = "High" if total_score > 7 else "Medium" if total_score > 4 else "Low"
+        risk_level = risk_level_from_score(total_score)
 
         # Get mitigations
-        mitigation = template.default_mitigation or engine.get_mitigation_recommendations(stride_categories, risk_level)
+        mitigation = template.default_mitigation or _stride_engine.get_mitigation_recommendations(
+            stride_categories, risk_level
+        )
 
         # Create threat
         threat = Threat(
@@ -83,6 +89,7 @@ class CreateThreatFromTemplate(Resource):
 
         db.session.add(threat)
         db.session.commit()
+        invalidate_threat_analytics()
 
         return {
             "threat": threat.to_dict(),
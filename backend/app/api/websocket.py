@@ -1,9 +1,24 @@
 """WebSocket handlers for real-time updates."""
 
+import logging
+import threading
 from flask_socketio import emit, join_room, leave_room
 from flask import request
 from app import socketio
 
+# A child of the "app" logger, so records reach the application's handlers outside a request
+logger = logging.getLogger(__name__)
+
+# Clients addressed per emit before yielding to the eventlet hub
+BROADCAST_BATCH_SIZE = 50
+
+# Dashboard updates raised within this many seconds are sent as one batch
+DASHBOARD_COALESCE_WINDOW = 0.1
+
+_dashboard_updates = []
+_dashboard_flush_scheduled = False
+_dashboard_lock = threading.Lock()
+
 
 def register_websocket_handlers(socketio_instance):
     """Register WebSocket event handlers."""
@@ -11,13 +26,13 @@ def register_websocket_handlers(socketio_instance):
     @socketio_instance.on("connect")
     def handle_connect():
         """Handle client connection."""
-        print(f"Client connected: {request.sid}")
+        logger.debug("Client connected: %s", request.sid)
         emit("connected", {"message": "Connected to Sentinel WebSocket"})
 
     @socketio_instance.on("disconnect")
     def handle_disconnect():
         """Handle client disconnection."""
-        print(f"Client disconnected: {request.sid}")
+        logger.debug("Client disconnected: %s", request.sid)
 
     @socketio_instance.on("subscribe_scan")
     def handle_subscribe_scan(data):
@@ -27,7 +42,7 @@ def register_websocket_handlers(socketio_instance):
             room = f"scan_{run_id}"
             join_room(room)
             emit("subscribed", {"run_id": run_id, "room": room})
-            print(f"Client {request.sid} subscribed to scan {run_id}")
+            logger.debug("Client %s subscribed to scan %s", request.sid, run_id)
 
     @socketio_instance.on("unsubscribe_scan")
     def handle_unsubscribe_scan(data):
@@ -37,35 +52,87 @@ def register_websocket_handlers(socketio_instance):
             room = f"scan_{run_id}"
             leave_room(room)
             emit("unsubscribed", {"run_id": run_id})
-            print(f"Client {request.sid} unsubscribed from scan {run_id}")
+            logger.debug("Client %s unsubscribed from scan %s", request.sid, run_id)
 
     @socketio_instance.on("subscribe_dashboard")
     def handle_subscribe_dashboard():
         """Subscribe to dashboard updates."""
         join_room("dashboard")
         emit("subscribed", {"room": "dashboard"})
-        print(f"Client {request.sid} subscribed to dashboard")
+        logger.debug("Client %s subscribed to dashboard", request.sid)
+
+
+def _room_sids(room, namespace="/"):
+    """Return the sids of the clients currently in a room."""
+    return [sid for sid, _ in socketio.server.manager.get_participants(namespace, room)]
+
+
+def _broadcast(event, data, sids, namespace="/"):
+    """Emit an event to clients in batches, yielding to other greenlets between batches.
+
+    Each batch is a single emit addressed to a list of client sids, so the packet is
+    still encoded once per batch rather than once per client.
+    """
+    for start in range(0, len(sids), BROADCAST_BATCH_SIZE):
+        if start:
+            socketio.sleep(0)
+        socketio.emit(event, data, to=sids[start : start + BROADCAST_BATCH_SIZE], namespace=namespace)
 
 
 def emit_scan_update(run_id, update_type, data):
     """Emit scan update to subscribed clients.
 
+    Does nothing when no client is subscribed to the run.
+
     Args:
         run_id: CI/CD run ID
         update_type: Type of update (progress, completed, failed, etc.)
         data: Update data
     """
     room = f"scan_{run_id}"
-    socketio.emit("scan_update", {"run_id": run_id, "type": update_type, "data": data}, room=room)
-    print(f"Emitted {update_type} update for scan {run_id} to room {room}")
+    sids = _room_sids(room)
+    if not sids:
+        return
+    _broadcast("scan_update", {"run_id": run_id, "type": update_type, "data": data}, sids)
+    logger.debug("Emitted %s update for scan %s to room %s", update_type, run_id, room)
 
 
 def emit_dashboard_update(update_type, data):
-    """Emit dashboard update to all subscribed clients.
+    """Queue a dashboard update for subscribed clients.
+
+    Updates are coalesced: the first one starts a background task that waits
+    DASHBOARD_COALESCE_WINDOW seconds, then sends everything queued in that time
+    as a single dashboard_update_batch event. Does nothing when no client is
+    subscribed to the dashboard.
 
     Args:
         update_type: Type of update (new_run, scan_completed, etc.)
         data: Update data
     """
-    socketio.emit("dashboard_update", {"type": update_type, "data": data}, room="dashboard")
-    print(f"Emitted {update_type} update to dashboard")
+    global _dashboard_flush_scheduled
+    if not _room_sids("dashboard"):
+        return
+
+    with _dashboard_lock:
+        _dashboard_updates.append({"type": update_type, "data": data})
+        if _dashboard_flush_scheduled:
+            return
+        _dashboard_flush_scheduled = True
+    socketio.start_background_task(_flush_dashboard_updates)
+
+
+def _flush_dashboard_updates():
+    """Send the dashboard updates queued during one coalescing window."""
+    global _dashboard_flush_scheduled
+    socketio.sleep(DASHBOARD_COALESCE_WINDOW)
+
+    with _dashboard_lock:
+        updates = _dashboard_updates[:]
+        _dashboard_updates.clear()
+        _dashboard_flush_scheduled = False
+
+    sids = _room_sids("dashboard")
+    if not sids:
+        return
+    _broadcast("dashboard_update_batch", {"updates": updates}, sids)
+    logger.debug("Emitted %d updates to dashboard", len(updates))
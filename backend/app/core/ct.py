@@ -0,0 +1,14 @@
+"""Constant-time comparison for secrets.
+
+Token digests, signatures and any other secret-derived values must be compared with
+ct_eq(), never with ==, so response timing does not reveal how many leading bytes
+matched. Equality inside a database index lookup is fine; this is for comparisons
+made in Python.
+"""
+
+import hmac
+
+
+def ct_eq(a: bytes, b: bytes) -> bool:
+    """Return whether two byte strings are equal, in time independent of their contents."""
+    return hmac.compare_digest(a, b)
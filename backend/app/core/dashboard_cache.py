@@ -0,0 +1,26 @@
+"""Cache keys and invalidation for the aggregate dashboard endpoints."""
+
+from app.extensions import cache
+
+CICD_DASHBOARD_CACHE_KEY = "cicd_dash"
+COMPLIANCE_DASHBOARD_CACHE_KEY = "compliance_dash"
+THREAT_ANALYTICS_CACHE_KEY = "threat_analytics"
+
+CICD_DASHBOARD_CACHE_TIMEOUT = 30
+COMPLIANCE_DASHBOARD_CACHE_TIMEOUT = 60
+THREAT_ANALYTICS_CACHE_TIMEOUT = 60
+
+
+def invalidate_cicd_dashboard():
+    """Drop the cached CI/CD dashboard after a run is created or updated."""
+    cache.delete(CICD_DASHBOARD_CACHE_KEY)
+
+
+def invalidate_compliance_dashboard():
+    """Drop the cached compliance dashboard after requirements or controls change."""
+    cache.delete(COMPLIANCE_DASHBOARD_CACHE_KEY)
+
+
+def invalidate_threat_analytics():
+    """Drop the cached threat analytics after threats or their vulnerability links change."""
+    cache.delete(THREAT_ANALYTICS_CACHE_KEY)
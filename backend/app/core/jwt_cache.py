@@ -0,0 +1,64 @@
+"""Short-lived cache of verified JWT payloads."""
+
+import hashlib
+import threading
+import time
+from cachetools import TTLCache
+from flask_jwt_extended import JWTManager
+
+# Upper bound on how long a verified payload may be served from cache
+JWT_CACHE_TTL_SECONDS = 30
+JWT_CACHE_MAX_SIZE = 10000
+
+
+class CachedJWTManager(JWTManager):
+    """JWTManager that skips signature verification for recently verified tokens.
+
+    Entries are keyed by the SHA-256 digest of the raw token (the token itself is
+    never stored) and are only ever inserted after a successful verification, so
+    failures are always re-checked. Every hit re-validates ``exp`` before the
+    payload is returned.
+    """
+
+    def __init__(self, app=None, add_context_processor: bool = False):
+        self._payload_cache = TTLCache(maxsize=JWT_CACHE_MAX_SIZE, ttl=JWT_CACHE_TTL_SECONDS)
+        self._payload_cache_lock = threading.Lock()
+        super().__init__(app, add_context_processor)
+
+    def init_app(self, app, add_context_processor: bool = False):
+        """Register the app and drop payloads verified under a previous configuration."""
+        self.clear_cache()
+        super().init_app(app, add_context_processor)
+
+    def clear_cache(self):
+        """Remove all cached payloads."""
+        with self._payload_cache_lock:
+            self._payload_cache.clear()
+
+    def _decode_jwt_from_config(self, encoded_token: str, csrf_value=None, allow_expired: bool = False) -> dict:
+        # CSRF-bound and expired-allowed decodes have extra inputs; always verify those
+        if csrf_value is not None or allow_expired:
+            return super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+
+        key = hashlib.sha256(encoded_token.encode("utf-8")).digest()
+        now = time.time()
+
+        with self._payload_cache_lock:
+            cached = self._payload_cache.get(key)
+
+        if cached is not None:
+            payload, expires_at = cached
+            if expires_at > now:
+                return dict(payload)
+            with self._payload_cache_lock:
+                self._payload_cache.pop(key, None)
+
+        payload = super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+
+        # Tokens without an expiry are re-verified once the cache TTL lapses
+        expires_at = min(payload.get("exp", now + JWT_CACHE_TTL_SECONDS), now + JWT_CACHE_TTL_SECONDS)
+        if expires_at > now:
+            with self._payload_cache_lock:
+                self._payload_cache[key] = (payload, expires_at)
+
+        return dict(payload)
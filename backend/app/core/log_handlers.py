@@ -0,0 +1,39 @@
+"""Logging handlers."""
+
+import os
+from logging.handlers import RotatingFileHandler
+
+
+class FastRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler that tracks the file size in memory.
+
+    The stock handler seeks/stats the log file on every record to decide whether to
+    roll over. This one reads the size with a single ``os.fstat`` when the file is
+    opened and then adds the encoded length of each record it writes.
+    """
+
+    def __init__(self, filename, mode="a", maxBytes=0, backupCount=0, encoding="utf-8", delay=False, errors=None):
+        self._bytes_written = 0
+        super().__init__(filename, mode, maxBytes, backupCount, encoding, delay, errors)
+
+    def _open(self):
+        stream = super()._open()
+        self._bytes_written = os.fstat(stream.fileno()).st_size
+        return stream
+
+    def emit(self, record):
+        """Write a record, rolling over first if it would exceed maxBytes."""
+        try:
+            msg = self.format(record) + self.terminator
+            size = len(msg.encode(self.encoding or "utf-8", self.errors or "strict"))
+            if self.stream is None:
+                self.stream = self._open()
+            if self.maxBytes > 0 and self._bytes_written + size >= self.maxBytes:
+                self.doRollover()
+            self.stream.write(msg)
+            self.flush()
+            self._bytes_written += size
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
@@ -0,0 +1,14 @@
+"""Keyset pagination cursors for listings ordered by (created_at, id), newest first."""
+
+from datetime import datetime
+
+
+def encode_cursor(item):
+    """Build the cursor that resumes a listing after an item with created_at and id keys."""
+    return f"{item['created_at'].isoformat()},{item['id']}"
+
+
+def decode_cursor(cursor):
+    """Parse a cursor into its (created_at, id) key; raises ValueError if malformed."""
+    created_at, item_id = cursor.rsplit(",", 1)
+    return datetime.fromisoformat(created_at), int(item_id)
@@ -1,15 +1,55 @@
 """Security utilities for authentication and authorization."""
 
 import bcrypt
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
 from jwt.exceptions import ExpiredSignatureError, InvalidTokenError
+import html
 import json
+import os
+import secrets
+import threading
+from collections import namedtuple
 from datetime import datetime
 from functools import wraps
+from cachetools import TTLCache
 from flask import request, current_app
+from sqlalchemy import event, inspect, text, update
+from sqlalchemy.orm import Session
 from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
 from flask_jwt_extended.exceptions import NoAuthorizationError, JWTDecodeError
+from app import db
 from app.models.user import User
 
+# New passwords are hashed with argon2id; bcrypt hashes are still verified and
+# upgraded on the next successful login. The cost can be raised per deployment to
+# match its hardware, but never below these floors
+ARGON2_MIN_TIME_COST = 2
+ARGON2_MIN_MEMORY_COST = 64 * 1024  # KiB
+_password_hasher = PasswordHasher(
+    time_cost=max(int(os.environ.get("ARGON2_TIME_COST", ARGON2_MIN_TIME_COST)), ARGON2_MIN_TIME_COST),
+    memory_cost=max(int(os.environ.get("ARGON2_MEMORY_COST", ARGON2_MIN_MEMORY_COST)), ARGON2_MIN_MEMORY_COST),
+    parallelism=1,
+)
+ARGON2_HASH_PREFIX = "$argon2id$"
+
+# bcrypt modular-crypt hashes are always 60 characters with one of these prefixes
+BCRYPT_HASH_LENGTH = 60
+BCRYPT_HASH_PREFIXES = ("$2b$", "$2a$", "$2y$")
+
+# Checked against when the user does not exist so failed logins take the same time;
+# hashed at import so it always carries the configured cost
+DUMMY_PASSWORD_HASH = _password_hasher.hash(secrets.token_urlsafe(16))
+
+# Characters stripped by sanitize_input()
+_DANGEROUS_CHARS_TABLE = str.maketrans("", "", "<>\"'&\x00")
+
+# Authorization facts for a user, cached briefly to avoid a SELECT per request
+UserAuth = namedtuple("UserAuth", ["role", "is_active"])
+
+_user_auth_cache = TTLCache(maxsize=2000, ttl=30)
+_user_auth_lock = threading.Lock()
+
 
 def jwt_required(f=None, **kwargs):
     """Custom JWT required decorator that returns proper 401 responses for Flask-RESTful.
@@ -21,21 +61,23 @@ def jwt_required(f=None, **kwargs):
     def decorator(func):
         @wraps(func)
         def decorated_function(*args, **func_kwargs):
+            # Dispatch on the exception type; only NoAuthorizationError, which covers several
+            # cases, needs its message inspected
             try:
                 verify_jwt_in_request()
-                return func(*args, **func_kwargs)
-            except (NoAuthorizationError, JWTDecodeError, ExpiredSignatureError, InvalidTokenError) as e:
+            except ExpiredSignatureError:
+                return {"error": "Token has expired"}, 401
+            except (JWTDecodeError, InvalidTokenError):
+                return {"error": "Invalid token"}, 401
+            except NoAuthorizationError as e:
                 error_message = str(e)
-                auth_header_msg = "Missing Authorization Header" in error_message
-                auth_header_missing = "Authorization header is missing" in error_message
-                if auth_header_msg or auth_header_missing:
+                if error_message.startswith("Missing Authorization Header"):
                     return {"error": "Authorization header is missing"}, 401
-                elif "expired" in error_message.lower() or isinstance(e, ExpiredSignatureError):
-                    return {"error": "Token has expired"}, 401
-                elif "invalid" in error_message.lower() or isinstance(e, (JWTDecodeError, InvalidTokenError)):
+                elif "invalid" in error_message.lower():
                     return {"error": "Invalid token"}, 401
                 else:
                     return {"error": "Authentication required"}, 401
+            return func(*args, **func_kwargs)
 
         return decorated_function
 
@@ -47,28 +89,124 @@ def jwt_required(f=None, **kwargs):
         return decorator(f)
 
 
+def get_user_auth(user_id):
+    """Return the cached (role, is_active) of a user, or None if the user does not exist."""
+    with _user_auth_lock:
+        auth = _user_auth_cache.get(user_id)
+    if auth is not None:
+        return auth
+
+    row = db.session.execute(db.select(User.role, User.is_active).where(User.id == user_id)).first()
+    if row is None:
+        return None
+
+    auth = UserAuth(row.role, row.is_active)
+    with _user_auth_lock:
+        _user_auth_cache[user_id] = auth
+    return auth
+
+
+def is_admin(user_id) -> bool:
+    """Return True if the user exists, is active and has the Admin role."""
+    auth = get_user_auth(user_id)
+    return auth is not None and auth.is_active and auth.role == "Admin"
+
+
+def invalidate_user_auth(user_id):
+    """Drop a user's cached authorization facts after their role or status changes."""
+    with _user_auth_lock:
+        _user_auth_cache.pop(user_id, None)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_user_auth_changes(session, flush_context):
+    """Remember users whose role or is_active was just flushed, or who were deleted."""
+    changed = {user.id for user in session.deleted if isinstance(user, User)}
+    for user in session.dirty:
+        if isinstance(user, User):
+            attrs = inspect(user).attrs
+            if attrs.role.history.has_changes() or attrs.is_active.history.has_changes():
+                changed.add(user.id)
+    if changed:
+        session.info.setdefault("user_auth_changed", set()).update(changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_user_auth_changes(session):
+    """Drop the cached facts of users changed in the committed transaction.
+
+    Done after commit rather than on assignment, so a concurrent request cannot re-cache
+    the old values before the change is visible.
+    """
+    for user_id in session.info.pop("user_auth_changed", ()):
+        invalidate_user_auth(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_user_auth_changes(session):
+    """Forget changes that were rolled back."""
+    session.info.pop("user_auth_changed", None)
+
+
+def clear_user_auth_cache():
+    """Drop all cached authorization facts."""
+    with _user_auth_lock:
+        _user_auth_cache.clear()
+
+
+def record_login(user_id) -> datetime:
+    """Stamp a user's last_login with a single UPDATE that does not wait on the WAL flush.
+
+    Losing the last few last_login stamps on a crash is acceptable, so on Postgres the
+    transaction commits with synchronous_commit off and the request never blocks on fsync.
+    Anything already pending in the session is committed durably first, so that setting
+    only ever covers the last_login write.
+    """
+    db.session.commit()
+    now = datetime.utcnow()
+    if db.session.get_bind().dialect.name == "postgresql":
+        db.session.execute(text("SET LOCAL synchronous_commit TO OFF"))
+    db.session.execute(update(User).where(User.id == user_id).values(last_login=now))
+    db.session.commit()
+    return now
+
+
 def hash_password(password: str) -> str:
-    """Hash a password using bcrypt."""
-    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    """Hash a password using argon2id."""
+    return _password_hasher.hash(password)
 
 
 def verify_password(password: str, password_hash: str) -> bool:
-    """Verify a password against a hash."""
+    """Verify a password against an argon2id or legacy bcrypt hash."""
+    if not password_hash:
+        return False
+
+    if password_hash.startswith(ARGON2_HASH_PREFIX):
+        try:
+            return _password_hasher.verify(password_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False
+
+    # Reject corrupt or unknown hashes before paying for the KDF
+    if len(password_hash) != BCRYPT_HASH_LENGTH or not password_hash.startswith(BCRYPT_HASH_PREFIXES):
+        return False
     return bcrypt.checkpw(password.encode("utf-8"), password_hash.encode("utf-8"))
 
 
+def password_needs_rehash(password_hash: str) -> bool:
+    """Return True if a verified hash is bcrypt or uses outdated argon2 parameters."""
+    if not password_hash.startswith(ARGON2_HASH_PREFIX):
+        return True
+    return _password_hasher.check_needs_rehash(password_hash)
+
+
 def sanitize_input(input_str: str) -> str:
     """Sanitize user input to prevent XSS."""
     if not isinstance(input_str, str):
         return str(input_str)
 
-    # Remove potentially dangerous characters
-    dangerous_chars = ["<", ">", '"', "'", "&", "\x00"]
-    sanitized = input_str
-    for char in dangerous_chars:
-        sanitized = sanitized.replace(char, "")
-
-    return sanitized.strip()
+    # Remove potentially dangerous characters in a single pass
+    return input_str.translate(_DANGEROUS_CHARS_TABLE).strip()
 
 
 def encode_output(text: str) -> str:
@@ -76,19 +214,8 @@ def encode_output(text: str) -> str:
     if not isinstance(text, str):
         text = str(text)
 
-    # HTML entity encoding
-    replacements = {
-        "<": "&lt;",
-        ">": "&gt;",
-        '"': "&quot;",
-        "'": "&#x27;",
-        "&": "&amp;",
-    }
-
-    for char, entity in replacements.items():
-        text = text.replace(char, entity)
-
-    return text
+    # HTML entity encoding; "&" is escaped first so entities are not double-encoded
+    return html.escape(text, quote=True)
 
 
 def role_required(required_role: str):
@@ -99,7 +226,7 @@ def role_required(required_role: str):
         def decorated_function(*args, **kwargs):
             verify_jwt_in_request()
             user_id = get_jwt_identity()
-            user = User.query.get(user_id)
+            user = get_user_auth(user_id)
 
             if not user:
                 return {"error": "User not found"}, 404
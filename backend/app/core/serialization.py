@@ -0,0 +1,50 @@
+"""JSON serialization backed by orjson."""
+
+import decimal
+import orjson
+from flask import make_response, request
+from flask.json.provider import JSONProvider
+from werkzeug.exceptions import BadRequest
+
+
+def _default(obj):
+    """Serialize types orjson does not handle natively."""
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj) -> bytes:
+    """Serialize an object to JSON bytes."""
+    return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class ORJSONProvider(JSONProvider):
+    """Flask JSON provider using orjson for jsonify and request parsing."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        return dumps(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+def output_json(data, code, headers=None):
+    """Flask-RESTful representation that encodes resource return values with orjson."""
+    resp = make_response(dumps(data) + b"\n", code)
+    resp.headers.extend(headers or {})
+    return resp
+
+
+def load_json_body():
+    """Parse the request body as JSON straight from the raw bytes.
+
+    Returns an empty dict for an empty body and raises BadRequest for malformed JSON.
+    """
+    raw = request.get_data(cache=False)
+    if not raw:
+        return {}
+    try:
+        return orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        raise BadRequest("Failed to decode JSON object")
@@ -0,0 +1,50 @@
+"""Short-lived cache of verified API tokens."""
+
+import threading
+from datetime import datetime
+from cachetools import TTLCache
+from app.models.api_token import APIToken, token_digest
+
+# Upper bound on how long a revoked token can keep working in another worker
+TOKEN_CACHE_TTL_SECONDS = 60
+TOKEN_CACHE_MAX_SIZE = 4096
+# Unknown tokens are remembered briefly so guessing floods skip the database
+REJECTED_TOKEN_TTL_SECONDS = 5
+
+_verified_tokens = TTLCache(maxsize=TOKEN_CACHE_MAX_SIZE, ttl=TOKEN_CACHE_TTL_SECONDS)
+_rejected_tokens = TTLCache(maxsize=TOKEN_CACHE_MAX_SIZE, ttl=REJECTED_TOKEN_TTL_SECONDS)
+_token_cache_lock = threading.RLock()
+
+
+def get_verified_token(token: str):
+    """Return the VerifiedToken for a raw API token, or None if it is invalid or expired.
+
+    Entries are keyed by the SHA-256 digest of the token, so the token itself is never
+    stored. Expiry is re-checked on every hit.
+    """
+    digest = token_digest(token)
+    with _token_cache_lock:
+        verified = _verified_tokens.get(digest)
+        rejected = digest in _rejected_tokens
+
+    if verified is not None:
+        if verified.expires_at and verified.expires_at < datetime.utcnow():
+            return None
+        return verified
+    if rejected:
+        return None
+
+    verified = APIToken.verify_token(token)
+    with _token_cache_lock:
+        if verified is None:
+            _rejected_tokens[digest] = True
+        else:
+            _verified_tokens[digest] = verified
+    return verified
+
+
+def clear_token_cache():
+    """Drop all cached verifications, e.g. after a token is revoked."""
+    with _token_cache_lock:
+        _verified_tokens.clear()
+        _rejected_tokens.clear()
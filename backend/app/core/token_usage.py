@@ -0,0 +1,65 @@
+"""Buffered last_used_at stamps for API tokens."""
+
+import logging
+import threading
+import time
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import DateTime, Integer, column, update, values
+from app import db, socketio
+from app.models.api_token import APIToken
+
+logger = logging.getLogger(__name__)
+
+# Stamps are written at most this often; losing a few on a crash is acceptable
+TOKEN_USAGE_FLUSH_INTERVAL_SECONDS = 5
+
+_pending_usage = {}  # token id -> latest use, as a time.time() timestamp
+_flush_scheduled = False
+_usage_lock = threading.Lock()
+
+
+def record_token_use(token_id):
+    """Note that a token was just used, without touching the database.
+
+    The first use in an interval starts a background task that writes every stamp
+    buffered during it. Must be called inside an application context.
+    """
+    global _flush_scheduled
+    with _usage_lock:
+        _pending_usage[token_id] = time.time()
+        if _flush_scheduled:
+            return
+        _flush_scheduled = True
+    socketio.start_background_task(_flush_token_usage_later, current_app._get_current_object())
+
+
+def _flush_token_usage_later(app):
+    """Wait one flush interval, then write the stamps buffered during it."""
+    global _flush_scheduled
+    socketio.sleep(TOKEN_USAGE_FLUSH_INTERVAL_SECONDS)
+    with _usage_lock:
+        _flush_scheduled = False
+    with app.app_context():
+        try:
+            flush_token_usage()
+        except Exception:
+            logger.exception("Failed to write API token usage stamps")
+
+
+def flush_token_usage():
+    """Write all buffered stamps in one UPDATE ... FROM (VALUES ...).
+
+    Runs on its own connection so it never commits the caller's session.
+    """
+    with _usage_lock:
+        if not _pending_usage:
+            return
+        # Stamps become datetimes once per flush rather than once per request
+        rows = [(token_id, datetime.utcfromtimestamp(ts)) for token_id, ts in _pending_usage.items()]
+        _pending_usage.clear()
+
+    usage = values(column("id", Integer), column("used_at", DateTime), name="usage").data(rows)
+    stmt = update(APIToken).where(APIToken.id == usage.c.id).values(last_used_at=usage.c.used_at)
+    with db.engine.begin() as conn:
+        conn.execute(stmt)
@@ -1,8 +1,10 @@
 """Webhook authentication middleware."""
 
 from functools import wraps
-from flask import request, jsonify
-from app.models.api_token import APIToken
+from flask import request
+from app.models.api_token import TOKEN_LENGTH, TOKEN_MARKER, Scope
+from app.core.token_cache import get_verified_token
+from app.core.token_usage import record_token_use
 
 
 def webhook_auth_required(f):
@@ -10,30 +12,34 @@ def webhook_auth_required(f):
 
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        # Get token from header
+        # Get token from header: "Authorization: Bearer <token>", else X-API-Token, else a bare Authorization
         auth_header = request.headers.get("Authorization", "")
-        if auth_header.startswith("Bearer "):
-            token = auth_header.replace("Bearer ", "")
+        scheme, sep, credentials = auth_header.partition(" ")
+        if scheme == "Bearer" and sep:
+            token = credentials
         else:
-            token = request.headers.get("X-API-Token") or request.headers.get("Authorization", "")
+            token = request.headers.get("X-API-Token") or auth_header
 
         if not token:
-            return jsonify({"error": "API token required"}), 401
+            return {"error": "API token required"}, 401
+
+        # Garbage never costs a hash or a query
+        if len(token) != TOKEN_LENGTH or not token.startswith(TOKEN_MARKER):
+            return {"error": "Invalid token format"}, 401
 
         # Verify token
-        api_token = APIToken.verify_token(token)
+        api_token = get_verified_token(token)
 
         if not api_token:
-            return jsonify({"error": "Invalid or expired API token"}), 401
+            return {"error": "Invalid or expired API token"}, 401
 
         # Check scopes
-        required_scope = "webhook:write"
-        scopes = api_token.scopes.split(",") if api_token.scopes else []
-        if required_scope not in scopes and "webhook:*" not in scopes:
-            return jsonify({"error": "Insufficient permissions"}), 403
+        if not api_token.scopes_mask & Scope.WEBHOOK_WRITE:
+            return {"error": "Insufficient permissions"}, 403
 
         # Attach token info to request
         request.api_token = api_token
+        record_token_use(api_token.id)
 
         return f(*args, **kwargs)
 
@@ -0,0 +1,20 @@
+"""Flask extension instances, kept apart from the factory to avoid circular imports."""
+
+from flask_caching import Cache
+from flask_sqlalchemy import SQLAlchemy
+from flask_migrate import Migrate
+from flask_limiter import Limiter
+from flask_limiter.util import get_remote_address
+from flask_socketio import SocketIO
+from app.core.jwt_cache import CachedJWTManager
+
+# Fix eventlet DNS resolution - patch after eventlet imports
+# We'll patch the DNS resolver in run.py after socketio is initialized
+
+# Initialize extensions
+db = SQLAlchemy()
+migrate = Migrate()
+jwt = CachedJWTManager()
+limiter = Limiter(key_func=get_remote_address)
+socketio = SocketIO(cors_allowed_origins="*", async_mode="eventlet")
+cache = Cache()
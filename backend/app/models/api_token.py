@@ -1,10 +1,56 @@
 """API Token model for webhook authentication."""
 
+from collections import namedtuple
 from datetime import datetime
+from enum import IntFlag
+from sqlalchemy import bindparam, true
+from sqlalchemy.orm import validates
 from app import db
+from app.core.ct import ct_eq
 import secrets
 import hashlib
 
+TOKEN_MARKER = "sent_"
+# secrets.token_urlsafe(32) is always 43 characters, so every token has this length
+TOKEN_LENGTH = len(TOKEN_MARKER) + 43
+# Stored in clear for lookup and display: "sent_" + 7 chars
+TOKEN_PREFIX_LENGTH = 12
+
+
+class Scope(IntFlag):
+    """Token permissions, packed into APIToken.scopes_mask."""
+
+    WEBHOOK_WRITE = 1 << 0
+    WEBHOOK_READ = 1 << 1
+    WEBHOOK_ALL = WEBHOOK_WRITE | WEBHOOK_READ
+
+
+# The scope names tokens are created with; the one place new scopes are added
+SCOPE_FLAGS = {
+    "webhook:write": Scope.WEBHOOK_WRITE,
+    "webhook:read": Scope.WEBHOOK_READ,
+    "webhook:*": Scope.WEBHOOK_ALL,
+}
+
+
+def scopes_to_mask(scopes) -> int:
+    """Pack scope names, as a comma-separated string or a list, into a Scope bitmask."""
+    if isinstance(scopes, str):
+        scopes = scopes.split(",")
+    mask = 0
+    for scope in scopes or ():
+        mask |= SCOPE_FLAGS.get(scope.strip(), 0)
+    return mask
+
+
+# What verify_token() returns: only what webhook authentication needs, not an ORM instance
+VerifiedToken = namedtuple("VerifiedToken", ["id", "scopes_mask", "expires_at"])
+
+
+def token_digest(token: str) -> bytes:
+    """Return the raw SHA-256 digest stored for a token."""
+    return hashlib.sha256(token.encode()).digest()
+
 
 class APIToken(db.Model):
     """API Token model for external integrations."""
@@ -13,18 +59,29 @@ class APIToken(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)  # e.g., "GitHub Actions CI/CD"
-    token_hash = db.Column(db.String(255), unique=True, nullable=False, index=True)
+    token_hash = db.Column(db.LargeBinary(32), unique=True, nullable=False)  # Raw SHA-256 digest
     token_prefix = db.Column(db.String(15), nullable=False)  # "sent_" + up to 10 chars
     created_by = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
     expires_at = db.Column(db.DateTime, nullable=True)  # None = never expires
     last_used_at = db.Column(db.DateTime, nullable=True)
     is_active = db.Column(db.Boolean, default=True, nullable=False)
     scopes = db.Column(db.String(255), nullable=False)  # Comma-separated: webhook:write,webhook:read
+    scopes_mask = db.Column(db.BigInteger, default=0, nullable=False)  # Scope flags, kept in sync with scopes
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
 
     # Relationships
     creator = db.relationship("User", backref="api_tokens")
 
+    __table_args__ = (
+        # verify_token() probes active tokens by prefix; revoked tokens stay out of the index
+        db.Index("ix_api_tokens_active_prefix", "token_prefix", postgresql_where=db.text("is_active")),
+    )
+
+    @validates("scopes")
+    def _sync_scopes_mask(self, key, scopes):
+        self.scopes_mask = scopes_to_mask(scopes)
+        return scopes
+
     @staticmethod
     def generate_token() -> tuple:
         """Generate a new API token.
@@ -33,48 +90,66 @@ class APIToken(db.Model):
             tuple: (full_token, token_hash, token_prefix)
         """
         # Generate 32-byte random token with prefix
-        token = f"sent_{secrets.token_urlsafe(32)}"
-        token_hash = hashlib.sha256(token.encode()).hexdigest()
-        token_prefix = token[:12]  # "sent_" + 7 chars
+        token = f"{TOKEN_MARKER}{secrets.token_urlsafe(32)}"
+        token_hash = token_digest(token)
+        token_prefix = token[:TOKEN_PREFIX_LENGTH]
         return token, token_hash, token_prefix
 
     @staticmethod
     def verify_token(token: str):
-        """Verify a token and return the token object.
+        """Verify a token.
 
         Args:
             token: The API token to verify
 
         Returns:
-            APIToken object if valid, None otherwise
+            VerifiedToken if valid, None otherwise. Callers record the use with
+            app.core.token_usage.record_token_use().
         """
-        token_hash = hashlib.sha256(token.encode()).hexdigest()
-        api_token = APIToken.query.filter_by(token_hash=token_hash, is_active=True).first()
+        # Probe the prefix index, then compare the digest in constant time. Plain rows
+        # skip ORM instance construction and identity-map bookkeeping.
+        token_hash = token_digest(token)
+        candidates = db.session.execute(_VERIFY_STMT, {"prefix": token[:TOKEN_PREFIX_LENGTH]}).all()
+        row = next((c for c in candidates if ct_eq(c.token_hash, token_hash)), None)
 
-        if not api_token:
+        if not row:
             return None
 
         # Check expiration
-        if api_token.expires_at and api_token.expires_at < datetime.utcnow():
+        if row.expires_at and row.expires_at < datetime.utcnow():
             return None
 
-        # Update last used
-        api_token.last_used_at = datetime.utcnow()
-        db.session.commit()
-
-        return api_token
+        return VerifiedToken(row.id, row.scopes_mask, row.expires_at)
 
     def to_dict(self, include_token=False):
         """Convert to dictionary."""
-        return {
-            "id": self.id,
-            "name": self.name,
-            "token_prefix": self.token_prefix,
-            "created_by": self.created_by,
-            "expires_at": self.expires_at.isoformat() if self.expires_at else None,
-            "last_used_at": self.last_used_at.isoformat() if self.last_used_at else None,
-            "is_active": self.is_active,
-            "scopes": self.scopes.split(",") if self.scopes else [],
-            "created_at": self.created_at.isoformat(),
-            "token": f"{self.token_prefix}..." if not include_token else None,
-        }
+        return token_to_dict(self, include_token)
+
+
+# Stored fields behind to_dict(); listings select API_TOKEN_COLUMNS and skip ORM hydration
+TOKEN_DICT_FIELDS = (
+    "id",
+    "name",
+    "token_prefix",
+    "created_by",
+    "expires_at",
+    "last_used_at",
+    "is_active",
+    "scopes",
+    "created_at",
+)
+API_TOKEN_COLUMNS = tuple(getattr(APIToken, field) for field in TOKEN_DICT_FIELDS)
+
+
+def token_to_dict(token, include_token=False):
+    """Build the API shape of an APIToken instance or a row of API_TOKEN_COLUMNS."""
+    data = {field: getattr(token, field) for field in TOKEN_DICT_FIELDS}
+    data["scopes"] = data["scopes"].split(",") if data["scopes"] else []
+    data["token"] = f"{token.token_prefix}..." if not include_token else None
+    return data
+
+
+# Built once so every verification reuses the same statement and its cached compilation
+_VERIFY_STMT = db.select(APIToken.id, APIToken.token_hash, APIToken.scopes_mask, APIToken.expires_at).where(
+    APIToken.token_prefix == bindparam("prefix"), APIToken.is_active == true()
+)
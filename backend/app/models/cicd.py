@@ -11,7 +11,7 @@ class CICDRun(db.Model):
     __tablename__ = "ci_cd_runs"
 
     id = db.Column(db.Integer, primary_key=True)
-    commit_hash = db.Column(db.String(40), nullable=False, index=True)
+    commit_hash = db.Column(db.String(40), nullable=False)
     branch = db.Column(db.String(100), nullable=False)
     status = db.Column(db.String(20), nullable=False, default="Running")  # Running, Success, Failed, Blocked
     sast_results = db.Column(JSONB, nullable=True)  # SonarQube results
@@ -19,14 +19,58 @@ class CICDRun(db.Model):
     trivy_results = db.Column(JSONB, nullable=True)  # Trivy scan results
     lint_results = db.Column(JSONB, nullable=True)  # Linting results
     test_results = db.Column(JSONB, nullable=True)  # Test results
+    # Per-scan counts so run totals never need the JSON blobs re-read
+    sast_critical = db.Column(db.Integer, default=0, nullable=False)
+    sast_total = db.Column(db.Integer, default=0, nullable=False)
+    trivy_critical = db.Column(db.Integer, default=0, nullable=False)
+    trivy_total = db.Column(db.Integer, default=0, nullable=False)
+    dast_critical = db.Column(db.Integer, default=0, nullable=False)
+    dast_total = db.Column(db.Integer, default=0, nullable=False)
     critical_vulnerabilities = db.Column(db.Integer, default=0, nullable=False)
     total_vulnerabilities = db.Column(db.Integer, default=0, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     completed_at = db.Column(db.DateTime, nullable=True)
 
+    __table_args__ = (
+        db.Index("ix_ci_cd_runs_status_created_at", "status", created_at.desc()),
+        # Run list filtered by branch, optionally narrowed by status
+        db.Index("ix_ci_cd_runs_branch_status_created_at", "branch", "status", created_at.desc()),
+        # Webhook and trigger lookups of the latest run for a commit
+        db.Index("ix_ci_cd_runs_commit_hash_created_at", "commit_hash", created_at.desc()),
+        # Latest*Scan endpoints: newest run that has results for a given scanner
+        db.Index("ix_ci_cd_runs_sast_latest", created_at.desc(), postgresql_where=sast_results.isnot(None)),
+        db.Index("ix_ci_cd_runs_dast_latest", created_at.desc(), postgresql_where=dast_results.isnot(None)),
+        db.Index("ix_ci_cd_runs_trivy_latest", created_at.desc(), postgresql_where=trivy_results.isnot(None)),
+    )
+
     def __repr__(self):
         return f"<CICDRun {self.commit_hash[:8]}>"
 
+    def set_scan_results(self, scan, results):
+        """Store results for a "sast", "trivy" or "dast" scan and refresh the run totals."""
+        setattr(self, f"{scan}_results", results)
+        setattr(self, f"{scan}_critical", (results or {}).get("critical", 0))
+        setattr(self, f"{scan}_total", (results or {}).get("total", 0))
+
+        # Column defaults only apply on flush, so unset counts on a new run are None
+        self.critical_vulnerabilities = (
+            (self.sast_critical or 0) + (self.trivy_critical or 0) + (self.dast_critical or 0)
+        )
+        self.total_vulnerabilities = (self.sast_total or 0) + (self.trivy_total or 0) + (self.dast_total or 0)
+
+    def to_summary_dict(self):
+        """Convert a CI/CD run to a dictionary without the scan result documents."""
+        return {
+            "id": self.id,
+            "commit_hash": self.commit_hash,
+            "branch": self.branch,
+            "status": self.status,
+            "critical_vulnerabilities": self.critical_vulnerabilities,
+            "total_vulnerabilities": self.total_vulnerabilities,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+        }
+
     def to_dict(self):
         """Convert CI/CD run to dictionary."""
         return {
@@ -41,6 +85,28 @@ class CICDRun(db.Model):
             "test_results": self.test_results,
             "critical_vulnerabilities": self.critical_vulnerabilities,
             "total_vulnerabilities": self.total_vulnerabilities,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+            "created_at": self.created_at,
+            "completed_at": self.completed_at,
         }
+
+
+# Columns read by to_summary_dict(); list views load only these and skip the JSONB results
+CICD_RUN_SUMMARY_COLUMNS = (
+    CICDRun.id,
+    CICDRun.commit_hash,
+    CICDRun.branch,
+    CICDRun.status,
+    CICDRun.critical_vulnerabilities,
+    CICDRun.total_vulnerabilities,
+    CICDRun.created_at,
+    CICDRun.completed_at,
+)
+
+# The JSONB scan documents that to_dict() adds to the summary columns
+CICD_RUN_RESULT_COLUMNS = (
+    CICDRun.sast_results,
+    CICDRun.dast_results,
+    CICDRun.trivy_results,
+    CICDRun.lint_results,
+    CICDRun.test_results,
+)
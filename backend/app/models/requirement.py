@@ -21,7 +21,8 @@ class Requirement(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
     # Relationships
-    controls = db.relationship("SecurityControl", backref="requirement", lazy="dynamic", cascade="all, delete-orphan")
+    # Controls for every requirement loaded together arrive in one extra IN query
+    controls = db.relationship("SecurityControl", backref="requirement", lazy="selectin", cascade="all, delete-orphan")
 
     def __repr__(self):
         return f"<Requirement {self.title}>"
@@ -36,8 +37,8 @@ class Requirement(db.Model):
             "created_by": self.created_by,
             "status": self.status,
             "owasp_asvs_level": self.owasp_asvs_level,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
             "controls": [control.to_dict() for control in self.controls],
         }
 
@@ -51,7 +52,9 @@ class SecurityControl(db.Model):
     name = db.Column(db.String(200), nullable=False)
     description = db.Column(db.Text, nullable=True)
     owasp_asvs_level = db.Column(db.String(20), nullable=True)
-    requirement_id = db.Column(db.Integer, db.ForeignKey("requirements.id", ondelete="CASCADE"), nullable=False)
+    requirement_id = db.Column(
+        db.Integer, db.ForeignKey("requirements.id", ondelete="CASCADE"), nullable=False, index=True
+    )
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
 
     def __repr__(self):
@@ -65,5 +68,5 @@ class SecurityControl(db.Model):
             "description": self.description,
             "owasp_asvs_level": self.owasp_asvs_level,
             "requirement_id": self.requirement_id,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "created_at": self.created_at,
         }
@@ -3,6 +3,9 @@
 from datetime import datetime
 from app import db
 from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import validates
+
+DREAD_FACTORS = ("damage", "reproducibility", "exploitability", "affected_users", "discoverability")
 
 
 class Threat(db.Model):
@@ -11,19 +14,37 @@ class Threat(db.Model):
     __tablename__ = "threats"
 
     id = db.Column(db.Integer, primary_key=True)
-    asset = db.Column(db.String(200), nullable=False)
+    asset = db.Column(db.String(200), nullable=False, index=True)
     flow = db.Column(db.Text, nullable=False)
     trust_boundary = db.Column(db.String(200), nullable=True)
     stride_categories = db.Column(JSONB, nullable=False)  # Array of STRIDE categories
     dread_score = db.Column(JSONB, nullable=False)  # DREAD scoring details
     risk_level = db.Column(db.String(20), nullable=False)  # High, Medium, Low
     mitigation = db.Column(db.Text, nullable=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    # DREAD factors copied out of dread_score so aggregates read plain integers
+    damage = db.Column(db.Integer, nullable=True)
+    reproducibility = db.Column(db.Integer, nullable=True)
+    exploitability = db.Column(db.Integer, nullable=True)
+    affected_users = db.Column(db.Integer, nullable=True)
+    discoverability = db.Column(db.Integer, nullable=True)
+    total_score = db.Column(db.Numeric(4, 2), nullable=True)  # Mean of the five factors
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
+    __table_args__ = (db.Index("ix_threats_risk_level_created_at", "risk_level", "created_at"),)
+
     def __repr__(self):
         return f"<Threat {self.asset}>"
 
+    @validates("dread_score")
+    def _copy_dread_factors(self, key, scores):
+        """Keep the factor columns and total_score in step with every dread_score assignment."""
+        factors = [(scores or {}).get(factor) for factor in DREAD_FACTORS]
+        for factor, value in zip(DREAD_FACTORS, factors):
+            setattr(self, factor, value)
+        self.total_score = None if None in factors else round(sum(factors) / 5.0, 2)
+        return scores
+
     def to_dict(self):
         """Convert threat to dictionary."""
         return {
@@ -35,6 +56,21 @@ class Threat(db.Model):
             "dread_score": self.dread_score,
             "risk_level": self.risk_level,
             "mitigation": self.mitigation,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
         }
+
+
+# Columns returned by to_dict(); list views select these directly and skip ORM hydration
+THREAT_COLUMNS = (
+    Threat.id,
+    Threat.asset,
+    Threat.flow,
+    Threat.trust_boundary,
+    Threat.stride_categories,
+    Threat.dread_score,
+    Threat.risk_level,
+    Threat.mitigation,
+    Threat.created_at,
+    Threat.updated_at,
+)
@@ -38,5 +38,21 @@ class ThreatTemplate(db.Model):
             "stride_categories": self.stride_categories,
             "default_dread_scores": self.default_dread_scores,
             "default_mitigation": self.default_mitigation,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "created_at": self.created_at,
         }
+
+
+# Columns returned by to_dict(); the list view selects these directly and skips ORM hydration
+THREAT_TEMPLATE_COLUMNS = (
+    ThreatTemplate.id,
+    ThreatTemplate.name,
+    ThreatTemplate.description,
+    ThreatTemplate.category,
+    ThreatTemplate.asset_type,
+    ThreatTemplate.flow_template,
+    ThreatTemplate.trust_boundary_template,
+    ThreatTemplate.stride_categories,
+    ThreatTemplate.default_dread_scores,
+    ThreatTemplate.default_mitigation,
+    ThreatTemplate.created_at,
+)
@@ -11,12 +11,13 @@ class ThreatVulnerability(db.Model):
     __tablename__ = "threat_vulnerabilities"
 
     id = db.Column(db.Integer, primary_key=True)
-    threat_id = db.Column(db.Integer, db.ForeignKey("threats.id", ondelete="CASCADE"), nullable=False)
-    vulnerability_type = db.Column(db.String(50), nullable=False)  # 'sonarqube', 'zap', 'trivy'
+    threat_id = db.Column(db.Integer, db.ForeignKey("threats.id", ondelete="CASCADE"), nullable=False, index=True)
+    vulnerability_type = db.Column(db.String(50), nullable=False, index=True)  # 'sonarqube', 'zap', 'trivy'
     vulnerability_id = db.Column(db.String(200), nullable=False)  # ID from the scan tool
     scan_run_id = db.Column(db.Integer, db.ForeignKey("ci_cd_runs.id", ondelete="SET NULL"), nullable=True)
     severity = db.Column(db.String(20), nullable=True)  # 'critical', 'high', 'medium', 'low'
-    status = db.Column(db.String(50), nullable=False, default="linked")  # 'linked', 'resolved', 'false_positive'
+    # 'linked', 'resolved', 'false_positive'
+    status = db.Column(db.String(50), nullable=False, default="linked", index=True)
     vulnerability_data = db.Column(db.JSON, nullable=True)  # Store full vulnerability details
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -41,6 +42,21 @@ class ThreatVulnerability(db.Model):
             "severity": self.severity,
             "status": self.status,
             "vulnerability_data": self.vulnerability_data,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
         }
+
+
+# Columns returned by to_dict(); list views select these directly and skip ORM hydration
+THREAT_VULNERABILITY_COLUMNS = (
+    ThreatVulnerability.id,
+    ThreatVulnerability.threat_id,
+    ThreatVulnerability.vulnerability_type,
+    ThreatVulnerability.vulnerability_id,
+    ThreatVulnerability.scan_run_id,
+    ThreatVulnerability.severity,
+    ThreatVulnerability.status,
+    ThreatVulnerability.vulnerability_data,
+    ThreatVulnerability.created_at,
+    ThreatVulnerability.updated_at,
+)
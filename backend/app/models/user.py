@@ -35,7 +35,7 @@ class User(db.Model):
             "username": self.username,
             "email": self.email,
             "role": self.role,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "last_login": self.last_login.isoformat() if self.last_login else None,
+            "created_at": self.created_at,
+            "last_login": self.last_login,
             "is_active": self.is_active,
         }
@@ -1,7 +1,45 @@
 """Automated DREAD scoring service."""
 
+import re
 from typing import Dict, Any, Optional
-from app.services.threat_patterns import match_threat_patterns, get_suggested_dread_from_patterns, detect_component_type
+from app.services.threat_patterns import (
+    component_types_in_text,
+    get_suggested_dread_from_patterns,
+    match_threat_patterns,
+)
+
+# Substrings of the asset and flow text that mark a critical asset or an externally exposed one
+CRITICAL_KEYWORDS = (
+    "payment",
+    "financial",
+    "bank",
+    "credit card",
+    "pii",
+    "personal data",
+    "health",
+    "medical",
+    "patient",
+    "authentication",
+    "authorization",
+    "admin",
+    "root",
+    "critical",
+    "production",
+    "live",
+)
+EXTERNAL_KEYWORDS = ("public", "internet", "external", "api", "web", "http")
+
+# One alternation per keyword list, so each check is a single C-level scan of the text
+_CRITICAL_CONTEXT_RE = re.compile("|".join(map(re.escape, CRITICAL_KEYWORDS)))
+_EXTERNAL_CONTEXT_RE = re.compile("|".join(map(re.escape, EXTERNAL_KEYWORDS)))
+
+# Indexed by how many of the Medium (> 4) and High (> 7) thresholds a score passes
+RISK_LEVELS = ("Low", "Medium", "High")
+
+
+def risk_level_from_score(total_score: float) -> str:
+    """Map a mean DREAD score (0-10) to its risk level."""
+    return RISK_LEVELS[(total_score > 4) + (total_score > 7)]
 
 
 class DREADScorer:
@@ -28,11 +66,12 @@ class DREADScorer:
         # Get suggested scores from patterns
         suggested_scores = get_suggested_dread_from_patterns(matched_patterns)
 
-        # Detect component types for context
-        component_types = detect_component_type(asset, flow)
+        # Lowercase the text once for component detection and the context keywords
+        text = f"{asset} {flow}".lower()
+        component_types = component_types_in_text(text)
 
         # Adjust scores based on asset criticality and context
-        adjusted_scores = self._adjust_scores_by_context(suggested_scores, asset, flow, component_types)
+        adjusted_scores = self._adjust_scores_by_context(suggested_scores, text, component_types)
 
         # Calculate confidence for each score
         confidence_scores = self._calculate_confidence(matched_patterns, adjusted_scores, component_types)
@@ -56,44 +95,22 @@ class DREADScorer:
         }
 
     def _adjust_scores_by_context(
-        self, base_scores: Dict[str, int], asset: str, flow: str, component_types: list
+        self, base_scores: Dict[str, int], text: str, component_types: list
     ) -> Dict[str, int]:
-        """Adjust scores based on asset criticality and context."""
+        """Adjust scores based on asset criticality and context.
+
+        text is the lowercased "asset flow" description.
+        """
         adjusted = base_scores.copy()
-        text = f"{asset} {flow}".lower()
 
         # Check for critical infrastructure indicators
-        critical_keywords = [
-            "payment",
-            "financial",
-            "bank",
-            "credit card",
-            "pii",
-            "personal data",
-            "health",
-            "medical",
-            "patient",
-            "authentication",
-            "authorization",
-            "admin",
-            "root",
-            "critical",
-            "production",
-            "live",
-        ]
-
-        is_critical = any(keyword in text for keyword in critical_keywords)
-
-        if is_critical:
+        if _CRITICAL_CONTEXT_RE.search(text):
             # Increase damage and affected_users for critical assets
             adjusted["damage"] = min(adjusted["damage"] + 1, 10)
             adjusted["affected_users"] = min(adjusted["affected_users"] + 1, 10)
 
         # Check for external exposure
-        external_keywords = ["public", "internet", "external", "api", "web", "http"]
-        is_external = any(keyword in text for keyword in external_keywords)
-
-        if is_external:
+        if _EXTERNAL_CONTEXT_RE.search(text):
             # Increase discoverability and exploitability
             adjusted["discoverability"] = min(adjusted["discoverability"] + 1, 10)
             adjusted["exploitability"] = min(adjusted["exploitability"] + 1, 10)
@@ -1,8 +1,420 @@
 """Enhanced mitigation recommendations with contextual and prioritized suggestions."""
 
-from typing import List, Dict, Any
+import heapq
+from functools import lru_cache
+from operator import attrgetter
+from typing import List, Dict, Any, FrozenSet, NamedTuple, Tuple
 from app.services.threat_patterns import THREAT_PATTERNS
 
+# Distinct argument combinations whose responses are kept
+MITIGATION_CACHE_MAX_SIZE = 1024
+
+_PRIORITY_RANK = {"high": 3, "medium": 2, "low": 1}
+
+
+class Mitigation(NamedTuple):
+    """A mitigation recommendation as stored in the shared tables."""
+
+    text: str
+    priority: str
+    difficulty: str
+    effectiveness: int
+    priority_rank: int
+
+    def to_json(self) -> Dict[str, Any]:
+        """API shape of the mitigation, without the internal sort rank."""
+        return {
+            "text": self.text,
+            "priority": self.priority,
+            "difficulty": self.difficulty,
+            "effectiveness": self.effectiveness,
+        }
+
+
+# Compares the integer rank rather than looking the priority name up per comparison
+_SORT_KEY = attrgetter("priority_rank", "effectiveness")
+
+
+def _by_priority(mitigations):
+    """Tuple of Mitigation records built from mitigation dicts, sorted best first."""
+    records = (Mitigation(**m, priority_rank=_PRIORITY_RANK[m["priority"]]) for m in mitigations)
+    return tuple(sorted(records, key=_SORT_KEY, reverse=True))
+
+
+def _sorted_tables(table):
+    """Sort every mitigation tuple of a table best first."""
+    return {key: _by_priority(mitigations) for key, mitigations in table.items()}
+
+
+def _promote_medium(mitigations):
+    """Copy of a mitigation tuple with medium priorities raised to high, for High-risk threats."""
+    return tuple({**m, "priority": "high"} if m["priority"] == "medium" else m for m in mitigations)
+
+
+# The tables below are built once at import and shared by every call; risk-dependent
+# priorities get their own variant tables. They become Mitigation records once sorted.
+_PATTERN_MITIGATIONS = {
+    "sql_injection": (
+        {
+            "text": "URGENT: Use parameterized queries or prepared statements for all database operations",
+            "priority": "high",
+            "difficulty": "easy",
+            "effectiveness": 9,
+        },
+        {
+            "text": "Implement input validation using whitelist approach",
+            "priority": "high",
+            "difficulty": "medium",
+            "effectiveness": 8,
+        },
+        {
+            "text": "Apply principle of least privilege to database user accounts",
+            "priority": "medium",
+            "difficulty": "medium",
+            "effectiveness": 7,
+        },
+    ),
+    "xss": (
+        {
+            "text": "Implement output encoding (HTML entity encoding) for all user-generated content",
+            "priority": "high",
+            "difficulty": "easy",
+            "effectiveness": 9,
+        },
+        {
+            "text": "Use Content Security Policy (CSP) headers",
+            "priority": "high",
+            "difficulty": "medium",
+            "effectiveness": 8,
+        },
+        {
+            "text": "Validate and sanitize all user input before rendering",
+            "priority": "medium",
+            "difficulty": "medium",
+            "effectiveness": 7,
+        },
+    ),
+    "authentication_bypass": (
+        {
+            "text": "CRITICAL: Implement strong authentication mechanisms immediately",
+            "priority": "high",
+            "difficulty": "hard",
+            "effectiveness": 10,
+        },
+        {
+            "text": "Enable multi-factor authentication (MFA) for all users",
+            "priority": "high",
+            "difficulty": "medium",
+            "effectiveness": 9,
+        },
+        {
+            "text": "Use secure password storage (bcrypt, Argon2)",
+            "priority": "high",
+            "difficulty": "easy",
+            "effectiveness": 8,
+        },
+    ),
+}
+
+_STRIDE_MITIGATIONS = {
+    "Spoofing": (
+        {
+            "text": "Implement strong authentication mechanisms (MFA, certificate-based auth)",
+            "priority": "high",
+            "difficulty": "medium",
+            "effectiveness": 9,
+        },
+        {
+            "text": "Use digital signatures for critical communications",
+            "priority": "medium",
+            "difficulty": "medium",
+            "effectiveness": 7,
+        },
+    ),
+    "Tampering": (
+        {
+            "text": "Use cryptographic signatures and integrity checks",
+            "priority": "high",
+            "difficulty": "medium",
+            "effectiveness": 8,
+        },
+        {
+            "text": "Implement input validation and sanitization",
+            "priority": "high",
+            "difficulty": "easy",
+            "effectiveness": 8,
+        },
+        {
+            "text": "Use HTTPS/TLS for all network communications",
+            "priority": "medium",
+            "difficulty": "easy",
+            "effectiveness": 7,
+        },
+    ),
+    "Repudiation": (
+        {
+            "text": "Implement comprehensive audit logging",
+            "priority": "high",
+            "difficulty": "easy",
+            "effectiveness": 8,
+        },
+        {
+            "text": "Use digital signatures for critical transactions",
+            "priority": "medium",
+            "difficulty": "medium",
+            "effectiveness": 7,
+        },
+        {
+            "text": "Implement non-repudiation mechanisms",
+            "priority": "medium",
+            "difficulty": "hard",
+            "effectiveness": 8,
+        },
+    ),
+    "Information Disclosure": (
+        {
+            "text": "Encrypt sensitive data at rest and in transit",
+            "priority": "high",
+            "difficulty": "medium",
+            "effectiveness": 9,
+        },
+        {
+            "text": "Implement proper access controls and least privilege",
+            "priority": "high",
+            "difficulty": "medium",
+            "effectiveness": 8,
+        },
+        {
+            "text": "Use data masking for sensitive information in logs",
+            "priority": "medium",
+            "difficulty": "easy",
+            "effectiveness": 6,
+        },
+    ),
+    "Denial of Service": (
+        {
+            "text": "Implement rate limiting and resource quotas",
+            "priority": "high",
+            "difficulty": "easy",
+            "effectiveness": 8,
+        },
+        {
+            "text": "Use load balancing and redundancy",
+            "priority": "medium",
+            "difficulty": "hard",
+            "effectiveness": 7,
+        },
+        {"text": "Implement DDoS protection", "priority": "medium", "difficulty": "medium", "effectiveness": 8},
+    ),
+    "Elevation of Privilege": (
+        {
+            "text": "Implement principle of least privilege",
+            "priority": "high",
+            "difficulty": "medium",
+            "effectiveness": 9,
+        },
+        {
+            "text": "Use role-based access control (RBAC)",
+            "priority": "high",
+            "difficulty": "medium",
+            "effectiveness": 8,
+        },
+        {
+            "text": "Regular security audits and privilege reviews",
+            "priority": "medium",
+            "difficulty": "medium",
+            "effectiveness": 7,
+        },
+    ),
+}
+
+_STRIDE_MITIGATIONS_HIGH = {category: _promote_medium(ms) for category, ms in _STRIDE_MITIGATIONS.items()}
+
+_COMPONENT_MITIGATIONS = {
+    "database": (
+        {
+            "text": "Enable database encryption at rest",
+            "priority": "medium",
+            "difficulty": "medium",
+            "effectiveness": 8,
+        },
+        {
+            "text": "Implement database access controls and audit logging",
+            "priority": "high",
+            "difficulty": "medium",
+            "effectiveness": 8,
+        },
+    ),
+    "api": (
+        {
+            "text": "Implement API rate limiting and throttling",
+            "priority": "medium",
+            "difficulty": "easy",
+            "effectiveness": 7,
+        },
+        {
+            "text": "Use API authentication and authorization (OAuth2, API keys)",
+            "priority": "high",
+            "difficulty": "medium",
+            "effectiveness": 9,
+        },
+    ),
+    "authentication": (
+        {
+            "text": "Implement account lockout after failed login attempts",
+            "priority": "medium",
+            "difficulty": "easy",
+            "effectiveness": 7,
+        },
+        {
+            "text": "Use secure session management with proper expiration",
+            "priority": "high",
+            "difficulty": "medium",
+            "effectiveness": 8,
+        },
+    ),
+}
+
+# Account lockout stays medium even for High-risk threats
+_COMPONENT_MITIGATIONS_HIGH = {
+    **_COMPONENT_MITIGATIONS,
+    "database": _promote_medium(_COMPONENT_MITIGATIONS["database"]),
+    "api": _promote_medium(_COMPONENT_MITIGATIONS["api"]),
+}
+
+_RISK_LEVEL_MITIGATIONS = {
+    "High": (
+        {
+            "text": "URGENT: Address immediately. Schedule security review and penetration testing.",
+            "priority": "high",
+            "difficulty": "hard",
+            "effectiveness": 10,
+        },
+        {
+            "text": "Implement temporary mitigation measures while permanent fix is developed",
+            "priority": "high",
+            "difficulty": "medium",
+            "effectiveness": 6,
+        },
+    ),
+    "Medium": (
+        {
+            "text": "Address within next sprint. Schedule security review.",
+            "priority": "medium",
+            "difficulty": "medium",
+            "effectiveness": 7,
+        },
+    ),
+    "Low": (
+        {
+            "text": "Monitor and address in regular security maintenance.",
+            "priority": "low",
+            "difficulty": "easy",
+            "effectiveness": 5,
+        },
+    ),
+}
+
+
+# Sort every tuple best first, so a call only has to merge the ones it needs. The High-risk
+# variants were promoted in table order, so ties keep falling back to the order written above.
+_PATTERN_MITIGATIONS = _sorted_tables(_PATTERN_MITIGATIONS)
+_STRIDE_MITIGATIONS = _sorted_tables(_STRIDE_MITIGATIONS)
+_STRIDE_MITIGATIONS_HIGH = _sorted_tables(_STRIDE_MITIGATIONS_HIGH)
+_COMPONENT_MITIGATIONS = _sorted_tables(_COMPONENT_MITIGATIONS)
+_COMPONENT_MITIGATIONS_HIGH = _sorted_tables(_COMPONENT_MITIGATIONS_HIGH)
+_RISK_LEVEL_MITIGATIONS = _sorted_tables(_RISK_LEVEL_MITIGATIONS)
+
+
+def _pattern_mitigations(pattern: str) -> Tuple[Mitigation, ...]:
+    """Get mitigations specific to threat pattern."""
+    return _PATTERN_MITIGATIONS.get(pattern, ())
+
+
+def _stride_mitigations(category: str, risk_level: str) -> Tuple[Mitigation, ...]:
+    """Get mitigations for STRIDE category."""
+    # High-risk threats get the variant with medium priorities promoted
+    table = _STRIDE_MITIGATIONS_HIGH if risk_level == "High" else _STRIDE_MITIGATIONS
+    return table.get(category, ())
+
+
+def _component_mitigations(component_types: FrozenSet[str], risk_level: str) -> List[Tuple[Mitigation, ...]]:
+    """Get the mitigation tuples for the given component types."""
+    table = _COMPONENT_MITIGATIONS_HIGH if risk_level == "High" else _COMPONENT_MITIGATIONS
+    # Walk the table rather than intersecting the sets: set order is arbitrary, and
+    # the source order decides how equally ranked mitigations are ordered
+    return [table[component_type] for component_type in table if component_type in component_types]
+
+
+def _risk_level_mitigations(risk_level: str) -> Tuple[Mitigation, ...]:
+    """Get risk-level specific mitigation actions."""
+    return _RISK_LEVEL_MITIGATIONS.get(risk_level, _RISK_LEVEL_MITIGATIONS["Low"])
+
+
+def _prioritized_response(sources) -> Dict[str, Any]:
+    """Merge sorted mitigation tuples into the prioritized, deduplicated response.
+
+    The mitigations stay immutable Mitigation records so the response can be shared;
+    callers get it through _fresh_response().
+    """
+    # Every record comes from the shared tables, whose texts are unique, so a duplicate
+    # is the same record object seen twice (e.g. a repeated category)
+    seen = set()
+    unique = []
+    counts = dict.fromkeys(_PRIORITY_RANK, 0)
+    for m in heapq.merge(*sources, key=_SORT_KEY, reverse=True):
+        if id(m) not in seen:
+            seen.add(id(m))
+            unique.append(m)
+            counts[m.priority] += 1
+
+    return {
+        "mitigations": tuple(unique),
+        "total_count": len(unique),
+        "high_priority_count": counts["high"],
+        "medium_priority_count": counts["medium"],
+        "low_priority_count": counts["low"],
+    }
+
+
+def _fresh_response(shared: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a shared response for one caller, with new mitigation dicts it may freely modify."""
+    return {**shared, "mitigations": [m.to_json() for m in shared["mitigations"]]}
+
+
+# Responses for threats with nothing but a risk level, which skip the cache entirely
+_RISK_LEVEL_RESPONSES = {level: _prioritized_response([ms]) for level, ms in _RISK_LEVEL_MITIGATIONS.items()}
+
+
+@lru_cache(maxsize=MITIGATION_CACHE_MAX_SIZE)
+def _cached_mitigations(
+    stride_categories: Tuple[str, ...],
+    risk_level: str,
+    threat_pattern: str,
+    asset_type: str,
+    component_types: FrozenSet[str],
+) -> Dict[str, Any]:
+    """Build the shared mitigation response for normalized arguments."""
+    # Each source is an already sorted tuple
+    sources = []
+
+    # Pattern-specific mitigations
+    if threat_pattern and threat_pattern in THREAT_PATTERNS:
+        sources.append(_pattern_mitigations(threat_pattern))
+
+    # STRIDE category mitigations
+    for category in stride_categories:
+        sources.append(_stride_mitigations(category, risk_level))
+
+    # Asset/component-specific mitigations
+    if component_types:
+        sources.extend(_component_mitigations(component_types, risk_level))
+
+    # Risk-level specific actions
+    sources.append(_risk_level_mitigations(risk_level))
+
+    return _prioritized_response(sources)
+
 
 class EnhancedMitigationEngine:
     """Enhanced mitigation engine with contextual recommendations."""
@@ -21,347 +433,15 @@ class EnhancedMitigationEngine:
         Returns:
             Dictionary with prioritized mitigations and metadata
         """
-        mitigations = []
-
-        # Pattern-specific mitigations
-        if threat_pattern and threat_pattern in THREAT_PATTERNS:
-            # Add pattern-specific mitigations first (highest priority)
-            mitigations.extend(self._get_pattern_mitigations(threat_pattern, risk_level))
-
-        # STRIDE category mitigations
-        for category in stride_categories:
-            mitigations.extend(self._get_stride_mitigations(category, risk_level, asset_type, component_types))
+        if not (stride_categories or threat_pattern or component_types):
+            return _fresh_response(_RISK_LEVEL_RESPONSES.get(risk_level, _RISK_LEVEL_RESPONSES["Low"]))
 
-        # Asset/component-specific mitigations
-        if component_types:
-            mitigations.extend(self._get_component_mitigations(component_types, risk_level))
-
-        # Risk-level specific actions
-        mitigations.extend(self._get_risk_level_mitigations(risk_level))
-
-        # Prioritize and deduplicate
-        prioritized = self._prioritize_mitigations(mitigations, risk_level)
-
-        return {
-            "mitigations": prioritized,
-            "total_count": len(prioritized),
-            "high_priority_count": len([m for m in prioritized if m["priority"] == "high"]),
-            "medium_priority_count": len([m for m in prioritized if m["priority"] == "medium"]),
-            "low_priority_count": len([m for m in prioritized if m["priority"] == "low"]),
-        }
-
-    def _get_pattern_mitigations(self, pattern: str, risk_level: str) -> List[Dict[str, Any]]:
-        """Get mitigations specific to threat pattern."""
-        pattern_mitigations = {
-            "sql_injection": [
-                {
-                    "text": "URGENT: Use parameterized queries or prepared statements for all database operations",
-                    "priority": "high",
-                    "difficulty": "easy",
-                    "effectiveness": 9,
-                },
-                {
-                    "text": "Implement input validation using whitelist approach",
-                    "priority": "high",
-                    "difficulty": "medium",
-                    "effectiveness": 8,
-                },
-                {
-                    "text": "Apply principle of least privilege to database user accounts",
-                    "priority": "medium",
-                    "difficulty": "medium",
-                    "effectiveness": 7,
-                },
-            ],
-            "xss": [
-                {
-                    "text": "Implement output encoding (HTML entity encoding) for all user-generated content",
-                    "priority": "high",
-                    "difficulty": "easy",
-                    "effectiveness": 9,
-                },
-                {
-                    "text": "Use Content Security Policy (CSP) headers",
-                    "priority": "high",
-                    "difficulty": "medium",
-                    "effectiveness": 8,
-                },
-                {
-                    "text": "Validate and sanitize all user input before rendering",
-                    "priority": "medium",
-                    "difficulty": "medium",
-                    "effectiveness": 7,
-                },
-            ],
-            "authentication_bypass": [
-                {
-                    "text": "CRITICAL: Implement strong authentication mechanisms immediately",
-                    "priority": "high",
-                    "difficulty": "hard",
-                    "effectiveness": 10,
-                },
-                {
-                    "text": "Enable multi-factor authentication (MFA) for all users",
-                    "priority": "high",
-                    "difficulty": "medium",
-                    "effectiveness": 9,
-                },
-                {
-                    "text": "Use secure password storage (bcrypt, Argon2)",
-                    "priority": "high",
-                    "difficulty": "easy",
-                    "effectiveness": 8,
-                },
-            ],
-        }
-
-        return pattern_mitigations.get(pattern, [])
-
-    def _get_stride_mitigations(
-        self, category: str, risk_level: str, asset_type: str = None, component_types: List[str] = None
-    ) -> List[Dict[str, Any]]:
-        """Get mitigations for STRIDE category."""
-        mitigations = []
-
-        base_mitigations = {
-            "Spoofing": [
-                {
-                    "text": "Implement strong authentication mechanisms (MFA, certificate-based auth)",
-                    "priority": "high",
-                    "difficulty": "medium",
-                    "effectiveness": 9,
-                },
-                {
-                    "text": "Use digital signatures for critical communications",
-                    "priority": "medium",
-                    "difficulty": "medium",
-                    "effectiveness": 7,
-                },
-            ],
-            "Tampering": [
-                {
-                    "text": "Use cryptographic signatures and integrity checks",
-                    "priority": "high",
-                    "difficulty": "medium",
-                    "effectiveness": 8,
-                },
-                {
-                    "text": "Implement input validation and sanitization",
-                    "priority": "high",
-                    "difficulty": "easy",
-                    "effectiveness": 8,
-                },
-                {
-                    "text": "Use HTTPS/TLS for all network communications",
-                    "priority": "medium",
-                    "difficulty": "easy",
-                    "effectiveness": 7,
-                },
-            ],
-            "Repudiation": [
-                {
-                    "text": "Implement comprehensive audit logging",
-                    "priority": "high",
-                    "difficulty": "easy",
-                    "effectiveness": 8,
-                },
-                {
-                    "text": "Use digital signatures for critical transactions",
-                    "priority": "medium",
-                    "difficulty": "medium",
-                    "effectiveness": 7,
-                },
-                {
-                    "text": "Implement non-repudiation mechanisms",
-                    "priority": "medium",
-                    "difficulty": "hard",
-                    "effectiveness": 8,
-                },
-            ],
-            "Information Disclosure": [
-                {
-                    "text": "Encrypt sensitive data at rest and in transit",
-                    "priority": "high",
-                    "difficulty": "medium",
-                    "effectiveness": 9,
-                },
-                {
-                    "text": "Implement proper access controls and least privilege",
-                    "priority": "high",
-                    "difficulty": "medium",
-                    "effectiveness": 8,
-                },
-                {
-                    "text": "Use data masking for sensitive information in logs",
-                    "priority": "medium",
-                    "difficulty": "easy",
-                    "effectiveness": 6,
-                },
-            ],
-            "Denial of Service": [
-                {
-                    "text": "Implement rate limiting and resource quotas",
-                    "priority": "high",
-                    "difficulty": "easy",
-                    "effectiveness": 8,
-                },
-                {
-                    "text": "Use load balancing and redundancy",
-                    "priority": "medium",
-                    "difficulty": "hard",
-                    "effectiveness": 7,
-                },
-                {"text": "Implement DDoS protection", "priority": "medium", "difficulty": "medium", "effectiveness": 8},
-            ],
-            "Elevation of Privilege": [
-                {
-                    "text": "Implement principle of least privilege",
-                    "priority": "high",
-                    "difficulty": "medium",
-                    "effectiveness": 9,
-                },
-                {
-                    "text": "Use role-based access control (RBAC)",
-                    "priority": "high",
-                    "difficulty": "medium",
-                    "effectiveness": 8,
-                },
-                {
-                    "text": "Regular security audits and privilege reviews",
-                    "priority": "medium",
-                    "difficulty": "medium",
-                    "effectiveness": 7,
-                },
-            ],
-        }
-
-        mitigations.extend(base_mitigations.get(category, []))
-
-        # Adjust priority based on risk level
-        if risk_level == "High":
-            for m in mitigations:
-                if m["priority"] == "medium":
-                    m["priority"] = "high"
-
-        return mitigations
-
-    def _get_component_mitigations(self, component_types: List[str], risk_level: str) -> List[Dict[str, Any]]:
-        """Get mitigations specific to component types."""
-        mitigations = []
-
-        if "database" in component_types:
-            mitigations.append(
-                {
-                    "text": "Enable database encryption at rest",
-                    "priority": "high" if risk_level == "High" else "medium",
-                    "difficulty": "medium",
-                    "effectiveness": 8,
-                }
-            )
-            mitigations.append(
-                {
-                    "text": "Implement database access controls and audit logging",
-                    "priority": "high",
-                    "difficulty": "medium",
-                    "effectiveness": 8,
-                }
-            )
-
-        if "api" in component_types:
-            mitigations.append(
-                {
-                    "text": "Implement API rate limiting and throttling",
-                    "priority": "high" if risk_level == "High" else "medium",
-                    "difficulty": "easy",
-                    "effectiveness": 7,
-                }
-            )
-            mitigations.append(
-                {
-                    "text": "Use API authentication and authorization (OAuth2, API keys)",
-                    "priority": "high",
-                    "difficulty": "medium",
-                    "effectiveness": 9,
-                }
-            )
-
-        if "authentication" in component_types:
-            mitigations.append(
-                {
-                    "text": "Implement account lockout after failed login attempts",
-                    "priority": "medium",
-                    "difficulty": "easy",
-                    "effectiveness": 7,
-                }
-            )
-            mitigations.append(
-                {
-                    "text": "Use secure session management with proper expiration",
-                    "priority": "high",
-                    "difficulty": "medium",
-                    "effectiveness": 8,
-                }
-            )
-
-        return mitigations
-
-    def _get_risk_level_mitigations(self, risk_level: str) -> List[Dict[str, Any]]:
-        """Get risk-level specific mitigation actions."""
-        mitigations = []
-
-        if risk_level == "High":
-            mitigations.append(
-                {
-                    "text": "URGENT: Address immediately. Schedule security review and penetration testing.",
-                    "priority": "high",
-                    "difficulty": "hard",
-                    "effectiveness": 10,
-                }
-            )
-            mitigations.append(
-                {
-                    "text": "Implement temporary mitigation measures while permanent fix is developed",
-                    "priority": "high",
-                    "difficulty": "medium",
-                    "effectiveness": 6,
-                }
-            )
-        elif risk_level == "Medium":
-            mitigations.append(
-                {
-                    "text": "Address within next sprint. Schedule security review.",
-                    "priority": "medium",
-                    "difficulty": "medium",
-                    "effectiveness": 7,
-                }
-            )
-        else:
-            mitigations.append(
-                {
-                    "text": "Monitor and address in regular security maintenance.",
-                    "priority": "low",
-                    "difficulty": "easy",
-                    "effectiveness": 5,
-                }
-            )
-
-        return mitigations
-
-    def _prioritize_mitigations(self, mitigations: List[Dict[str, Any]], risk_level: str) -> List[Dict[str, Any]]:
-        """Prioritize and deduplicate mitigations."""
-        # Remove duplicates based on text
-        seen = set()
-        unique = []
-        for m in mitigations:
-            text_key = m["text"].lower().strip()
-            if text_key not in seen:
-                seen.add(text_key)
-                unique.append(m)
-
-        # Sort by priority (high > medium > low), then by effectiveness
-        priority_order = {"high": 3, "medium": 2, "low": 1}
-        unique.sort(
-            key=lambda x: (priority_order.get(x.get("priority", "low"), 1), x.get("effectiveness", 0)), reverse=True
+        # Responses are cached per argument combination (component types only matter by membership)
+        shared = _cached_mitigations(
+            tuple(stride_categories),
+            risk_level,
+            threat_pattern,
+            asset_type,
+            frozenset(component_types or ()),
         )
-
-        return unique
+        return _fresh_response(shared)
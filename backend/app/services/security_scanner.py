@@ -5,6 +5,12 @@ import time
 from typing import Dict, Any, Optional
 from flask import current_app
 from datetime import datetime
+from requests.adapters import HTTPAdapter
+
+# Shared by all scanner instances so scan calls reuse pooled keep-alive connections
+_scanner_session = requests.Session()
+_scanner_session.mount("http://", HTTPAdapter(pool_connections=10, pool_maxsize=50))
+_scanner_session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=50))
 
 
 class SecurityScanner:
@@ -38,7 +44,7 @@ class SecurityScanner:
             page_size = 500
 
             while True:
-                response = requests.get(
+                response = _scanner_session.get(
                     f"{self.sonarqube_url}/api/issues/search",
                     params={"componentKeys": project_key, "p": page, "ps": page_size, "resolved": "false"},
                     auth=(self.sonarqube_token, ""),
@@ -61,7 +67,7 @@ class SecurityScanner:
                 page += 1
 
             # Get metrics
-            metrics_response = requests.get(
+            metrics_response = _scanner_session.get(
                 f"{self.sonarqube_url}/api/measures/component",
                 params={
                     "component": project_key,
@@ -91,7 +97,7 @@ class SecurityScanner:
                             metrics[metric_key] = int(value)
 
             # Get quality gate status
-            quality_gate_response = requests.get(
+            quality_gate_response = _scanner_session.get(
                 f"{self.sonarqube_url}/api/qualitygates/project_status",
                 params={"projectKey": project_key},
                 auth=(self.sonarqube_token, ""),
@@ -136,7 +142,7 @@ class SecurityScanner:
                 # Get rule details if available
                 if issue.get("rule"):
                     try:
-                        rule_response = requests.get(
+                        rule_response = _scanner_session.get(
                             f"{self.sonarqube_url}/api/rules/show",
                             params={"key": issue.get("rule")},
                             auth=(self.sonarqube_token, ""),
@@ -197,7 +203,7 @@ class SecurityScanner:
         """
         try:
             # Trivy server API - submit scan
-            scan_response = requests.post(
+            scan_response = _scanner_session.post(
                 f"{self.trivy_url}/v1/scan", json={"image": image_name}, timeout=300  # 5 minutes timeout
             )
 
@@ -221,7 +227,7 @@ class SecurityScanner:
             max_attempts = 60
             attempt = 0
             while attempt < max_attempts:
-                result_response = requests.get(f"{self.trivy_url}/v1/scan/{scan_id}", timeout=30)
+                result_response = _scanner_session.get(f"{self.trivy_url}/v1/scan/{scan_id}", timeout=30)
 
                 if result_response.status_code == 200:
                     result_data = result_response.json()
@@ -248,7 +254,9 @@ class SecurityScanner:
         """Fallback direct scan for Trivy."""
         try:
             # Try JSON format endpoint
-            response = requests.get(f"{self.trivy_url}/v1/images/{image_name}", params={"format": "json"}, timeout=300)
+            response = _scanner_session.get(
+                f"{self.trivy_url}/v1/images/{image_name}", params={"format": "json"}, timeout=300
+            )
 
             if response.status_code == 200:
                 return self._parse_trivy_results(response.json(), image_name)
@@ -374,7 +382,7 @@ class SecurityScanner:
                 return self._get_zap_scan_status(scan_id, target_url)
 
             # Start spider scan
-            spider_response = requests.get(
+            spider_response = _scanner_session.get(
                 f"{self.zap_url}/JSON/spider/action/scan", params={"url": target_url}, timeout=30
             )
 
@@ -391,7 +399,7 @@ class SecurityScanner:
             waited = 0
 
             while not spider_complete and waited < max_wait:
-                status_response = requests.get(
+                status_response = _scanner_session.get(
                     f"{self.zap_url}/JSON/spider/view/status", params={"scanId": spider_scan_id}, timeout=10
                 )
 
@@ -406,7 +414,7 @@ class SecurityScanner:
                 waited += 2
 
             # Start active scan
-            active_response = requests.get(
+            active_response = _scanner_session.get(
                 f"{self.zap_url}/JSON/ascan/action/scan", params={"url": target_url}, timeout=30
             )
 
@@ -423,7 +431,7 @@ class SecurityScanner:
             active_scan_id = active_data.get("scan")
 
             # Get spider results
-            spider_results_response = requests.get(
+            spider_results_response = _scanner_session.get(
                 f"{self.zap_url}/JSON/spider/view/results", params={"scanId": spider_scan_id}, timeout=10
             )
 
@@ -451,7 +459,7 @@ class SecurityScanner:
         """Get ZAP scan status and results."""
         try:
             # Check active scan status
-            status_response = requests.get(
+            status_response = _scanner_session.get(
                 f"{self.zap_url}/JSON/ascan/view/status", params={"scanId": scan_id}, timeout=10
             )
 
@@ -469,7 +477,7 @@ class SecurityScanner:
                 }
 
             # Scan complete, get alerts
-            alerts_response = requests.get(
+            alerts_response = _scanner_session.get(
                 f"{self.zap_url}/JSON/core/view/alerts", params={"baseurl": target_url}, timeout=30
             )
 
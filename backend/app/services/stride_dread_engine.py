@@ -2,6 +2,12 @@
 
 from typing import List, Dict, Any
 from app.services.threat_patterns import match_threat_patterns, detect_component_type, get_stride_from_patterns
+from app.services.dread_scorer import risk_level_from_score
+
+try:
+    from app.services.enhanced_mitigations import EnhancedMitigationEngine
+except ImportError:
+    EnhancedMitigationEngine = None
 
 
 class STRIDEEngine:
@@ -145,13 +151,7 @@ class STRIDEEngine:
             Dictionary with DREAD scores and risk level
         """
         total_score = (damage + reproducibility + exploitability + affected_users + discoverability) / 5.0
-
-        if total_score > 7:
-            risk_level = "High"
-        elif total_score > 4:
-            risk_level = "Medium"
-        else:
-            risk_level = "Low"
+        risk_level = risk_level_from_score(total_score)
 
         return {
             "damage": damage,
@@ -175,18 +175,13 @@ class STRIDEEngine:
             Mitigation recommendations string
         """
         # Use enhanced mitigation engine if available
-        try:
-            from app.services.enhanced_mitigations import EnhancedMitigationEngine
-
-            engine = EnhancedMitigationEngine()
-            mitigations_data = engine.get_mitigations(stride_categories, risk_level)
+        if _enhanced_engine:
+            mitigations_data = _enhanced_engine.get_mitigations(stride_categories, risk_level)
             # Format as string for backward compatibility
             mitigation_lines = [m["text"] for m in mitigations_data["mitigations"]]
             return "\n".join(mitigation_lines) if mitigation_lines else "No specific mitigations identified."
-        except ImportError:
-            # Fallback to basic mitigations
-            pass
 
+        # Fallback to basic mitigations
         mitigations = []
 
         if "Spoofing" in stride_categories:
@@ -222,3 +217,7 @@ class STRIDEEngine:
             mitigations.append("Monitor and address in regular security maintenance.")
 
         return "\n".join(mitigations) if mitigations else "No specific mitigations identified."
+
+
+# Stateless, so shared by every STRIDEEngine
+_enhanced_engine = EnhancedMitigationEngine() if EnhancedMitigationEngine else None
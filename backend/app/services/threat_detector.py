@@ -5,8 +5,9 @@ from app import db
 from app.models.threat import Threat
 from app.models.threat_vulnerability import ThreatVulnerability
 from app.models.cicd import CICDRun
+from app.core.dashboard_cache import invalidate_threat_analytics
 from app.services.stride_dread_engine import STRIDEEngine
-from app.services.dread_scorer import DREADScorer
+from app.services.dread_scorer import DREADScorer, risk_level_from_score
 from app.services.threat_patterns import match_threat_patterns
 
 
@@ -223,6 +224,7 @@ class ThreatDetector:
                 existing_link.severity = severity
                 existing_link.vulnerability_data = vulnerability_data
                 db.session.commit()
+                invalidate_threat_analytics()
 
                 return {"action": "linked", "threat_id": existing_link.threat_id, "vulnerability_id": existing_link.id}
 
@@ -236,7 +238,7 @@ class ThreatDetector:
 
             # Calculate risk level
             total_score = sum(dread_scores.values()) / 5.0
-            risk_level = "High" if total_score > 7 else "Medium" if total_score > 4 else "Low"
+            risk_level = risk_level_from_score(total_score)
 
             # Get mitigation recommendations
             mitigation = self.stride_engine.get_mitigation_recommendations(stride_categories, risk_level)
@@ -265,6 +267,7 @@ class ThreatDetector:
             )
             db.session.add(threat_vuln)
             db.session.commit()
+            invalidate_threat_analytics()
 
             return {"action": "created", "threat_id": threat.id, "vulnerability_id": threat_vuln.id}
 
@@ -303,7 +303,15 @@ def detect_component_type(asset: str, flow: str) -> List[str]:
     Returns:
         List of detected component types
     """
-    text = f"{asset} {flow}".lower()
+    return component_types_in_text(f"{asset} {flow}".lower())
+
+
+def component_types_in_text(text: str) -> List[str]:
+    """
+    Detect component types from an already-lowercased "asset flow" text.
+
+    Lets callers that lowercase the text anyway do it only once.
+    """
     component_types = []
 
     # Component type detection patterns
@@ -352,6 +360,9 @@ def match_threat_patterns(asset: str, flow: str, trust_boundary: str = None) ->
     text = f"{asset} {flow} {trust_boundary or ''}".lower()
     matches = []
 
+    # Independent of the pattern, so detected once rather than per pattern
+    component_types = detect_component_type(asset, flow)
+
     for pattern_name, pattern_data in THREAT_PATTERNS.items():
         confidence = 0.0
         matched_patterns = []
@@ -363,7 +374,6 @@ def match_threat_patterns(asset: str, flow: str, trust_boundary: str = None) ->
                 confidence = max(confidence, pattern_data["confidence"])
 
         # Boost confidence if component types match
-        component_types = detect_component_type(asset, flow)
         if any(ct in pattern_data.get("component_types", []) for ct in component_types):
             confidence = min(confidence + 0.1, 1.0)
 
@@ -1,7 +1,7 @@
 """Threat similarity detection service."""
 
 from typing import List, Dict, Any
-from app.models.threat import Threat
+from app.models.threat import Threat, DREAD_FACTORS
 from app.services.threat_patterns import match_threat_patterns
 
 
@@ -90,13 +90,12 @@ class ThreatSimilarityService:
         factors += 1
 
         # Factor 5: DREAD score similarity
-        target_dread = target.dread_score or {}
-        candidate_dread = candidate.dread_score or {}
-        dread_keys = ["damage", "reproducibility", "exploitability", "affected_users", "discoverability"]
         dread_similarities = []
-        for key in dread_keys:
-            target_val = target_dread.get(key, 5)
-            candidate_val = candidate_dread.get(key, 5)
+        for factor in DREAD_FACTORS:
+            target_val = getattr(target, factor)
+            candidate_val = getattr(candidate, factor)
+            target_val = 5 if target_val is None else target_val
+            candidate_val = 5 if candidate_val is None else candidate_val
             diff = abs(target_val - candidate_val)
             similarity = 1.0 - (diff / 10.0)  # Max diff is 10
             dread_similarities.append(max(0, similarity))
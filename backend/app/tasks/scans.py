@@ -0,0 +1,96 @@
+"""Background CI/CD scan pipeline."""
+
+from datetime import datetime
+from eventlet import GreenPool
+from eventlet.queue import Queue
+from flask import current_app
+from app import db, socketio
+from app.core.dashboard_cache import invalidate_cicd_dashboard
+from app.models.cicd import CICDRun
+from app.services.security_scanner import SecurityScanner
+from app.api.websocket import emit_scan_update, emit_dashboard_update
+
+# Scans run by the pipeline; results are stored in completion order
+SCAN_STEPS = ("sast", "trivy", "dast")
+
+
+def start_scan_pipeline(run_id, commit_hash):
+    """Run the SAST, Trivy and DAST scans for a run in a background task.
+
+    Must be called inside an application context; the task gets its own.
+    """
+    app = current_app._get_current_object()
+    socketio.start_background_task(run_scan_pipeline, app, run_id, commit_hash)
+
+
+def run_scan_pipeline(app, run_id, commit_hash):
+    """Run all scans for a run concurrently, storing and emitting each result as it arrives."""
+    with app.app_context():
+        run = db.session.get(CICDRun, run_id)
+        if run is None:
+            return
+
+        scanner = SecurityScanner()
+        scans = {
+            "sast": (scanner.run_sast_scan, commit_hash),
+            "trivy": (scanner.run_trivy_scan,),
+            "dast": (scanner.run_dast_scan,),
+        }
+        pool = GreenPool(len(SCAN_STEPS))
+        done = Queue()
+        pending = {name: pool.spawn(_run_scan, app, done, name, *scans[name]) for name in SCAN_STEPS}
+
+        try:
+            # Only this greenlet touches the session; the scan greenlets just do HTTP
+            for _ in SCAN_STEPS:
+                name, results = done.get()
+                del pending[name]
+                if isinstance(results, Exception):
+                    raise results
+                run.set_scan_results(name, results)
+                db.session.commit()
+                emit_scan_update(run.id, f"{name}_progress", {"status": "completed", "results": results})
+
+            finalize_run(run)
+            db.session.commit()
+            invalidate_cicd_dashboard()
+
+            summary = run.to_summary_dict()
+            emit_scan_update(run.id, "completed", summary)
+            emit_dashboard_update("scan_completed", summary)
+
+        except Exception as e:
+            current_app.logger.error(f"Scan pipeline failed for run {run_id}: {e}")
+            for gt in pending.values():
+                gt.kill()
+            db.session.rollback()
+            run.status = "Failed"
+            run.completed_at = datetime.utcnow()
+            db.session.commit()
+            invalidate_cicd_dashboard()
+
+            emit_scan_update(run.id, "failed", {"error": str(e)})
+
+        finally:
+            db.session.remove()
+
+
+def _run_scan(app, done, name, scan, *args):
+    """Run one scan in its own greenlet and put (name, results) on the done queue.
+
+    The greenlet needs an application context for logging and config. A raised
+    exception is queued in place of the results so the pipeline can fail the run.
+    """
+    with app.app_context():
+        try:
+            results = scan(*args)
+        except Exception as e:
+            done.put((name, e))
+        else:
+            done.put((name, results))
+
+
+def finalize_run(run):
+    """Set the final run status from the vulnerability totals."""
+    run.status = "Blocked" if run.critical_vulnerabilities > 0 else "Success"
+    run.completed_at = datetime.utcnow()
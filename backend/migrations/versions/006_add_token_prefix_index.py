@@ -0,0 +1,23 @@
+"""Index api_tokens.token_prefix for token verification lookups.
+
+Revision ID: 006_add_token_prefix_index
+Revises: 005_increase_token_prefix_length
+Create Date: 2026-10-15 09:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '006_add_token_prefix_index'
+down_revision = '005_increase_token_prefix_length'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(op.f('ix_api_tokens_token_prefix'), 'api_tokens', ['token_prefix'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_api_tokens_token_prefix'), table_name='api_tokens')
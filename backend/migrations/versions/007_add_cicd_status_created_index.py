@@ -0,0 +1,29 @@
+"""Index ci_cd_runs by (status, created_at DESC) for dashboard queries.
+
+Revision ID: 007_add_cicd_status_created_idx
+Revises: 006_add_token_prefix_index
+Create Date: 2026-10-15 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '007_add_cicd_status_created_idx'
+down_revision = '006_add_token_prefix_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_ci_cd_runs_status_created_at',
+        'ci_cd_runs',
+        ['status', sa.text('created_at DESC')],
+        unique=False
+    )
+
+
+def downgrade():
+    op.drop_index('ix_ci_cd_runs_status_created_at', table_name='ci_cd_runs')
@@ -0,0 +1,39 @@
+"""Add per-scan vulnerability counts to ci_cd_runs.
+
+Revision ID: 008_add_cicd_scan_counts
+Revises: 007_add_cicd_status_created_idx
+Create Date: 2026-10-15 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '008_add_cicd_scan_counts'
+down_revision = '007_add_cicd_status_created_idx'
+branch_labels = None
+depends_on = None
+
+SCANS = ('sast', 'trivy', 'dast')
+
+
+def upgrade():
+    for scan in SCANS:
+        op.add_column('ci_cd_runs', sa.Column(f'{scan}_critical', sa.Integer(), nullable=False, server_default='0'))
+        op.add_column('ci_cd_runs', sa.Column(f'{scan}_total', sa.Integer(), nullable=False, server_default='0'))
+
+    # Backfill counts from the stored scan results
+    for scan in SCANS:
+        op.execute(
+            f"UPDATE ci_cd_runs SET "
+            f"{scan}_critical = COALESCE(({scan}_results->>'critical')::integer, 0), "
+            f"{scan}_total = COALESCE(({scan}_results->>'total')::integer, 0) "
+            f"WHERE {scan}_results IS NOT NULL"
+        )
+
+
+def downgrade():
+    for scan in reversed(SCANS):
+        op.drop_column('ci_cd_runs', f'{scan}_total')
+        op.drop_column('ci_cd_runs', f'{scan}_critical')
@@ -0,0 +1,28 @@
+"""Index security_controls.requirement_id.
+
+Revision ID: 009_add_control_requirement_idx
+Revises: 008_add_cicd_scan_counts
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '009_add_control_requirement_idx'
+down_revision = '008_add_cicd_scan_counts'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(
+        'ix_security_controls_requirement_id',
+        'security_controls',
+        ['requirement_id'],
+        unique=False
+    )
+
+
+def downgrade():
+    op.drop_index('ix_security_controls_requirement_id', table_name='security_controls')
@@ -0,0 +1,46 @@
+"""Index ci_cd_runs for latest-run-per-commit and latest-scan lookups.
+
+Revision ID: 010_add_cicd_lookup_indexes
+Revises: 009_add_control_requirement_idx
+Create Date: 2026-10-15 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '010_add_cicd_lookup_indexes'
+down_revision = '009_add_control_requirement_idx'
+branch_labels = None
+depends_on = None
+
+SCANS = ('sast', 'dast', 'trivy')
+
+
+def upgrade():
+    # The composite index serves plain commit_hash lookups too
+    op.create_index(
+        'ix_ci_cd_runs_commit_hash_created_at',
+        'ci_cd_runs',
+        ['commit_hash', sa.text('created_at DESC')],
+        unique=False
+    )
+    op.drop_index('ix_ci_cd_runs_commit_hash', table_name='ci_cd_runs')
+
+    for scan in SCANS:
+        op.create_index(
+            f'ix_ci_cd_runs_{scan}_latest',
+            'ci_cd_runs',
+            [sa.text('created_at DESC')],
+            unique=False,
+            postgresql_where=sa.text(f'{scan}_results IS NOT NULL')
+        )
+
+
+def downgrade():
+    for scan in reversed(SCANS):
+        op.drop_index(f'ix_ci_cd_runs_{scan}_latest', table_name='ci_cd_runs')
+
+    op.create_index('ix_ci_cd_runs_commit_hash', 'ci_cd_runs', ['commit_hash'], unique=False)
+    op.drop_index('ix_ci_cd_runs_commit_hash_created_at', table_name='ci_cd_runs')
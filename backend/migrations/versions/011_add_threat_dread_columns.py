@@ -0,0 +1,42 @@
+"""Copy DREAD factors out of threats.dread_score into integer columns.
+
+Revision ID: 011_add_threat_dread_columns
+Revises: 010_add_cicd_lookup_indexes
+Create Date: 2026-10-15 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '011_add_threat_dread_columns'
+down_revision = '010_add_cicd_lookup_indexes'
+branch_labels = None
+depends_on = None
+
+FACTORS = ('damage', 'reproducibility', 'exploitability', 'affected_users', 'discoverability')
+
+
+def upgrade():
+    for factor in FACTORS:
+        op.add_column('threats', sa.Column(factor, sa.Integer(), nullable=True))
+    op.add_column('threats', sa.Column('total_score', sa.Numeric(4, 2), nullable=True))
+
+    # Backfill from the stored scores; total_score stays NULL when a factor is missing
+    op.execute(
+        "UPDATE threats SET "
+        + ", ".join(f"{factor} = (dread_score->>'{factor}')::integer" for factor in FACTORS)
+        + " WHERE jsonb_typeof(dread_score) = 'object'"
+    )
+    op.execute(f"UPDATE threats SET total_score = round(({' + '.join(FACTORS)}) / 5.0, 2)")
+
+    op.create_index('ix_threats_risk_level_created_at', 'threats', ['risk_level', 'created_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_threats_risk_level_created_at', table_name='threats')
+
+    op.drop_column('threats', 'total_score')
+    for factor in reversed(FACTORS):
+        op.drop_column('threats', factor)
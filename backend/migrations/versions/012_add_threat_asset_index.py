@@ -0,0 +1,23 @@
+"""Index threats by asset for the most-vulnerable-assets breakdown.
+
+Revision ID: 012_add_threat_asset_index
+Revises: 011_add_threat_dread_columns
+Create Date: 2026-10-15 15:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '012_add_threat_asset_index'
+down_revision = '011_add_threat_dread_columns'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(op.f('ix_threats_asset'), 'threats', ['asset'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_threats_asset'), table_name='threats')
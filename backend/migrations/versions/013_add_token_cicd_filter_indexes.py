@@ -0,0 +1,42 @@
+"""Index active API tokens by prefix and ci_cd_runs by branch and status.
+
+Revision ID: 013_add_token_cicd_indexes
+Revises: 012_add_threat_asset_index
+Create Date: 2026-10-15 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '013_add_token_cicd_indexes'
+down_revision = '012_add_threat_asset_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Token verification only ever looks up active tokens
+    op.create_index(
+        'ix_api_tokens_active_prefix',
+        'api_tokens',
+        ['token_prefix'],
+        unique=False,
+        postgresql_where=sa.text('is_active')
+    )
+    op.drop_index(op.f('ix_api_tokens_token_prefix'), table_name='api_tokens')
+
+    op.create_index(
+        'ix_ci_cd_runs_branch_status_created_at',
+        'ci_cd_runs',
+        ['branch', 'status', sa.text('created_at DESC')],
+        unique=False
+    )
+
+
+def downgrade():
+    op.drop_index('ix_ci_cd_runs_branch_status_created_at', table_name='ci_cd_runs')
+
+    op.create_index(op.f('ix_api_tokens_token_prefix'), 'api_tokens', ['token_prefix'], unique=False)
+    op.drop_index('ix_api_tokens_active_prefix', table_name='api_tokens')
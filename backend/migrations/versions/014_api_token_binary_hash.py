@@ -0,0 +1,41 @@
+"""Store api_tokens.token_hash as a raw 32-byte SHA-256 digest.
+
+Revision ID: 014_api_token_binary_hash
+Revises: 013_add_token_cicd_indexes
+Create Date: 2026-10-15 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '014_api_token_binary_hash'
+down_revision = '013_add_token_cicd_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The unique constraint already indexes token_hash
+    op.drop_index(op.f('ix_api_tokens_token_hash'), table_name='api_tokens')
+    op.alter_column(
+        'api_tokens',
+        'token_hash',
+        existing_type=sa.String(length=255),
+        type_=sa.LargeBinary(length=32),
+        existing_nullable=False,
+        postgresql_using="decode(token_hash, 'hex')"
+    )
+
+
+def downgrade():
+    op.alter_column(
+        'api_tokens',
+        'token_hash',
+        existing_type=sa.LargeBinary(length=32),
+        type_=sa.String(length=255),
+        existing_nullable=False,
+        postgresql_using="encode(token_hash, 'hex')"
+    )
+    op.create_index(op.f('ix_api_tokens_token_hash'), 'api_tokens', ['token_hash'], unique=True)
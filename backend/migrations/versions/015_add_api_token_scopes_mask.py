@@ -0,0 +1,36 @@
+"""Add api_tokens.scopes_mask, the token scopes packed into bit flags.
+
+Revision ID: 015_add_token_scopes_mask
+Revises: 014_api_token_binary_hash
+Create Date: 2026-10-15 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '015_add_token_scopes_mask'
+down_revision = '014_api_token_binary_hash'
+branch_labels = None
+depends_on = None
+
+# Mirrors app.models.api_token.SCOPE_FLAGS at the time of this migration
+SCOPE_FLAGS = {'webhook:write': 1, 'webhook:read': 2, 'webhook:*': 3}
+
+
+def upgrade():
+    op.add_column('api_tokens', sa.Column('scopes_mask', sa.BigInteger(), nullable=False, server_default='0'))
+    op.alter_column('api_tokens', 'scopes_mask', server_default=None)
+
+    # OR together the flag of every known scope in the comma-separated list
+    flags = " ".join(f"WHEN '{name}' THEN {flag}" for name, flag in SCOPE_FLAGS.items())
+    op.execute(
+        "UPDATE api_tokens SET scopes_mask = ("
+        f"SELECT coalesce(bit_or(CASE btrim(scope) {flags} ELSE 0 END), 0) "
+        "FROM unnest(string_to_array(scopes, ',')) AS scope)"
+    )
+
+
+def downgrade():
+    op.drop_column('api_tokens', 'scopes_mask')
@@ -94,6 +94,32 @@ def admin_headers(app, admin_user):
         return {'Authorization': f'Bearer {access_token}'}
 
 
+@pytest.fixture
+def webhook_token(app, admin_user):
+    """Create a webhook API token; returns (raw token, token id)."""
+    from app.models.api_token import APIToken
+
+    with app.app_context():
+        token, token_hash, token_prefix = APIToken.generate_token()
+        api_token = APIToken(name='CI', token_hash=token_hash, token_prefix=token_prefix,
+                             created_by=admin_user.id, scopes='webhook:write')
+        db.session.add(api_token)
+        db.session.commit()
+        return token, api_token.id
+
+
+@pytest.fixture
+def webhook_run(app):
+    """Create a running CI/CD run for webhooks to report into; returns its id."""
+    from app.models.cicd import CICDRun
+
+    with app.app_context():
+        run = CICDRun(commit_hash='hook123', branch='main', status='Running')
+        db.session.add(run)
+        db.session.commit()
+        return run.id
+
+
 @pytest.fixture
 def db_session(app):
     """Get database session."""
@@ -1,5 +1,8 @@
 """Test authentication API endpoints."""
 import json
+import bcrypt
+from unittest.mock import patch
+from app import db
 from app.models.user import User
 
 
@@ -41,6 +44,23 @@ def test_register_duplicate_username(client, test_user):
     assert 'already exists' in data['error'].lower()
 
 
+def test_register_duplicate_email(client, test_user):
+    """Test registration with duplicate email."""
+    response = client.post(
+        '/api/auth/register',
+        data=json.dumps({
+            'username': 'differentuser',
+            'email': 'test@example.com',
+            'password': 'password123'
+        }),
+        content_type='application/json'
+    )
+
+    assert response.status_code == 400
+    data = json.loads(response.data)
+    assert data['error'] == 'Email already exists'
+
+
 def test_register_invalid_data(client):
     """Test registration with invalid data."""
     response = client.post(
@@ -58,6 +78,17 @@ def test_register_invalid_data(client):
     assert 'errors' in data
 
 
+def test_register_malformed_json(client):
+    """Test registration with a body that is not valid JSON."""
+    response = client.post(
+        '/api/auth/register',
+        data='{"username": "newuser",',
+        content_type='application/json'
+    )
+
+    assert response.status_code == 400
+
+
 def test_login_success(client, test_user):
     """Test successful login."""
     response = client.post(
@@ -75,7 +106,41 @@ def test_login_success(client, test_user):
     assert 'refresh_token' in data
     assert 'user' in data
     assert data['user']['username'] == 'testuser'
+    assert data['user']['last_login'] is not None
+
 
+def test_login_rehashes_legacy_bcrypt_password(app, client):
+    """Test that a bcrypt password hash is upgraded to argon2id on login."""
+    with app.app_context():
+        legacy_hash = bcrypt.hashpw(b'legacypass123', bcrypt.gensalt(rounds=4)).decode('utf-8')
+        db.session.add(User(username='legacyuser', email='legacy@example.com', password_hash=legacy_hash))
+        db.session.commit()
+
+    # The new hash must already be durably committed when the asynchronous
+    # last_login commit starts, so look at it from another connection then
+    stored_hashes = []
+    execute = db.session.execute
+
+    def spy_execute(statement, *args, **kwargs):
+        if 'synchronous_commit' in str(statement):
+            with db.engine.connect() as conn:
+                stored_hashes.append(conn.execute(
+                    db.select(User.password_hash).where(User.username == 'legacyuser')
+                ).scalar())
+        return execute(statement, *args, **kwargs)
+
+    with patch.object(db.session, 'execute', side_effect=spy_execute):
+        response = client.post(
+            '/api/auth/login',
+            data=json.dumps({'username': 'legacyuser', 'password': 'legacypass123'}),
+            content_type='application/json'
+        )
+
+    assert response.status_code == 200
+    assert len(stored_hashes) == 1 and stored_hashes[0].startswith('$argon2id$')
+    with app.app_context():
+        user = User.query.filter_by(username='legacyuser').first()
+        assert user.password_hash.startswith('$argon2id$')
 
 def test_login_invalid_credentials(client, test_user):
     """Test login with invalid credentials."""
@@ -129,6 +194,24 @@ def test_get_profile_unauthorized(client):
     assert response.status_code == 401
 
 
+def test_jwt_required_rejected_token_messages(app, client, test_user):
+    """Test the 401 message for missing, malformed and expired tokens on a resource endpoint."""
+    from datetime import timedelta
+    from flask_jwt_extended import create_access_token
+    with app.app_context():
+        expired = create_access_token(identity=test_user.id, expires_delta=timedelta(seconds=-1))
+
+    cases = [
+        ({}, 'Authorization header is missing'),
+        ({'Authorization': 'Bearer not-a-jwt'}, 'Invalid token'),
+        ({'Authorization': f'Bearer {expired}'}, 'Token has expired'),
+    ]
+    for headers, message in cases:
+        response = client.get('/api/threats', headers=headers)
+        assert response.status_code == 401
+        assert json.loads(response.data) == {'error': message}
+
+
 def test_refresh_token(client, test_user):
     """Test token refresh."""
     # First login to get refresh token
@@ -154,3 +237,100 @@ def test_refresh_token(client, test_user):
     data = json.loads(response.data)
     assert 'access_token' in data
 
+
+def test_github_auth_url_is_encoded(client):
+    """Test that the GitHub authorize URL encodes its query parameters."""
+    response = client.get('/api/auth/github')
+
+    assert response.status_code == 200
+    auth_url = json.loads(response.data)['auth_url']
+    assert auth_url.startswith('https://github.com/login/oauth/authorize?')
+    assert 'redirect_uri=http%3A%2F%2Flocalhost%2Fcallback' in auth_url
+    assert 'scope=user%3Aemail' in auth_url
+
+
+def test_github_callback_creates_user(client):
+    """Test GitHub OAuth callback using the pooled GitHub session."""
+    from unittest.mock import patch, MagicMock
+
+    def github_response(payload):
+        return MagicMock(ok=True, content=json.dumps(payload).encode())
+
+    with patch('app.api.auth._github_session') as session:
+        session.post.return_value = github_response({'access_token': 'gho_test'})
+        session.get.side_effect = lambda url, **kwargs: github_response(
+            [{'email': 'octo@example.com', 'primary': True}]
+            if url.endswith('/emails')
+            else {'id': 42, 'login': 'octocat', 'email': None}
+        )
+
+        response = client.get('/api/auth/github/callback?code=abc')
+
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert data['user']['username'] == 'octocat'
+    assert data['user']['email'] == 'octo@example.com'
+
+
+def test_list_api_tokens_paginated(client, admin_headers):
+    """Test API token listing with keyset pagination."""
+    for name in ('first', 'second', 'third'):
+        response = client.post(
+            '/api/auth/api-tokens',
+            data=json.dumps({'name': name}),
+            content_type='application/json',
+            headers=admin_headers
+        )
+        assert response.status_code == 201
+
+    response = client.get('/api/auth/api-tokens?limit=2', headers=admin_headers)
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert [t['name'] for t in data['tokens']] == ['third', 'second']
+    assert data['tokens'][0]['token'].endswith('...')
+    assert data['next_cursor'] is not None
+
+    response = client.get(
+        '/api/auth/api-tokens', query_string={'limit': 2, 'cursor': data['next_cursor']}, headers=admin_headers
+    )
+    data = json.loads(response.data)
+    assert [t['name'] for t in data['tokens']] == ['first']
+    assert data['next_cursor'] is None
+
+
+def test_list_api_tokens_pages_through_equal_timestamps(client, admin_headers, app):
+    """Test that tokens sharing created_at are neither skipped nor followed by an empty page."""
+    from datetime import datetime
+    from app import db
+    from app.core.serialization import dumps
+    from app.models.api_token import APIToken
+
+    for name in ('a', 'b', 'c', 'd'):
+        response = client.post(
+            '/api/auth/api-tokens',
+            data=json.dumps({'name': name}),
+            content_type='application/json',
+            headers=admin_headers
+        )
+        assert response.status_code == 201
+    with app.app_context():
+        db.session.execute(db.update(APIToken).values(created_at=datetime(2024, 1, 1)))
+        db.session.commit()
+        expected = {t.name: json.loads(dumps(t.to_dict())) for t in APIToken.query}
+
+    names = []
+    cursor = None
+    for _ in range(2):
+        query = {'limit': 2, 'cursor': cursor} if cursor else {'limit': 2}
+        data = json.loads(client.get('/api/auth/api-tokens', query_string=query, headers=admin_headers).data)
+        names += [t['name'] for t in data['tokens']]
+        assert all(token == expected[token['name']] for token in data['tokens'])
+        cursor = data['next_cursor']
+    assert names == ['d', 'c', 'b', 'a']
+    assert cursor is None
+
+
+def test_list_api_tokens_requires_admin(client, auth_headers):
+    """Test that non-admins cannot list API tokens."""
+    response = client.get('/api/auth/api-tokens', headers=auth_headers)
+    assert response.status_code == 403
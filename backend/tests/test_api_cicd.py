@@ -1,5 +1,6 @@
 """Test CI/CD API endpoints."""
 import json
+from datetime import datetime, timedelta
 from unittest.mock import patch, MagicMock
 from app.models.cicd import CICDRun
 
@@ -23,6 +24,26 @@ def test_get_cicd_runs(client, auth_headers, test_user, app):
     data = json.loads(response.data)
     assert 'runs' in data
     assert isinstance(data['runs'], list)
+    assert data['runs'][0]['commit_hash'] == 'abc123'
+    assert 'sast_results' not in data['runs'][0]
+
+
+def test_get_cicd_runs_filtered_by_branch_and_status(client, auth_headers, app):
+    """Test narrowing the run list by branch and status."""
+    with app.app_context():
+        from app import db
+        db.session.add_all([
+            CICDRun(commit_hash='a1', branch='main', status='Success'),
+            CICDRun(commit_hash='b1', branch='feature', status='Failed'),
+            CICDRun(commit_hash='b2', branch='feature', status='Success'),
+        ])
+        db.session.commit()
+
+    response = client.get('/api/cicd/runs?branch=feature', headers=auth_headers)
+    assert sorted(r['commit_hash'] for r in json.loads(response.data)['runs']) == ['b1', 'b2']
+
+    response = client.get('/api/cicd/runs?branch=feature&status=Success', headers=auth_headers)
+    assert [r['commit_hash'] for r in json.loads(response.data)['runs']] == ['b2']
 
 
 def test_get_cicd_run_detail(client, auth_headers, test_user, app):
@@ -47,16 +68,33 @@ def test_get_cicd_run_detail(client, auth_headers, test_user, app):
     assert data['run']['commit_hash'] == 'abc123'
 
 
-@patch('app.services.security_scanner.SecurityScanner')
-def test_trigger_cicd_run(mock_scanner, client, auth_headers):
-    """Test triggering a CI/CD run."""
-    # Mock scanner responses
-    mock_instance = MagicMock()
-    mock_instance.run_sast_scan.return_value = {'total': 0, 'critical': 0}
-    mock_instance.run_trivy_scan.return_value = {'total': 0, 'critical': 0}
-    mock_instance.run_dast_scan.return_value = {'total': 0, 'critical': 0}
-    mock_scanner.return_value = mock_instance
+def test_run_detail_and_latest_scan_pass_results_through(client, auth_headers, app):
+    """Test that raw JSONB results serialize exactly like CICDRun.to_dict()."""
+    from app.core.serialization import dumps
+    trivy = {'total': 1, 'critical': 1, 'vulnerabilities': [{'vulnerability_id': 'CVE-1', 'cvss': 9.8}]}
+    with app.app_context():
+        from app import db
+        run = CICDRun(commit_hash='raw123', branch='main', status='Success', trivy_results=trivy)
+        db.session.add(run)
+        db.session.commit()
+        run_id = run.id
+        expected = json.loads(dumps(run.to_dict()))
     
+    response = client.get(f'/api/cicd/runs/{run_id}', headers=auth_headers)
+    assert response.status_code == 200
+    assert json.loads(response.data)['run'] == expected
+
+    response = client.get('/api/cicd/scans/trivy/latest', headers=auth_headers)
+    data = json.loads(response.data)
+    assert data['run'] == expected
+    assert data['trivy_results'] == trivy
+
+    assert client.get('/api/cicd/runs/99999', headers=auth_headers).status_code == 404
+
+
+@patch('app.api.cicd.start_scan_pipeline')
+def test_trigger_cicd_run(mock_start, client, auth_headers):
+    """Test triggering a CI/CD run."""
     response = client.post(
         '/api/cicd/trigger',
         data=json.dumps({
@@ -67,9 +105,260 @@ def test_trigger_cicd_run(mock_scanner, client, auth_headers):
         headers=auth_headers
     )
     
-    assert response.status_code == 201
+    assert response.status_code == 202
     data = json.loads(response.data)
+    assert data['status'] == 'Running'
     assert 'run' in data
+    mock_start.assert_called_once_with(data['run_id'], 'test123')
+
+
+@patch('app.tasks.scans.SecurityScanner')
+def test_scan_pipeline_finalizes_run(mock_scanner, app):
+    """Test that the background scan pipeline stores results and sets the final status."""
+    from app import db
+    from app.tasks.scans import run_scan_pipeline
+
+    # Mock scanner responses
+    mock_instance = MagicMock()
+    mock_instance.run_sast_scan.return_value = {'total': 2, 'critical': 0}
+    mock_instance.run_trivy_scan.return_value = {'total': 3, 'critical': 1}
+    mock_instance.run_dast_scan.return_value = {'total': 1, 'critical': 0}
+    mock_scanner.return_value = mock_instance
+
+    with app.app_context():
+        run = CICDRun(commit_hash='test123', branch='main', status='Running')
+        db.session.add(run)
+        db.session.commit()
+        run_id = run.id
+
+    run_scan_pipeline(app, run_id, 'test123')
+
+    with app.app_context():
+        run = db.session.get(CICDRun, run_id)
+        assert run.status == 'Blocked'
+        assert run.critical_vulnerabilities == 1
+        assert run.total_vulnerabilities == 6
+        assert run.trivy_results == {'total': 3, 'critical': 1}
+        assert run.completed_at is not None
+
+
+@patch('app.tasks.scans.emit_scan_update')
+@patch('app.tasks.scans.SecurityScanner')
+def test_scan_pipeline_stores_results_in_completion_order(mock_scanner, mock_emit, app):
+    """Test that a fast scan's results are stored and emitted without waiting for a slower one."""
+    import eventlet
+    from app import db
+    from app.tasks.scans import run_scan_pipeline
+
+    def slow_sast(commit_hash):
+        eventlet.sleep(0.05)
+        return {'total': 1, 'critical': 0}
+
+    mock_instance = MagicMock()
+    mock_instance.run_sast_scan.side_effect = slow_sast
+    mock_instance.run_trivy_scan.return_value = {'total': 0, 'critical': 0}
+    mock_instance.run_dast_scan.return_value = {'total': 0, 'critical': 0}
+    mock_scanner.return_value = mock_instance
+
+    with app.app_context():
+        run = CICDRun(commit_hash='order123', branch='main', status='Running')
+        db.session.add(run)
+        db.session.commit()
+        run_id = run.id
+
+    run_scan_pipeline(app, run_id, 'order123')
+
+    events = [call.args[1] for call in mock_emit.call_args_list]
+    assert events == ['trivy_progress', 'dast_progress', 'sast_progress', 'completed']
+
+
+@patch('app.tasks.scans.SecurityScanner')
+def test_scan_pipeline_failure_kills_pending_scans(mock_scanner, app):
+    """Test that a scan raising fails the run and stops the scans still in flight."""
+    import eventlet
+    from app import db
+    from app.tasks.scans import run_scan_pipeline
+
+    finished = []
+
+    def slow_dast():
+        eventlet.sleep(0.05)
+        finished.append('dast')
+        return {'total': 0, 'critical': 0}
+
+    mock_instance = MagicMock()
+    mock_instance.run_sast_scan.side_effect = RuntimeError('scanner crashed')
+    mock_instance.run_trivy_scan.return_value = {'total': 0, 'critical': 0}
+    mock_instance.run_dast_scan.side_effect = slow_dast
+    mock_scanner.return_value = mock_instance
+
+    with app.app_context():
+        run = CICDRun(commit_hash='crash123', branch='main', status='Running')
+        db.session.add(run)
+        db.session.commit()
+        run_id = run.id
+
+    run_scan_pipeline(app, run_id, 'crash123')
+    eventlet.sleep(0.1)
+
+    assert finished == []
+    with app.app_context():
+        run = db.session.get(CICDRun, run_id)
+        assert run.status == 'Failed'
+        assert run.completed_at is not None
+
+
+def test_scan_pipeline_stores_failed_scan_results(app):
+    """Test that scanner HTTP failures are stored per scan instead of failing the whole run."""
+    import requests
+    from app import db
+    from app.tasks.scans import run_scan_pipeline
+
+    session = MagicMock()
+    session.get.side_effect = requests.ConnectionError('connection refused')
+    session.post.return_value = MagicMock(status_code=500)
+
+    with app.app_context():
+        run = CICDRun(commit_hash='fail123', branch='main', status='Running')
+        db.session.add(run)
+        db.session.commit()
+        run_id = run.id
+
+    with patch('app.services.security_scanner._scanner_session', session):
+        run_scan_pipeline(app, run_id, 'fail123')
+
+    with app.app_context():
+        run = db.session.get(CICDRun, run_id)
+        assert run.status == 'Success'
+        assert run.sast_results['error'] == 'connection refused'
+        assert run.trivy_results['error'] == 'Scan submission failed: 500'
+        assert run.dast_results['error'] == 'connection refused'
+
+
+def test_webhook_updates_run_totals(client, webhook_token, webhook_run, app):
+    """Test that webhook scan results update per-scan counts and run totals."""
+    from app import db
+
+    token, _ = webhook_token
+    run_id = webhook_run
+    headers = {'X-API-Token': token}
+    payloads = [
+        ('trivy', {'total': 4, 'critical': 1}),
+        ('sonarqube', {'total': 2, 'critical': 0}),
+        ('trivy', {'total': 3, 'critical': 0}),
+    ]
+    for scan_type, results in payloads:
+        response = client.post(f'/api/cicd/webhook/{scan_type}', headers=headers,
+                               json={'run_id': run_id, 'status': 'running', 'results': results})
+        assert response.status_code == 200
+
+    with app.app_context():
+        run = db.session.get(CICDRun, run_id)
+        assert (run.trivy_critical, run.trivy_total) == (0, 3)
+        assert (run.sast_critical, run.sast_total) == (0, 2)
+        assert run.critical_vulnerabilities == 0
+        assert run.total_vulnerabilities == 5
+
+
+def test_webhook_creates_run_in_one_commit(client, webhook_token, app):
+    """Test that a webhook for an unknown commit creates the run and its results in one commit, then announces it."""
+    from app import db
+
+    token, _ = webhook_token
+    calls = MagicMock()
+    with patch.object(db.session, 'commit', wraps=db.session.commit) as commit, \
+            patch('app.api.cicd.emit_dashboard_update') as emit:
+        calls.attach_mock(commit, 'commit')
+        calls.attach_mock(emit, 'emit')
+        response = client.post('/api/cicd/webhook/trivy', headers={'X-API-Token': token},
+                               json={'commit_hash': 'new123', 'status': 'running',
+                                     'results': {'total': 2, 'critical': 1}})
+    assert response.status_code == 200
+    assert commit.call_count == 1
+    # The new run is only announced once it is committed
+    assert [name for name, args, kwargs in calls.mock_calls] == ['commit', 'emit']
+    assert emit.call_args.args[0] == 'new_run'
+
+    with app.app_context():
+        run = db.session.get(CICDRun, json.loads(response.data)['run_id'])
+        assert run.commit_hash == 'new123'
+        assert (run.trivy_critical, run.trivy_total) == (1, 2)
+
+
+def test_webhook_token_use_is_buffered(client, webhook_token, webhook_run, app):
+    """Test that webhook auth defers the last_used_at write to one background flush."""
+    from app import db, socketio
+    from app.models.api_token import APIToken
+
+    token, token_id = webhook_token
+    run_id = webhook_run
+    with patch('app.core.token_usage._flush_scheduled', False), \
+            patch.object(socketio, 'start_background_task') as start:
+        for _ in range(2):
+            response = client.post('/api/cicd/webhook/trivy', headers={'X-API-Token': token},
+                                   json={'run_id': run_id, 'status': 'running', 'results': {'total': 0}})
+            assert response.status_code == 200
+        assert start.call_count == 1
+
+    with app.app_context():
+        assert db.session.get(APIToken, token_id).last_used_at is None
+
+    task, task_args = start.call_args.args[0], start.call_args.args[1:]
+    with patch.object(socketio, 'sleep'):
+        task(*task_args)
+
+    with app.app_context():
+        last_used_at = db.session.get(APIToken, token_id).last_used_at
+        assert last_used_at is not None
+        assert abs(datetime.utcnow() - last_used_at) < timedelta(minutes=1)
+
+
+def test_webhook_token_cached_until_revoked(client, webhook_token, webhook_run, admin_headers):
+    """Test that verified tokens skip the database until the token is revoked."""
+    from app.models.api_token import APIToken
+
+    token, token_id = webhook_token
+    run_id = webhook_run
+
+    def post_webhook(api_token):
+        return client.post('/api/cicd/webhook/trivy', headers={'X-API-Token': api_token},
+                           json={'run_id': run_id, 'status': 'running', 'results': {'total': 0}})
+
+    with patch.object(APIToken, 'verify_token', wraps=APIToken.verify_token) as verify:
+        assert post_webhook(token).status_code == 200
+        assert post_webhook(token).status_code == 200
+        assert verify.call_count == 1
+
+        # Unknown tokens are remembered as rejected for a few seconds
+        unknown = 'sent_' + 'x' * 43
+        assert post_webhook(unknown).status_code == 401
+        assert post_webhook(unknown).status_code == 401
+        assert verify.call_count == 2
+
+        # Malformed tokens are rejected before any lookup
+        response = post_webhook('sent_short')
+        assert response.status_code == 401
+        assert json.loads(response.data)['error'] == 'Invalid token format'
+        assert post_webhook('x' * len(token)).status_code == 401
+        assert verify.call_count == 2
+
+    response = client.post(f'/api/auth/api-tokens/{token_id}/revoke', headers=admin_headers)
+    assert response.status_code == 200
+    assert post_webhook(token).status_code == 401
+
+
+def test_webhook_token_header_forms(client, webhook_token, webhook_run):
+    """Test that the token is accepted as a Bearer token, X-API-Token or a bare Authorization value."""
+    token, _ = webhook_token
+    run_id = webhook_run
+    for headers in ({'Authorization': f'Bearer {token}'}, {'X-API-Token': token}, {'Authorization': token}):
+        response = client.post('/api/cicd/webhook/trivy', headers=headers,
+                               json={'run_id': run_id, 'status': 'running', 'results': {'total': 0}})
+        assert response.status_code == 200
+
+    response = client.post('/api/cicd/webhook/trivy', headers={'Authorization': f'Basic {token}'},
+                           json={'run_id': run_id, 'status': 'running', 'results': {'total': 0}})
+    assert response.status_code == 401
 
 
 def test_get_dashboard(client, auth_headers, test_user, app):
@@ -87,9 +376,37 @@ def test_get_dashboard(client, auth_headers, test_user, app):
     
     assert response.status_code == 200
     data = json.loads(response.data)
-    assert 'total_runs' in data
-    assert 'successful_runs' in data
-    assert 'failed_runs' in data
+    assert data['total_runs'] == 2
+    assert data['successful_runs'] == 1
+    assert data['failed_runs'] == 1
+    assert data['blocked_runs'] == 0
+    assert data['success_rate'] == 50.0
+    assert len(data['recent_runs']) == 2
+    assert len(data['vulnerability_trend']) == 2
+
+
+@patch('app.api.cicd.start_scan_pipeline')
+def test_dashboard_cache_invalidated_on_trigger(mock_start, client, auth_headers, app):
+    """Test that the cached dashboard is refreshed when a run is triggered."""
+    response = client.get('/api/cicd/dashboard', headers=auth_headers)
+    assert json.loads(response.data)['total_runs'] == 0
+
+    # Writes that bypass the API are not visible until the cache entry is dropped
+    with app.app_context():
+        from app import db
+        db.session.add(CICDRun(commit_hash='abc123', branch='main', status='Success'))
+        db.session.commit()
+    response = client.get('/api/cicd/dashboard', headers=auth_headers)
+    assert json.loads(response.data)['total_runs'] == 0
+
+    client.post(
+        '/api/cicd/trigger',
+        data=json.dumps({'commit_hash': 'def456'}),
+        content_type='application/json',
+        headers=auth_headers
+    )
+    response = client.get('/api/cicd/dashboard', headers=auth_headers)
+    assert json.loads(response.data)['total_runs'] == 2
 
 
 def test_cicd_endpoints_unauthorized(client):
@@ -100,3 +417,126 @@ def test_cicd_endpoints_unauthorized(client):
     response = client.post('/api/cicd/trigger', data=json.dumps({}), content_type='application/json')
     assert response.status_code == 401
 
+
+def test_get_run_sast_filtered_and_paginated(client, auth_headers, app):
+    """Test SonarQube issue filtering and pagination."""
+    issues = [
+        {'severity': 'MAJOR', 'type': 'BUG', 'message': 'Null pointer in Foo',
+         'component': 'src/a.py', 'rule': 'py:S1'},
+        {'severity': 'MINOR', 'type': 'CODE_SMELL', 'message': 'Rename foo', 'component': 'src/b.py', 'rule': 'py:S2'},
+        {'severity': 'MAJOR', 'type': 'BUG', 'message': 'Unused import', 'component': 'src/foo.py', 'rule': 'py:S3'},
+        {'severity': 'MAJOR', 'type': 'VULNERABILITY', 'message': 'SQL injection', 'component': 'src/c.py'},
+    ]
+    with app.app_context():
+        from app import db
+        run = CICDRun(
+            commit_hash='abc123',
+            branch='main',
+            status='Success',
+            sast_results={'total': 4, 'critical': 0, 'issues': issues}
+        )
+        db.session.add(run)
+        db.session.commit()
+        run_id = run.id
+
+    response = client.get(
+        f'/api/cicd/runs/{run_id}/sast',
+        query_string={'severity': 'MAJOR', 'search': 'FOO', 'per_page': 1},
+        headers=auth_headers
+    )
+
+    assert response.status_code == 200
+    results = json.loads(response.data)['results']
+    assert results['total'] == 4
+    assert results['issues'] == [issues[0]]
+    assert results['pagination'] == {'page': 1, 'per_page': 1, 'total': 2, 'pages': 2}
+
+    response = client.get(
+        f'/api/cicd/runs/{run_id}/sast',
+        query_string={'severity': 'MAJOR', 'search': 'FOO', 'per_page': 1, 'page': 3},
+        headers=auth_headers
+    )
+    results = json.loads(response.data)['results']
+    assert results['issues'] == []
+    assert results['pagination']['total'] == 2
+
+
+def test_get_run_dast_risk_and_cwe_filter(client, auth_headers, app):
+    """Test ZAP alert filtering by risk list and exact CWE, whether stored as a string or a number."""
+    alerts = [
+        {'name': 'XSS', 'risk': 'High', 'confidence': 'Medium', 'cweid': '79'},
+        {'name': 'Cookie flag', 'risk': 'Low', 'confidence': 'High', 'cweid': '1004'},
+        {'name': 'SQLi', 'risk': 'High', 'confidence': 'High', 'cweid': '89'},
+        {'name': 'Banner', 'risk': 'Informational', 'confidence': 'Low', 'cweid': '200'},
+        {'name': 'Blind SQLi', 'risk': 'Medium', 'confidence': 'Low', 'cweid': 89},
+    ]
+    with app.app_context():
+        from app import db
+        run = CICDRun(commit_hash='abc123', branch='main', status='Success', dast_results={'alerts': alerts})
+        db.session.add(run)
+        db.session.commit()
+        run_id = run.id
+
+    response = client.get(
+        f'/api/cicd/runs/{run_id}/dast',
+        query_string=[('risk', 'High'), ('risk', 'Low')],
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+    assert [a['name'] for a in json.loads(response.data)['results']['alerts']] == ['XSS', 'Cookie flag', 'SQLi']
+
+    response = client.get(f'/api/cicd/runs/{run_id}/dast?cwe=89', headers=auth_headers)
+    assert [a['name'] for a in json.loads(response.data)['results']['alerts']] == ['SQLi', 'Blind SQLi']
+
+
+def test_get_run_trivy_cvss_filter(client, auth_headers, app):
+    """Test Trivy vulnerability filtering by minimum CVSS score."""
+    vulns = [
+        {'vulnerability_id': 'CVE-1', 'pkg_name': 'openssl', 'cvss': {'v3': {'score': 9.8}}},
+        {'vulnerability_id': 'CVE-2', 'pkg_name': 'zlib', 'cvss': {'v2': {'score': 5.0}}},
+        {'vulnerability_id': 'CVE-3', 'pkg_name': 'curl'},
+    ]
+    with app.app_context():
+        from app import db
+        run = CICDRun(commit_hash='abc123', branch='main', status='Success', trivy_results={'vulnerabilities': vulns})
+        db.session.add(run)
+        db.session.commit()
+        run_id = run.id
+
+    response = client.get(f'/api/cicd/runs/{run_id}/trivy?cvss_min=5', headers=auth_headers)
+
+    assert response.status_code == 200
+    results = json.loads(response.data)['results']
+    assert [v['vulnerability_id'] for v in results['vulnerabilities']] == ['CVE-1', 'CVE-2']
+
+    response = client.get(f'/api/cicd/runs/{run_id}/dast', headers=auth_headers)
+    assert response.status_code == 404
+
+    response = client.get('/api/cicd/runs/999999/trivy', headers=auth_headers)
+    assert response.status_code == 404
+
+
+def test_get_run_trivy_multi_term_search(client, auth_headers, app):
+    """Test that repeated search terms match items containing any of them."""
+    vulns = [
+        {'vulnerability_id': 'CVE-1', 'pkg_name': 'openssl'},
+        {'vulnerability_id': 'CVE-2', 'pkg_name': 'zlib'},
+        {'vulnerability_id': 'CVE-3', 'pkg_name': 'libstdc++'},
+        {'vulnerability_id': 'CVE-4', 'pkg_name': 'curl'},
+    ]
+    with app.app_context():
+        from app import db
+        run = CICDRun(commit_hash='abc123', branch='main', status='Success', trivy_results={'vulnerabilities': vulns})
+        db.session.add(run)
+        db.session.commit()
+        run_id = run.id
+
+    response = client.get(
+        f'/api/cicd/runs/{run_id}/trivy',
+        query_string=[('search', 'OpenSSL'), ('search', 'c++'), ('search', '')],
+        headers=auth_headers
+    )
+
+    assert response.status_code == 200
+    results = json.loads(response.data)['results']
+    assert [v['vulnerability_id'] for v in results['vulnerabilities']] == ['CVE-1', 'CVE-3']
@@ -1,6 +1,6 @@
 """Test requirements management API endpoints."""
 import json
-from app.models.requirement import Requirement
+from app.models.requirement import Requirement, SecurityControl
 
 
 def test_create_requirement(client, auth_headers):
@@ -28,6 +28,11 @@ def test_create_requirement(client, auth_headers):
     data = json.loads(response.data)
     assert 'requirement' in data
     assert data['requirement']['title'] == 'Secure Authentication'
+    assert data['requirement']['created_at'] is not None
+    controls = data['requirement']['controls']
+    assert [c['name'] for c in controls] == ['MFA']
+    assert controls[0]['id'] is not None
+    assert controls[0]['requirement_id'] == data['requirement']['id']
 
 
 def test_create_requirement_missing_controls(client, auth_headers):
@@ -164,18 +169,26 @@ def test_get_compliance_dashboard(client, admin_headers, test_user, app):
         req2 = Requirement(
             title='Req 2',
             security_controls=['Control 2'],
-            created_by=test_user.id
+            created_by=test_user.id,
+            owasp_asvs_level='Level 2',
+            status='Approved'
         )
         db.session.add(req1)
         db.session.add(req2)
+        db.session.flush()
+        db.session.add(SecurityControl(name='Control 1', requirement_id=req1.id))
+        db.session.add(SecurityControl(name='Control 1b', requirement_id=req1.id))
         db.session.commit()
     
     response = client.get('/api/requirements/compliance', headers=admin_headers)
     
     assert response.status_code == 200
     data = json.loads(response.data)
-    assert 'total_requirements' in data
-    assert 'compliance_rate' in data
+    assert data['total_requirements'] == 2
+    assert data['requirements_with_controls'] == 1
+    assert data['compliance_rate'] == 50.0
+    assert data['owasp_asvs_distribution'] == {'Level 1': 0, 'Level 2': 1, 'Level 3': 0, 'Not Specified': 1}
+    assert data['status_distribution'] == {'Draft': 1, 'Approved': 1}
 
 
 def test_get_compliance_dashboard_non_admin(client, auth_headers):
@@ -184,3 +197,76 @@ def test_get_compliance_dashboard_non_admin(client, auth_headers):
     
     assert response.status_code == 403
 
+
+def test_export_requirements_csv(client, auth_headers, test_user, app):
+    """Test streaming the requirements export as CSV."""
+    with app.app_context():
+        from app import db
+        req = Requirement(
+            title='Req, with comma',
+            security_controls=['Control 1'],
+            created_by=test_user.id
+        )
+        db.session.add(req)
+        db.session.flush()
+        db.session.add(SecurityControl(name='Control 1', requirement_id=req.id))
+        db.session.add(SecurityControl(name='Control 2', requirement_id=req.id))
+        db.session.commit()
+
+    response = client.get('/api/requirements/export?format=csv', headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.mimetype == 'text/csv'
+    assert 'attachment' in response.headers['Content-Disposition']
+    lines = response.get_data(as_text=True).splitlines()
+    assert lines[0].startswith('ID,Title,Description')
+    assert len(lines) == 2
+    assert '"Req, with comma"' in lines[1]
+    assert '"Control 1, Control 2"' in lines[1]
+
+
+def test_update_requirement_requires_owner_or_admin(client, auth_headers, admin_headers, admin_user, app):
+    """Test that only the owner or an admin can update a requirement."""
+    with app.app_context():
+        from app import db
+        req = Requirement(
+            title='Admin Req',
+            security_controls=['Control 1'],
+            created_by=admin_user.id
+        )
+        db.session.add(req)
+        db.session.commit()
+        req_id = req.id
+
+    response = client.put(f'/api/requirements/{req_id}', headers=auth_headers, json={'title': 'Changed'})
+    assert response.status_code == 403
+
+    response = client.put(f'/api/requirements/{req_id}', headers=admin_headers, json={'title': 'Changed'})
+    assert response.status_code == 200
+    assert json.loads(response.data)['requirement']['title'] == 'Changed'
+
+    response = client.put('/api/requirements/99999', headers=admin_headers, json={'title': 'Changed'})
+    assert response.status_code == 404
+
+
+def test_security_controls_for_requirement(client, auth_headers, test_user, app):
+    """Test listing and adding controls, and the 404 for an unknown requirement."""
+    with app.app_context():
+        from app import db
+        req = Requirement(title='Req', security_controls=['MFA'], created_by=test_user.id)
+        db.session.add(req)
+        db.session.commit()
+        req_id = req.id
+
+    response = client.get(f'/api/requirements/{req_id}/controls', headers=auth_headers)
+    assert response.status_code == 200
+    assert json.loads(response.data)['controls'] == []
+
+    response = client.post(f'/api/requirements/{req_id}/controls', headers=auth_headers, json={'name': 'MFA'})
+    assert response.status_code == 201
+
+    response = client.get(f'/api/requirements/{req_id}', headers=auth_headers)
+    assert [c['name'] for c in json.loads(response.data)['requirement']['controls']] == ['MFA']
+
+    assert client.get('/api/requirements/99999/controls', headers=auth_headers).status_code == 404
+    assert client.post('/api/requirements/99999/controls', headers=auth_headers, json={'name': 'x'}).status_code == 404
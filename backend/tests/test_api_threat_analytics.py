@@ -0,0 +1,109 @@
+"""Test threat analytics API endpoint."""
+import json
+from datetime import datetime, timedelta
+from app.models.threat import Threat
+from app.models.threat_vulnerability import ThreatVulnerability
+
+
+def _dread(score):
+    return {
+        'damage': score,
+        'reproducibility': score,
+        'exploitability': score,
+        'affected_users': score,
+        'discoverability': score,
+    }
+
+
+def test_threat_analytics(client, auth_headers, app):
+    """Test threat analytics aggregates."""
+    with app.app_context():
+        from app import db
+        t1 = Threat(asset='DB', flow='f', stride_categories=['Spoofing', 'Tampering'],
+                    dread_score=_dread(8), risk_level='High')
+        t2 = Threat(asset='DB', flow='f', stride_categories=['Tampering'],
+                    dread_score=_dread(4), risk_level='Medium')
+        t3 = Threat(asset='API', flow='f', stride_categories=[],
+                    dread_score=_dread(6), risk_level='Medium')
+        db.session.add_all([t1, t2, t3])
+        db.session.flush()
+        db.session.add_all([
+            ThreatVulnerability(threat_id=t1.id, vulnerability_type='trivy', vulnerability_id='CVE-1',
+                                status='resolved'),
+            ThreatVulnerability(threat_id=t1.id, vulnerability_type='zap', vulnerability_id='1'),
+            ThreatVulnerability(threat_id=t2.id, vulnerability_type='trivy', vulnerability_id='CVE-2'),
+            ThreatVulnerability(threat_id=t2.id, vulnerability_type='trivy', vulnerability_id='CVE-3',
+                                status='resolved'),
+        ])
+        db.session.commit()
+
+    response = client.get('/api/threats/analytics', headers=auth_headers)
+
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert data['summary'] == {
+        'total_threats': 3,
+        'threats_with_vulnerabilities': 2,
+        'theoretical_threats': 1,
+        'resolution_rate': 50.0,
+    }
+    assert data['risk_levels'] == {'High': 1, 'Medium': 2}
+    assert data['stride_distribution'] == {'Spoofing': 1, 'Tampering': 2}
+    assert data['most_vulnerable_assets'] == [{'asset': 'DB', 'count': 2}, {'asset': 'API', 'count': 1}]
+    assert data['average_dread_scores']['damage'] == 6.0
+    assert sum(data['threat_trends'].values()) == 3
+    assert data['vulnerability_types'] == {'trivy': 3, 'zap': 1}
+
+
+def test_threat_analytics_trend_window(client, auth_headers, app):
+    """Test that threat trends bucket the last 30 days by day."""
+    now = datetime.utcnow()
+    with app.app_context():
+        from app import db
+        for created_at in (now, now - timedelta(days=2), now - timedelta(days=2), now - timedelta(days=40)):
+            db.session.add(Threat(asset='DB', flow='f', stride_categories=[], dread_score=_dread(5),
+                                  risk_level='Medium', created_at=created_at))
+        db.session.commit()
+
+    response = client.get('/api/threats/analytics', headers=auth_headers)
+
+    data = json.loads(response.data)
+    assert data['threat_trends'] == {
+        now.date().isoformat(): 1,
+        (now - timedelta(days=2)).date().isoformat(): 2,
+    }
+
+
+def test_threat_analytics_empty(client, auth_headers):
+    """Test threat analytics with no data."""
+    response = client.get('/api/threats/analytics', headers=auth_headers)
+
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert data['summary']['total_threats'] == 0
+    assert data['summary']['resolution_rate'] == 0
+    assert data['stride_distribution'] == {}
+    assert data['threat_trends'] == {}
+
+
+def test_threat_analytics_cache_invalidated_on_analyze(client, auth_headers, app):
+    """Test that cached analytics are refreshed when a threat is created."""
+    response = client.get('/api/threats/analytics', headers=auth_headers)
+    assert json.loads(response.data)['summary']['total_threats'] == 0
+
+    # Writes that bypass the API are not visible until the cache entry is dropped
+    with app.app_context():
+        from app import db
+        db.session.add(Threat(asset='DB', flow='f', stride_categories=[], dread_score=_dread(5), risk_level='Medium'))
+        db.session.commit()
+    response = client.get('/api/threats/analytics', headers=auth_headers)
+    assert json.loads(response.data)['summary']['total_threats'] == 0
+
+    client.post(
+        '/api/threats/analyze',
+        data=json.dumps({'asset': 'API', 'flow': 'User submits login form', 'auto_score': True}),
+        content_type='application/json',
+        headers=auth_headers
+    )
+    response = client.get('/api/threats/analytics', headers=auth_headers)
+    assert json.loads(response.data)['summary']['total_threats'] == 2
@@ -1,5 +1,6 @@
 """Test threat modeling API endpoints."""
 import json
+from app.core.serialization import dumps
 from app.models.threat import Threat
 
 
@@ -83,13 +84,44 @@ def test_get_threats(client, auth_headers, test_user, app):
         from app import db
         db.session.add(threat)
         db.session.commit()
+        expected = json.loads(dumps(threat.to_dict()))
     
     response = client.get('/api/threats', headers=auth_headers)
     
     assert response.status_code == 200
     data = json.loads(response.data)
     assert 'threats' in data
-    assert isinstance(data['threats'], list)
+    assert data['threats'] == [expected]
+
+
+def test_get_threats_keyset_pages(client, auth_headers, app):
+    """Test walking the threat list page by page with next_cursor."""
+    from datetime import datetime
+    dread = {'damage': 5, 'reproducibility': 5, 'exploitability': 5, 'affected_users': 5, 'discoverability': 5}
+    created_at = datetime(2026, 1, 1, 12, 0)
+    with app.app_context():
+        from app import db
+        # Equal timestamps make the id tiebreaker decide the order
+        threats = [Threat(asset=f'Asset {i}', flow='f', stride_categories=[], dread_score=dread,
+                          risk_level='Medium', created_at=created_at) for i in range(5)]
+        db.session.add_all(threats)
+        db.session.commit()
+        expected_ids = sorted((t.id for t in threats), reverse=True)
+
+    seen_ids, cursor = [], None
+    for _ in range(3):
+        query_string = {'limit': 2, **({'cursor': cursor} if cursor else {})}
+        response = client.get('/api/threats', query_string=query_string, headers=auth_headers)
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        seen_ids += [t['id'] for t in data['threats']]
+        cursor = data['next_cursor']
+
+    assert seen_ids == expected_ids
+    assert cursor is None
+
+    response = client.get('/api/threats?cursor=bogus', headers=auth_headers)
+    assert response.status_code == 400
 
 
 def test_get_threat_detail(client, auth_headers, test_user, app):
@@ -160,3 +192,120 @@ def test_analyze_threat_unauthorized(client):
     
     assert response.status_code == 401
 
+
+def test_get_threats_with_vulnerabilities(client, auth_headers, app):
+    """Test listing only threats that have linked vulnerabilities."""
+    from datetime import datetime
+    from app.models.threat_vulnerability import ThreatVulnerability
+    dread = {'damage': 5, 'reproducibility': 5, 'exploitability': 5, 'affected_users': 5, 'discoverability': 5}
+    with app.app_context():
+        from app import db
+        linked = Threat(asset='DB', flow='f', stride_categories=['Tampering'], dread_score=dread, risk_level='Medium')
+        unlinked = Threat(asset='API', flow='f', stride_categories=[], dread_score=dread, risk_level='Low')
+        db.session.add_all([linked, unlinked])
+        db.session.flush()
+        db.session.add_all([
+            ThreatVulnerability(threat_id=linked.id, vulnerability_type='trivy', vulnerability_id='CVE-1'),
+            ThreatVulnerability(threat_id=linked.id, vulnerability_type='zap', vulnerability_id='10202'),
+        ])
+        db.session.commit()
+        linked_id = linked.id
+        expected = json.loads(dumps(linked.to_dict()))
+
+    response = client.get('/api/threats/with-vulnerabilities', headers=auth_headers)
+
+    assert response.status_code == 200
+    threats = json.loads(response.data)['threats']
+    assert [t['id'] for t in threats] == [linked_id]
+    assert set(threats[0]) == set(expected) | {'vulnerabilities', 'vulnerability_count'}
+    assert threats[0]['stride_categories'] == expected['stride_categories']
+    assert datetime.fromisoformat(threats[0]['created_at']) == datetime.fromisoformat(expected['created_at'])
+    assert threats[0]['vulnerability_count'] == 2
+    assert [v['vulnerability_id'] for v in threats[0]['vulnerabilities']] == ['CVE-1', '10202']
+
+
+def test_get_threat_vulnerabilities_matches_to_dict(client, auth_headers, app):
+    """Test that the column-based listing serializes links exactly like to_dict()."""
+    from app.models.threat_vulnerability import ThreatVulnerability
+    dread = {'damage': 5, 'reproducibility': 5, 'exploitability': 5, 'affected_users': 5, 'discoverability': 5}
+    with app.app_context():
+        from app import db
+        threat = Threat(asset='DB', flow='f', stride_categories=[], dread_score=dread, risk_level='Medium')
+        db.session.add(threat)
+        db.session.flush()
+        link = ThreatVulnerability(threat_id=threat.id, vulnerability_type='trivy', vulnerability_id='CVE-1',
+                                   severity='high', vulnerability_data={'pkg_name': 'openssl'})
+        db.session.add(link)
+        db.session.commit()
+        threat_id = threat.id
+        expected = json.loads(dumps(link.to_dict()))
+
+    response = client.get(f'/api/threats/{threat_id}/vulnerabilities', headers=auth_headers)
+
+    assert response.status_code == 200
+    assert json.loads(response.data)['vulnerabilities'] == [expected]
+
+
+def test_link_vulnerability_rejects_duplicate(client, auth_headers, app):
+    """Test linking a vulnerability, then linking the same one again."""
+    dread = {'damage': 5, 'reproducibility': 5, 'exploitability': 5, 'affected_users': 5, 'discoverability': 5}
+    with app.app_context():
+        from app import db
+        threat = Threat(asset='DB', flow='f', stride_categories=[], dread_score=dread, risk_level='Medium')
+        db.session.add(threat)
+        db.session.commit()
+        threat_id = threat.id
+
+    payload = {'vulnerability_type': 'trivy', 'vulnerability_id': 'CVE-1', 'severity': 'high'}
+    response = client.post(f'/api/threats/{threat_id}/link-vulnerability', json=payload, headers=auth_headers)
+
+    assert response.status_code == 201
+    vulnerability = json.loads(response.data)['vulnerability']
+    assert vulnerability['threat_id'] == threat_id
+    assert vulnerability['status'] == 'linked'
+    assert vulnerability['created_at'] is not None
+
+    response = client.post(f'/api/threats/{threat_id}/link-vulnerability', json=payload, headers=auth_headers)
+    assert response.status_code == 400
+
+    response = client.post('/api/threats/99999/link-vulnerability', json=payload, headers=auth_headers)
+    assert response.status_code == 404
+
+
+def test_get_similar_threats(client, auth_headers, app):
+    """Test that similar threats are ranked with closer DREAD scores first."""
+    def dread(score):
+        return {'damage': score, 'reproducibility': score, 'exploitability': score,
+                'affected_users': score, 'discoverability': score}
+    with app.app_context():
+        from app import db
+        target = Threat(asset='DB', flow='f', stride_categories=['Tampering'], dread_score=dread(8), risk_level='High')
+        close = Threat(asset='DB', flow='f', stride_categories=['Tampering'], dread_score=dread(7), risk_level='High')
+        far = Threat(asset='DB', flow='f', stride_categories=['Tampering'], dread_score=dread(2), risk_level='High')
+        db.session.add_all([target, close, far])
+        db.session.commit()
+        target_id, close_id, far_id = target.id, close.id, far.id
+
+    response = client.get(f'/api/threats/{target_id}/similar', headers=auth_headers)
+
+    assert response.status_code == 200
+    similar = json.loads(response.data)['similar_threats']
+    assert [s['threat']['id'] for s in similar] == [close_id, far_id]
+    assert similar[0]['similarity_score'] > similar[1]['similarity_score']
+
+
+def test_get_threat_templates_matches_to_dict(client, auth_headers, app):
+    """Test that the column-based template listing serializes like to_dict() and filters by category."""
+    from app.models.threat_template import ThreatTemplate
+    with app.app_context():
+        from app import db
+        api = ThreatTemplate(name='API Abuse', category='api', flow_template='Client calls API',
+                             stride_categories=['Spoofing'], default_dread_scores={'damage': 5})
+        db.session.add_all([api, ThreatTemplate(name='SQL Injection', category='database', flow_template='Query')])
+        db.session.commit()
+        expected = json.loads(dumps(api.to_dict()))
+
+    response = client.get('/api/threats/templates?category=api', headers=auth_headers)
+
+    assert response.status_code == 200
+    assert json.loads(response.data)['templates'] == [expected]
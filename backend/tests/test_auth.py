@@ -1,6 +1,8 @@
 """Test user model and authentication utilities."""
 from app import db
-from app.core.security import verify_password
+from app.core.security import (
+    verify_password, hash_password, password_needs_rehash, sanitize_input, encode_output, DUMMY_PASSWORD_HASH
+)
 
 
 def test_user_creation(app, test_user):
@@ -20,3 +22,70 @@ def test_user_password_hash(app, test_user):
         user = db.session.merge(test_user)
         assert verify_password('testpass123', user.password_hash)
         assert not verify_password('wrongpass', user.password_hash)
+
+
+def test_verify_password_rejects_malformed_hash():
+    """Test that malformed hashes fail without reaching bcrypt."""
+    assert not verify_password('testpass123', None)
+    assert not verify_password('testpass123', '')
+    assert not verify_password('testpass123', 'plaintext-password')
+    assert not verify_password('testpass123', '$1$' + 'a' * 57)
+
+
+def test_password_needs_rehash_below_configured_cost():
+    """Test that argon2 hashes weaker than the configured cost are flagged for upgrade."""
+    from argon2 import PasswordHasher
+    weak_hash = PasswordHasher(time_cost=1, memory_cost=8 * 1024, parallelism=1).hash('testpass123')
+
+    assert verify_password('testpass123', weak_hash)
+    assert password_needs_rehash(weak_hash)
+    assert not password_needs_rehash(hash_password('testpass123'))
+    assert not password_needs_rehash(DUMMY_PASSWORD_HASH)
+
+
+def test_sanitize_input_and_encode_output():
+    """Test stripping and HTML-encoding of dangerous characters."""
+    assert sanitize_input('  <b>"Tom\'s" & co\x00</b> ') == 'bToms  co/b'
+    assert sanitize_input(42) == '42'
+    assert encode_output('<a href="x">Tom\'s & co</a>') == '&lt;a href=&quot;x&quot;&gt;Tom&#x27;s &amp; co&lt;/a&gt;'
+    assert encode_output('&lt;') == '&amp;lt;'
+
+
+def test_jwt_payload_cache(app, test_user):
+    """Test verified JWT payloads are cached by token digest and expire with the token."""
+    from flask_jwt_extended import create_access_token, decode_token
+    from app import jwt
+
+    with app.app_context():
+        token = create_access_token(identity=test_user.id)
+        first = decode_token(token)
+        assert decode_token(token) == first
+        assert len(jwt._payload_cache) == 1
+        assert token.encode() not in jwt._payload_cache
+
+        # A cached entry past its expiry must not be served
+        key = next(iter(jwt._payload_cache))
+        jwt._payload_cache[key] = (first, 0)
+        assert decode_token(token)["sub"] == first["sub"]
+
+
+def test_user_auth_invalidated_when_role_or_status_changes(app, test_user):
+    """Test cached authorization facts are dropped once a role or is_active change commits."""
+    from app import db
+    from app.core.security import get_user_auth, is_admin
+    from app.models.user import User
+
+    with app.app_context():
+        assert get_user_auth(test_user.id).role == 'Developer'
+
+        user = db.session.get(User, test_user.id)
+        user.role = 'Admin'
+        db.session.flush()
+        # Not committed yet, so the cached facts stay in place
+        assert get_user_auth(test_user.id).role == 'Developer'
+        db.session.commit()
+        assert is_admin(test_user.id)
+
+        user.is_active = False
+        db.session.commit()
+        assert not get_user_auth(test_user.id).is_active
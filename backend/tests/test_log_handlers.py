@@ -0,0 +1,26 @@
+"""Test custom logging handlers."""
+import logging
+from app.core.log_handlers import FastRotatingFileHandler
+
+
+def test_fast_rotating_file_handler_rolls_over(tmp_path):
+    """Test that the handler rotates once tracked size reaches maxBytes."""
+    log_file = tmp_path / 'app.log'
+    log_file.write_text('x' * 50)
+
+    handler = FastRotatingFileHandler(str(log_file), maxBytes=100, backupCount=1)
+    assert handler._bytes_written == 50
+
+    logger = logging.getLogger('test_fast_rotating_file_handler')
+    logger.propagate = False
+    logger.addHandler(handler)
+    try:
+        logger.warning('a' * 30)
+        assert not (tmp_path / 'app.log.1').exists()
+        logger.warning('b' * 30)
+        assert (tmp_path / 'app.log.1').exists()
+        assert log_file.read_text() == 'b' * 30 + '\n'
+        assert handler._bytes_written == 31
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
@@ -6,6 +6,7 @@ from app.models.requirement import Requirement
 from app.models.cicd import CICDRun
 from app.models.api_token import APIToken
 from app.core.security import hash_password
+from app.core.serialization import dumps
 
 
 def test_user_model(app, db_session):
@@ -66,6 +67,30 @@ def test_threat_model(app, db_session):
     assert len(threat.stride_categories) == 2
 
 
+def test_threat_dread_columns(app, db_session):
+    """Test that DREAD factor columns follow dread_score assignments."""
+    threat = Threat(
+        asset='Test Asset',
+        flow='Test flow',
+        stride_categories=[],
+        dread_score={
+            'damage': 9, 'reproducibility': 8, 'exploitability': 7, 'affected_users': 10, 'discoverability': 6
+        },
+        risk_level='High'
+    )
+    db_session.add(threat)
+    db_session.commit()
+
+    assert (threat.damage, threat.discoverability) == (9, 6)
+    assert float(threat.total_score) == 8.0
+
+    threat.dread_score = {'damage': 2}
+    db_session.commit()
+    assert threat.damage == 2
+    assert threat.reproducibility is None
+    assert threat.total_score is None
+
+
 def test_threat_to_dict(app, db_session):
     """Test Threat to_dict method."""
     threat = Threat(
@@ -82,6 +107,8 @@ def test_threat_to_dict(app, db_session):
     assert 'id' in threat_dict
     assert 'asset' in threat_dict
     assert 'risk_level' in threat_dict
+    # Datetimes are handed to orjson as-is and encode exactly like isoformat()
+    assert dumps(threat_dict['created_at']) == f'"{threat.created_at.isoformat()}"'.encode()
 
 
 def test_requirement_model(app, db_session, test_user):
@@ -165,7 +192,7 @@ def test_api_token_model(app, db_session, admin_user):
         user = db.session.merge(admin_user)
         token = APIToken(
             name='Test Token',
-            token_hash='hashed_token_value',
+            token_hash=b'\x01' * 32,
             token_prefix='sent_abc123',
             created_by=user.id,
             scopes=['webhook:write']
@@ -186,7 +213,7 @@ def test_api_token_to_dict(app, db_session, admin_user):
         user = db.session.merge(admin_user)
         token = APIToken(
             name='Test Token',
-            token_hash='hashed_token',
+            token_hash=b'\x02' * 32,
             token_prefix='sent_test',
             created_by=user.id,
             scopes='webhook:write,webhook:read'  # scopes is NOT NULL
@@ -200,3 +227,32 @@ def test_api_token_to_dict(app, db_session, admin_user):
         assert 'token_hash' not in token_dict  # Should not expose hash
         assert 'is_active' in token_dict
 
+
+def test_api_token_scopes_mask():
+    """Test that scopes_mask follows the scopes it is packed from."""
+    from app.models.api_token import Scope
+    token = APIToken(scopes='webhook:read')
+    assert token.scopes_mask == Scope.WEBHOOK_READ
+    token.scopes = 'webhook:write, webhook:read'
+    assert token.scopes_mask == Scope.WEBHOOK_ALL
+    assert APIToken(scopes=['webhook:*']).scopes_mask == Scope.WEBHOOK_ALL
+    assert APIToken(scopes='unknown').scopes_mask == 0
+
+
+def test_api_token_verify(app, db_session, admin_user):
+    """Test APIToken verification by prefix and digest."""
+    with app.app_context():
+        user = db.session.merge(admin_user)
+        token, token_hash, token_prefix = APIToken.generate_token()
+        db_session.add(APIToken(
+            name='Verify Token',
+            token_hash=token_hash,
+            token_prefix=token_prefix,
+            created_by=user.id,
+            scopes='webhook:write'
+        ))
+        db_session.commit()
+
+        assert APIToken.verify_token(token).id == db_session.scalar(db.select(APIToken.id))
+        assert APIToken.verify_token(token[:-1] + ('A' if token[-1] != 'A' else 'B')) is None
+        assert APIToken.verify_token('sent_unknown') is None
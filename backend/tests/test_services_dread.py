@@ -1,5 +1,5 @@
 """Test DREAD scoring service."""
-from app.services.dread_scorer import DREADScorer
+from app.services.dread_scorer import DREADScorer, risk_level_from_score
 
 
 def test_suggest_dread_scores():
@@ -102,3 +102,24 @@ def test_dread_score_confidence():
     for conf_value in confidence.values():
         assert 0 <= conf_value <= 1
 
+
+def test_risk_level_from_score():
+    """Test risk level thresholds, which are exclusive at 4 and 7."""
+    assert risk_level_from_score(0) == 'Low'
+    assert risk_level_from_score(4.0) == 'Low'
+    assert risk_level_from_score(4.2) == 'Medium'
+    assert risk_level_from_score(7.0) == 'Medium'
+    assert risk_level_from_score(7.2) == 'High'
+    assert risk_level_from_score(10) == 'High'
+
+
+def test_adjust_scores_by_context_keywords():
+    """Test that critical and external keywords each raise their two factors once."""
+    scorer = DREADScorer()
+    base = {'damage': 5, 'reproducibility': 5, 'exploitability': 5, 'affected_users': 5, 'discoverability': 5}
+
+    adjusted = scorer._adjust_scores_by_context(base, 'payment service public http api for credit card data', [])
+    assert adjusted == {'damage': 6, 'reproducibility': 5, 'exploitability': 6, 'affected_users': 6,
+                        'discoverability': 6}
+
+    assert scorer._adjust_scores_by_context(base, 'cache stores session keys', []) == base
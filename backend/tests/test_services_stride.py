@@ -98,3 +98,100 @@ def test_get_mitigation_recommendations_low_risk():
     
     assert isinstance(mitigation, str)
 
+
+def test_enhanced_mitigations_high_risk_does_not_leak():
+    """Test that High-risk priority promotion does not change later lower-risk results."""
+    from app.services.enhanced_mitigations import EnhancedMitigationEngine
+
+    engine = EnhancedMitigationEngine()
+    high = engine.get_mitigations(['Spoofing'], 'High', component_types=['database'])
+    medium = engine.get_mitigations(['Spoofing'], 'Medium', component_types=['database'])
+
+    priorities = {m['text']: m['priority'] for m in high['mitigations']}
+    assert priorities['Use digital signatures for critical communications'] == 'high'
+    assert priorities['Enable database encryption at rest'] == 'high'
+    priorities = {m['text']: m['priority'] for m in medium['mitigations']}
+    assert priorities['Use digital signatures for critical communications'] == 'medium'
+    assert priorities['Enable database encryption at rest'] == 'medium'
+    assert medium['medium_priority_count'] == 3
+
+
+def test_enhanced_mitigation_texts_are_unique():
+    """Test that mitigation texts are unique, which deduplication by record relies on."""
+    from app.services import enhanced_mitigations
+
+    tables = (
+        enhanced_mitigations._PATTERN_MITIGATIONS,
+        enhanced_mitigations._STRIDE_MITIGATIONS,
+        enhanced_mitigations._COMPONENT_MITIGATIONS,
+        enhanced_mitigations._RISK_LEVEL_MITIGATIONS,
+    )
+    texts = [m.text.lower().strip() for table in tables for ms in table.values() for m in ms]
+    assert len(texts) == len(set(texts))
+
+    result = enhanced_mitigations.EnhancedMitigationEngine().get_mitigations(['Tampering', 'Tampering'], 'Low')
+    assert result['total_count'] == 4
+
+
+def test_enhanced_mitigations_are_ordered_by_priority():
+    """Test that merged mitigations come back ordered by priority, then effectiveness."""
+    from app.services.enhanced_mitigations import EnhancedMitigationEngine
+
+    result = EnhancedMitigationEngine().get_mitigations(
+        ['Repudiation', 'Denial of Service'], 'Medium', 'xss', component_types=['api', 'authentication']
+    )
+    rank = {'high': 3, 'medium': 2, 'low': 1}
+    keys = [(rank[m['priority']], m['effectiveness']) for m in result['mitigations']]
+    assert keys == sorted(keys, reverse=True)
+    assert result['mitigations'][0]['text'].startswith('Implement output encoding')
+
+
+def test_enhanced_mitigations_are_cached_per_arguments():
+    """Test that repeated mitigation requests reuse the cached response without sharing it."""
+    from app.services.enhanced_mitigations import EnhancedMitigationEngine, _cached_mitigations
+
+    engine = EnhancedMitigationEngine()
+    first = engine.get_mitigations(['Spoofing'], 'High', component_types=['api', 'database'])
+    expected = [dict(m) for m in first['mitigations']]
+    first['extra'] = True
+    first['mitigations'][0]['priority'] = 'low'
+    first['mitigations'].pop()
+    second = EnhancedMitigationEngine().get_mitigations(['Spoofing'], 'High', component_types=['database', 'api'])
+
+    # Same cached response, but callers cannot change it through their copy
+    assert _cached_mitigations.cache_info().hits >= 1
+    assert second['mitigations'] == expected
+    assert 'extra' not in second
+
+    low = engine.get_mitigations([], 'Low')
+    low['mitigations'][0]['priority'] = 'high'
+    assert engine.get_mitigations([], 'Low')['mitigations'][0]['priority'] == 'low'
+
+
+def test_enhanced_mitigations_risk_level_only():
+    """Test the risk-level-only response, including the Low fallback for unknown levels."""
+    from app.services.enhanced_mitigations import EnhancedMitigationEngine
+
+    engine = EnhancedMitigationEngine()
+    medium = engine.get_mitigations([], 'Medium')
+    assert medium['total_count'] == medium['medium_priority_count'] == 1
+    assert medium['mitigations'][0]['text'] == 'Address within next sprint. Schedule security review.'
+
+    unknown = engine.get_mitigations([], 'Unknown', component_types=[])
+    assert unknown == engine.get_mitigations([], 'Low')
+    assert unknown['low_priority_count'] == 1
+
+
+def test_enhanced_mitigations_serialize_without_sort_rank():
+    """Test that mitigations reach the API as plain objects without the internal sort rank."""
+    import json
+    from app.core.serialization import dumps
+    from app.services.enhanced_mitigations import EnhancedMitigationEngine
+
+    result = EnhancedMitigationEngine().get_mitigations([], 'Low')
+    assert json.loads(dumps(result))['mitigations'] == [{
+        'text': 'Monitor and address in regular security maintenance.',
+        'priority': 'low',
+        'difficulty': 'easy',
+        'effectiveness': 5,
+    }]
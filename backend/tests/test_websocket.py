@@ -0,0 +1,43 @@
+"""Test WebSocket broadcasts."""
+from unittest.mock import patch
+from app import socketio
+from app.api.websocket import emit_dashboard_update, emit_scan_update, _flush_dashboard_updates
+
+
+def test_dashboard_updates_coalesced_to_every_batch(app):
+    """Test that queued dashboard updates go out as one event to every subscribed client."""
+    clients = [socketio.test_client(app) for _ in range(3)]
+    for ws in clients:
+        ws.emit('subscribe_dashboard')
+        ws.get_received()
+
+    with patch('app.api.websocket.BROADCAST_BATCH_SIZE', 2), \
+            patch.object(socketio, 'start_background_task') as start, \
+            patch.object(socketio, 'sleep') as sleep:
+        emit_dashboard_update('new_run', {'run_id': 1})
+        emit_dashboard_update('scan_completed', {'run_id': 1})
+        start.assert_called_once_with(_flush_dashboard_updates)
+        _flush_dashboard_updates()
+
+    # One wait for the coalescing window, one yield between the two client batches
+    assert sleep.call_count == 2
+    for ws in clients:
+        received = ws.get_received()
+        assert [r['name'] for r in received] == ['dashboard_update_batch']
+        assert received[0]['args'][0] == {'updates': [
+            {'type': 'new_run', 'data': {'run_id': 1}},
+            {'type': 'scan_completed', 'data': {'run_id': 1}},
+        ]}
+        ws.disconnect()
+
+
+def test_scan_update_skipped_without_subscribers(app):
+    """Test that no emit happens for a room nobody has subscribed to."""
+    ws = socketio.test_client(app)
+    ws.get_received()
+
+    with patch.object(socketio, 'emit') as emit:
+        emit_scan_update(12345, 'completed', {'status': 'Success'})
+
+    emit.assert_not_called()
+    ws.disconnect()
@@ -2,6 +2,7 @@ import { useState, useEffect } from 'react';
 // eslint-disable-next-line no-unused-vars
 import { motion } from 'framer-motion';
 import api from '../services/api';
+import { threatService } from '../services/threatService';
 import {
   ShieldExclamationIcon,
   CheckCircleIcon,
@@ -23,11 +24,11 @@ const ThreatVulnerabilityMatrix = () => {
     try {
       setLoading(true);
       const [allThreatsResponse, withVulnsResponse] = await Promise.all([
-        api.get('/threats'),
+        threatService.getThreats(),
         api.get('/threats/with-vulnerabilities'),
       ]);
 
-      const allThreats = allThreatsResponse.data.threats || [];
+      const allThreats = allThreatsResponse.threats || [];
       const threatsWithVulns = (withVulnsResponse.data.threats || []).map(t => t.id);
 
       // Add vulnerability info to all threats
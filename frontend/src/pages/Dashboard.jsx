@@ -53,10 +53,11 @@ const Dashboard = () => {
     }
   }, []);
 
-  const handleDashboardUpdate = useCallback((update) => {
-    console.log('Dashboard update received:', update);
+  const handleDashboardUpdate = useCallback((batch) => {
+    console.log('Dashboard updates received:', batch.updates);
     
-    if (update.type === 'new_run' || update.type === 'scan_completed') {
+    // Updates arrive coalesced; reload once per batch
+    if (batch.updates.some((update) => update.type === 'new_run' || update.type === 'scan_completed')) {
       // Reload dashboard data when new run is created or scan completes
       loadDashboard();
     }
@@ -67,7 +68,7 @@ const Dashboard = () => {
     wsService.connect();
     
     // Subscribe to dashboard updates
-    wsService.on('dashboard_update', handleDashboardUpdate);
+    wsService.on('dashboard_update_batch', handleDashboardUpdate);
     wsService.on('connected', () => {
       console.log('WebSocket connected, subscribing to dashboard');
       wsService.emit('subscribe_dashboard');
@@ -78,7 +79,7 @@ const Dashboard = () => {
 
     // Cleanup on unmount
     return () => {
-      wsService.off('dashboard_update', handleDashboardUpdate);
+      wsService.off('dashboard_update_batch', handleDashboardUpdate);
     };
   }, [handleDashboardUpdate, loadDashboard]);
 
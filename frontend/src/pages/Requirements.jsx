@@ -115,7 +115,7 @@ const Requirements = () => {
     try {
       const data = await requirementService.exportRequirements(format);
       if (format === 'csv') {
-        const blob = new Blob([data.data], { type: 'text/csv' });
+        const blob = new Blob([data], { type: 'text/csv' });
         const url = window.URL.createObjectURL(blob);
         const a = document.createElement('a');
         a.href = url;
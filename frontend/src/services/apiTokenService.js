@@ -7,8 +7,15 @@ export const apiTokenService = {
   },
   
   listTokens: async () => {
-    const response = await api.get('/auth/api-tokens');
-    return response.data;
+    // The list is served in keyset pages; follow next_cursor to collect every token
+    const tokens = [];
+    let cursor = null;
+    do {
+      const response = await api.get('/auth/api-tokens', { params: { limit: 200, cursor: cursor || undefined } });
+      tokens.push(...response.data.tokens);
+      cursor = response.data.next_cursor;
+    } while (cursor);
+    return { tokens };
   },
   
   revokeToken: async (tokenId) => {
@@ -37,7 +37,10 @@ export const requirementService = {
   },
   
   exportRequirements: async (format = 'json') => {
-    const response = await api.get(`/requirements/export?format=${format}`);
+    // CSV is streamed back as text/csv rather than wrapped in JSON
+    const response = await api.get(`/requirements/export?format=${format}`, {
+      responseType: format === 'csv' ? 'text' : 'json',
+    });
     return response.data;
   },
   
@@ -7,8 +7,15 @@ export const threatService = {
   },
   
   getThreats: async () => {
-    const response = await api.get('/threats');
-    return response.data;
+    // The list is served in keyset pages; follow next_cursor to collect every threat
+    const threats = [];
+    let cursor = null;
+    do {
+      const response = await api.get('/threats', { params: { limit: 200, cursor: cursor || undefined } });
+      threats.push(...response.data.threats);
+      cursor = response.data.next_cursor;
+    } while (cursor);
+    return { threats };
   },
   
   getThreat: async (id) => {